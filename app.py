@@ -10,8 +10,12 @@ from pathlib import Path
 
 import json
 
+from src.config import settings
+
 from src.services.pipeline import CampaignPipeline
 
+from src.services.render_client import RenderClient
+
 from src.ui.campaign_results import add_image_preview_to_existing_flow
 
 from src.utils.logger import app_logger
@@ -43,6 +47,35 @@ st.markdown(
     unsafe_allow_html=True
 )
 
+def describe_progress(event) -> str:
+    """Build a short status line for a pipeline progress event."""
+    counts = f"{event.completed}/{event.total} assets"
+    if event.eta_seconds:
+        counts += f", ~{event.eta_seconds:.0f}s left"
+
+    if event.kind == "stage_started" and event.stage == "parse":
+        return "📄 Processing campaign brief..."
+    if event.kind == "stage_started" and event.stage == "translate":
+        return f"🌐 Translating message ({event.language})..."
+    if event.kind == "stage_started" and event.stage == "source":
+        return f"📦 Preparing {event.product_name} ({counts})"
+    if event.kind == "asset_rendered":
+        return f"🎨 {event.product_name} {event.aspect_ratio} done ({counts})"
+    if event.kind == "run_finished":
+        return "✨ Finalizing campaign..."
+    if event.kind == "run_cancelled":
+        return "⏹ Generation stopped"
+    return f"🎨 Generating campaign assets ({counts})"
+
+
+def stop_generation():
+    """Cancel the run started by the previous script run (Stop button callback)."""
+    cancel = st.session_state.pop("cancel_run", None)
+    if cancel:
+        cancel()
+        st.session_state.generation_stopped = True
+
+
 def main():
     """Main application entry point."""
 
@@ -223,6 +256,12 @@ def main():
         use_container_width=True,
     )
 
+    if st.session_state.pop("generation_stopped", False):
+        st.info(
+            "⏹ Generation stopped. Assets already rendered were kept; "
+            "finish the run later with `python -m src resume <run id>`."
+        )
+
     # ===== STEP 5: Campaign Generation =====
     if generate_button:
         file_extension = brief_file.name.split('.')[-1]
@@ -238,30 +277,61 @@ def main():
             status_text = st.empty()
 
             try:
-                status_text.info("🔧 Initializing campaign pipeline...")
-                progress_bar.progress(10)
-                app_logger.info("Initializing pipeline")
-
-                pipeline = CampaignPipeline()
-
-                status_text.info("📄 Processing campaign brief...")
-                progress_bar.progress(20)
-                app_logger.info(f"Processing brief: {brief_path}")
+                # Hand the brief to the render service when one is configured;
+                # its pipelines stay warm between clicks
+                client = RenderClient() if settings.render_service_url else None
+                if client:
+                    status_text.info("🛰 Submitting brief to the render service...")
+                    job = client.submit(brief_path=brief_path)
+                    stream = client.events(job.id)
+                else:
+                    status_text.info("🔧 Initializing campaign pipeline...")
+                    app_logger.info("Initializing pipeline")
 
-                status_text.info("⚙️ Configuring campaign settings...")
-                progress_bar.progress(30)
+                    pipeline = CampaignPipeline()
 
-                # TODO: Configure pipeline with user selections
+                    # TODO: Configure pipeline with user selections
 
-                status_text.info("🎨 Generating campaign assets...")
-                progress_bar.progress(40)
-                app_logger.info("Starting asset generation")
+                    stream = pipeline.iter_run(brief_path)
 
-                output_dir = pipeline.run(brief_path=brief_path)
+                app_logger.info(f"Processing brief: {brief_path}")
 
-                progress_bar.progress(80)
-                status_text.info("✨ Finalizing campaign...")
-                progress_bar.progress(90)
+                # Clicking Stop reruns the script; the callback cancels the run
+                if client:
+                    st.session_state.cancel_run = lambda job_id=job.id: client.cancel(job_id)
+                else:
+                    st.session_state.cancel_run = stream.cancel
+                st.button("⏹ Stop Generation", on_click=stop_generation)
+
+                # Show finished assets as they land
+                live_gallery = st.empty()
+                gallery_columns = live_gallery.container().columns(3)
+                landed = 0
+
+                for event in stream:
+                    progress_bar.progress(event.progress, text=describe_progress(event))
+
+                    if event.kind == "stage_started":
+                        status_text.info(describe_progress(event))
+                    elif event.kind == "error":
+                        st.warning(f"⚠️ {event.message}")
+                    elif event.kind == "asset_rendered" and event.filepath:
+                        with gallery_columns[landed % 3]:
+                            st.image(
+                                event.filepath,
+                                caption=f"{event.product_name} · {event.aspect_ratio}"
+                            )
+                        landed += 1
+
+                st.session_state.pop("cancel_run", None)
+
+                if client:
+                    job = client.job(job.id)
+                    if job.status in ("failed", "cancelled"):
+                        raise RuntimeError(job.error)
+                    output_dir = RenderClient.output(job)
+                else:
+                    output_dir = stream.result
                 app_logger.info(f"Campaign generated: {output_dir}")
 
                 progress_bar.progress(100)
@@ -272,6 +342,7 @@ def main():
 
                 progress_bar.empty()
                 status_text.empty()
+                live_gallery.empty()
 
                 st.balloons()
 
@@ -0,0 +1,585 @@
+"""
+Command-line interface for Creative Automation Pipeline.
+Runs campaign briefs headlessly, e.g. for nightly regenerations from cron.
+
+Usage:
+    python -m src run data/input/briefs/*.json --workers 4 --progress
+    python -m src run data/input/briefs --guidelines examples/brand_guidelines.json
+    python -m src resume CAMP_2025_001_20250101_120000
+    python -m src retry CAMP_2025_001_20250101_120000 --transient-only
+    python -m src run data/input/briefs/summer.json --trace
+    python -m src plan data/input/briefs/*.json
+    python -m src serve --port 8765
+    python -m src submit data/input/briefs/*.json --progress
+    python -m src enqueue data/input/briefs/*.json
+    python -m src enqueue data/input/briefs/rush.json --priority 10 --deadline 30m
+    python -m src worker --drain
+    python -m src queue-status
+"""
+
+import argparse
+import json
+import sys
+import re
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+from src.config import settings
+from src.utils.logger import setup_logger
+
+EXIT_OK = 0
+EXIT_FAILURE = 1
+EXIT_USAGE = 2
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the argument parser for all subcommands."""
+    parser = argparse.ArgumentParser(
+        prog="python -m src", description="Creative Automation Pipeline command-line interface"
+    )
+    parser.add_argument(
+        "--log-level", default=None, help="Console log level (defaults to LOG_LEVEL)"
+    )
+
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = subparsers.add_parser("run", help="Run one or more campaign briefs")
+    run_parser.add_argument(
+        "briefs",
+        nargs="+",
+        help="Brief files, directories or glob patterns (e.g. 'data/input/briefs/*.json')",
+    )
+    run_parser.add_argument(
+        "-w",
+        "--workers",
+        type=int,
+        default=settings.batch_workers,
+        help=f"Briefs processed concurrently (default: {settings.batch_workers})",
+    )
+    run_parser.add_argument(
+        "--guidelines",
+        type=Path,
+        default=None,
+        help="Brand guidelines JSON; enables the compliance pipeline",
+    )
+    run_parser.add_argument(
+        "--no-compliance",
+        action="store_true",
+        help="Skip compliance checks when guidelines are given",
+    )
+    run_parser.add_argument(
+        "--progress", action="store_true", help="Stream progress events as JSON lines on stderr"
+    )
+    run_parser.add_argument(
+        "--trace",
+        action="store_true",
+        help="Write a Chrome trace (trace.json) into the campaign directory",
+    )
+    run_parser.add_argument(
+        "--lean",
+        action="store_true",
+        help="Memory-lean mode: render one image at a time with a small memory budget",
+    )
+    run_parser.add_argument(
+        "--resize-quality",
+        choices=["fast", "balanced", "best"],
+        default=None,
+        help=f"Resize quality tier (default: {settings.resize_quality})",
+    )
+    run_parser.add_argument(
+        "--auto-fit",
+        action="store_true",
+        help="Size overlay text to fit the band for each language and aspect ratio",
+    )
+    run_parser.add_argument(
+        "--preflight",
+        action="store_true",
+        help="Abort a brief before any work if an asset or font is missing or text does not fit",
+    )
+    run_parser.set_defaults(handler=cmd_run)
+
+    plan_parser = subparsers.add_parser(
+        "plan",
+        help="Check briefs and estimate API calls, cache hits, time and cost without running them",
+    )
+    plan_parser.add_argument("briefs", nargs="+", help="Brief files, directories or glob patterns")
+    plan_parser.add_argument(
+        "--guidelines",
+        type=Path,
+        default=None,
+        help="Brand guidelines JSON; plans the compliance pipeline",
+    )
+    plan_parser.add_argument(
+        "--resize-quality",
+        choices=["fast", "balanced", "best"],
+        default=None,
+        help=f"Resize quality tier to count cache hits for (default: {settings.resize_quality})",
+    )
+    plan_parser.set_defaults(handler=cmd_plan)
+
+    resume_parser = subparsers.add_parser("resume", help="Finish an interrupted run")
+    resume_parser.add_argument(
+        "run_id", help="Campaign directory name of the run (e.g. CAMP_2025_001_20250101_120000)"
+    )
+    resume_parser.add_argument(
+        "--guidelines",
+        type=Path,
+        default=None,
+        help="Brand guidelines JSON (defaults to the one recorded for the run)",
+    )
+    resume_parser.add_argument(
+        "--progress", action="store_true", help="Stream progress events as JSON lines on stderr"
+    )
+    resume_parser.add_argument(
+        "--trace",
+        action="store_true",
+        help="Write a Chrome trace (trace.json) into the campaign directory",
+    )
+    resume_parser.set_defaults(handler=cmd_resume)
+
+    retry_parser = subparsers.add_parser("retry", help="Re-run only the failed assets of a run")
+    retry_parser.add_argument(
+        "run_id", help="Campaign directory name of the run (e.g. CAMP_2025_001_20250101_120000)"
+    )
+    retry_parser.add_argument(
+        "--transient-only",
+        action="store_true",
+        help="Skip assets whose last failure was permanent (e.g. a missing file)",
+    )
+    retry_parser.add_argument(
+        "--guidelines",
+        type=Path,
+        default=None,
+        help="Brand guidelines JSON (defaults to the one recorded for the run)",
+    )
+    retry_parser.add_argument(
+        "--progress", action="store_true", help="Stream progress events as JSON lines on stderr"
+    )
+    retry_parser.add_argument(
+        "--trace",
+        action="store_true",
+        help="Write a Chrome trace (trace.json) into the campaign directory",
+    )
+    retry_parser.set_defaults(handler=cmd_retry)
+
+    enqueue_parser = subparsers.add_parser(
+        "enqueue", help="Queue briefs as per-asset jobs for workers"
+    )
+    enqueue_parser.add_argument(
+        "briefs", nargs="+", help="Brief files, directories or glob patterns"
+    )
+    enqueue_parser.add_argument(
+        "--guidelines",
+        type=Path,
+        default=None,
+        help="Brand guidelines JSON; enables the compliance pipeline",
+    )
+    enqueue_parser.add_argument(
+        "--no-compliance",
+        action="store_true",
+        help="Skip compliance checks when guidelines are given",
+    )
+    enqueue_parser.add_argument(
+        "--priority", type=int, default=0, help="Higher priorities are rendered first (default: 0)"
+    )
+    enqueue_parser.add_argument(
+        "--deadline",
+        type=_parse_deadline,
+        default=None,
+        help="Finish-by time: ISO 8601 timestamp or duration from now (e.g. 30m, 2h)",
+    )
+    enqueue_parser.add_argument(
+        "--resize-quality",
+        choices=["fast", "balanced", "best"],
+        default=None,
+        help=f"Resize quality tier (default: {settings.resize_quality})",
+    )
+    enqueue_parser.add_argument(
+        "--queue", type=Path, default=None, help="Job queue database (defaults to JOB_QUEUE_PATH)"
+    )
+    enqueue_parser.set_defaults(handler=cmd_enqueue)
+
+    worker_parser = subparsers.add_parser("worker", help="Process queued jobs")
+    worker_parser.add_argument(
+        "--queue", type=Path, default=None, help="Job queue database (defaults to JOB_QUEUE_PATH)"
+    )
+    worker_parser.add_argument(
+        "--worker-id", default=None, help="Identifier recorded on leases (defaults to host:pid)"
+    )
+    worker_parser.add_argument(
+        "--max-jobs", type=int, default=None, help="Stop after this many jobs"
+    )
+    worker_parser.add_argument(
+        "--drain",
+        action="store_true",
+        help="Exit once the queue has no available jobs instead of polling",
+    )
+    worker_parser.set_defaults(handler=cmd_worker)
+
+    status_parser = subparsers.add_parser(
+        "queue-status", help="Show job counts and the order runs are served in"
+    )
+    status_parser.add_argument("run_id", nargs="?", default=None, help="Limit counts to one run")
+    status_parser.add_argument(
+        "--queue", type=Path, default=None, help="Job queue database (defaults to JOB_QUEUE_PATH)"
+    )
+    status_parser.set_defaults(handler=cmd_queue_status)
+
+    serve_parser = subparsers.add_parser("serve", help="Run the render service with warm pipelines")
+    serve_parser.add_argument(
+        "--host",
+        default=settings.render_service_host,
+        help=f"Interface to listen on (default: {settings.render_service_host})",
+    )
+    serve_parser.add_argument(
+        "--port",
+        type=int,
+        default=settings.render_service_port,
+        help=f"Port to listen on (default: {settings.render_service_port})",
+    )
+    serve_parser.add_argument(
+        "-w",
+        "--workers",
+        type=int,
+        default=settings.render_service_workers,
+        help=f"Briefs rendered concurrently (default: {settings.render_service_workers})",
+    )
+    serve_parser.set_defaults(handler=cmd_serve)
+
+    submit_parser = subparsers.add_parser(
+        "submit", help="Render briefs on a running render service"
+    )
+    submit_parser.add_argument(
+        "briefs", nargs="+", help="Brief files, directories or glob patterns"
+    )
+    submit_parser.add_argument(
+        "--server",
+        default=None,
+        help="Render service URL (defaults to RENDER_SERVICE_URL or the local service)",
+    )
+    submit_parser.add_argument(
+        "--guidelines",
+        type=Path,
+        default=None,
+        help="Brand guidelines JSON; enables the compliance pipeline",
+    )
+    submit_parser.add_argument(
+        "--no-compliance",
+        action="store_true",
+        help="Skip compliance checks when guidelines are given",
+    )
+    submit_parser.add_argument(
+        "--resize-quality",
+        choices=["fast", "balanced", "best"],
+        default=None,
+        help="Resize quality tier (default: the service's RESIZE_QUALITY)",
+    )
+    submit_parser.add_argument(
+        "--progress", action="store_true", help="Stream progress events as JSON lines on stderr"
+    )
+    submit_parser.set_defaults(handler=cmd_submit)
+
+    return parser
+
+
+def _parse_deadline(value: str) -> float:
+    """Parse a deadline given as a duration from now or an ISO 8601 timestamp."""
+    match = re.fullmatch(r"(\d+(?:\.\d+)?)([smhd])", value.strip())
+    if match:
+        unit = {"s": 1, "m": 60, "h": 3600, "d": 86400}[match.group(2)]
+        return time.time() + float(match.group(1)) * unit
+    try:
+        return datetime.fromisoformat(value).timestamp()
+    except ValueError:
+        raise argparse.ArgumentTypeError(
+            f"invalid deadline {value!r} (use e.g. 30m, 2h or 2025-06-01T17:00)"
+        )
+
+
+def _pipeline_factory(guidelines: Optional[Path]):
+    """Return a callable creating the pipeline for one worker."""
+    if guidelines:
+        from src.services.pipeline_enhanced import EnhancedCampaignPipeline
+
+        return lambda: EnhancedCampaignPipeline(guidelines_path=guidelines)
+
+    from src.services.pipeline import CampaignPipeline
+
+    return CampaignPipeline
+
+
+def _print_json(data: dict):
+    """Write a machine-readable result to stdout."""
+    sys.stdout.write(json.dumps(data, indent=2, ensure_ascii=False) + "\n")
+    sys.stdout.flush()
+
+
+_event_lock = threading.Lock()
+
+
+def _print_event(event):
+    """Write a progress event as one JSON line to stderr."""
+    line = event.model_dump_json() + "\n"
+    with _event_lock:
+        sys.stderr.write(line)
+        sys.stderr.flush()
+
+
+def cmd_run(args) -> int:
+    """Run briefs through the pipeline and print a JSON summary."""
+    from src.services.batch_runner import BatchRunner
+
+    brief_paths = BatchRunner.collect_briefs(args.briefs)
+    if not brief_paths:
+        _print_json({"error": "No briefs found", "patterns": args.briefs})
+        return EXIT_USAGE
+
+    run_kwargs = {}
+    if args.progress:
+        run_kwargs["on_event"] = _print_event
+    if args.resize_quality:
+        run_kwargs["resize_quality"] = args.resize_quality
+    if args.guidelines:
+        run_kwargs["enable_compliance"] = not args.no_compliance
+
+    runner = BatchRunner(
+        _pipeline_factory(args.guidelines), max_workers=args.workers, run_kwargs=run_kwargs
+    )
+    summary = runner.run(brief_paths)
+
+    _print_json(summary.to_dict())
+    return EXIT_FAILURE if summary.has_failures() else EXIT_OK
+
+
+def cmd_plan(args) -> int:
+    """Plan briefs and print their checks and estimates."""
+    from src.services.batch_runner import BatchRunner
+
+    brief_paths = BatchRunner.collect_briefs(args.briefs)
+    if not brief_paths:
+        _print_json({"error": "No briefs found", "patterns": args.briefs})
+        return EXIT_USAGE
+
+    pipeline = _pipeline_factory(args.guidelines)()
+    plans, errors = [], []
+    for brief_path in brief_paths:
+        try:
+            plan = pipeline.plan(brief_path, args.resize_quality)
+            plans.append({"brief": str(brief_path), **plan.model_dump()})
+        except Exception as e:
+            errors.append({"brief": str(brief_path), "error": str(e)})
+
+    _print_json(
+        {
+            "plans": plans,
+            "errors": errors,
+            "estimated_seconds": round(sum(plan["estimated_seconds"] for plan in plans), 1),
+            "estimated_cost_usd": round(sum(plan["estimated_cost_usd"] for plan in plans), 4),
+        }
+    )
+    runnable = not errors and all(not plan["problems"] for plan in plans)
+    return EXIT_OK if runnable else EXIT_FAILURE
+
+
+def _recorded_pipeline(args):
+    """
+    Build the pipeline variant an existing run was started with.
+
+    Returns:
+        Pipeline, or None (after printing the error) if the run has no manifest
+    """
+    from src.services.run_manifest import RunManifest
+
+    campaign_dir = settings.output_base_dir / args.run_id
+    try:
+        header = RunManifest.load(campaign_dir).header
+    except FileNotFoundError as e:
+        _print_json({"error": str(e), "run_id": args.run_id})
+        return None
+
+    guidelines = args.guidelines
+    if guidelines is None and header.get("pipeline") == "enhanced" and header.get("guidelines"):
+        guidelines = Path(header["guidelines"])
+
+    return _pipeline_factory(guidelines)()
+
+
+def cmd_resume(args) -> int:
+    """Resume an interrupted run and print its result."""
+    pipeline = _recorded_pipeline(args)
+    if pipeline is None:
+        return EXIT_USAGE
+
+    try:
+        output = pipeline.resume(args.run_id, on_event=_print_event if args.progress else None)
+    except Exception as e:
+        _print_json({"error": str(e), "run_id": args.run_id})
+        return EXIT_FAILURE
+
+    _print_json(output.model_dump())
+    return EXIT_FAILURE if output.has_errors() else EXIT_OK
+
+
+def cmd_retry(args) -> int:
+    """Re-run the failed assets of a run and print its result."""
+    pipeline = _recorded_pipeline(args)
+    if pipeline is None:
+        return EXIT_USAGE
+
+    try:
+        output = pipeline.retry_failed(
+            args.run_id,
+            on_event=_print_event if args.progress else None,
+            transient_only=args.transient_only,
+        )
+    except Exception as e:
+        _print_json({"error": str(e), "run_id": args.run_id})
+        return EXIT_FAILURE
+
+    _print_json(output.model_dump())
+    return EXIT_FAILURE if output.has_errors() else EXIT_OK
+
+
+def cmd_enqueue(args) -> int:
+    """Queue briefs as jobs and print the created runs."""
+    from src.services.batch_runner import BatchRunner
+    from src.services.job_queue import JobQueue
+
+    brief_paths = BatchRunner.collect_briefs(args.briefs)
+    if not brief_paths:
+        _print_json({"error": "No briefs found", "patterns": args.briefs})
+        return EXIT_USAGE
+
+    queue = JobQueue(args.queue)
+    runs, errors = [], []
+    for brief_path in brief_paths:
+        try:
+            run = queue.enqueue_brief(
+                brief_path,
+                guidelines=args.guidelines,
+                enable_compliance=not args.no_compliance,
+                priority=args.priority,
+                deadline=args.deadline,
+                resize_quality=args.resize_quality,
+            )
+            runs.append({"run_id": run.run_id, "jobs": sum(queue.stats(run.run_id).values())})
+        except Exception as e:
+            errors.append({"brief": str(brief_path), "error": str(e)})
+
+    _print_json({"runs": runs, "errors": errors})
+    return EXIT_FAILURE if errors else EXIT_OK
+
+
+def cmd_worker(args) -> int:
+    """Process queued jobs until stopped or drained."""
+    from src.services.image_processor import ImageProcessor
+    from src.services.job_queue import JobQueue
+    from src.services.queue_worker import QueueWorker
+
+    ImageProcessor().preload_fonts()
+    worker = QueueWorker(JobQueue(args.queue), worker_id=args.worker_id)
+    processed = worker.run(max_jobs=args.max_jobs, drain=args.drain)
+
+    _print_json({"worker_id": worker.worker_id, "processed": processed})
+    return EXIT_OK
+
+
+def cmd_queue_status(args) -> int:
+    """Print job counts by status and the order runs will be served in."""
+    from src.services.job_queue import JobQueue
+
+    queue = JobQueue(args.queue)
+    schedule = [
+        run for run in queue.schedule() if args.run_id is None or run["run_id"] == args.run_id
+    ]
+    _print_json({"run_id": args.run_id, "jobs": queue.stats(args.run_id), "schedule": schedule})
+    return EXIT_OK
+
+
+def cmd_serve(args) -> int:
+    """Serve the render API until interrupted."""
+    from src.services.image_processor import ImageProcessor
+    from src.services.render_service import RenderServer, RenderService
+    from src.utils.logger import app_logger
+
+    ImageProcessor().preload_fonts()
+    service = RenderService(workers=args.workers)
+    server = RenderServer(service, host=args.host, port=args.port)
+    app_logger.info(f"🛰  Render service listening on {server.url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        app_logger.info("Render service stopping")
+    finally:
+        server.server_close()
+        service.shutdown()
+    return EXIT_OK
+
+
+def cmd_submit(args) -> int:
+    """Submit briefs to the render service and print their results."""
+    from src.services.batch_runner import BatchRunner
+    from src.services.render_client import RenderClient
+
+    brief_paths = BatchRunner.collect_briefs(args.briefs)
+    if not brief_paths:
+        _print_json({"error": "No briefs found", "patterns": args.briefs})
+        return EXIT_USAGE
+
+    client = RenderClient(args.server)
+    if not client.is_available():
+        _print_json({"error": f"Render service not reachable at {client.base_url}"})
+        return EXIT_USAGE
+
+    jobs = [
+        client.submit(
+            brief_path=brief_path,
+            guidelines=args.guidelines,
+            enable_compliance=not args.no_compliance,
+            resize_quality=args.resize_quality,
+        )
+        for brief_path in brief_paths
+    ]
+    results = []
+    for job in jobs:
+        for event in client.events(job.id):
+            if args.progress:
+                _print_event(event)
+        results.append(client.job(job.id).model_dump())
+
+    _print_json({"jobs": results})
+    failed = any(
+        job["status"] != "succeeded" or (job["output"] or {}).get("errors") for job in results
+    )
+    return EXIT_FAILURE if failed else EXIT_OK
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    """
+    Entry point for ``python -m src``.
+
+    Args:
+        argv: Command-line arguments (defaults to sys.argv)
+
+    Returns:
+        Process exit code
+    """
+    parser = build_parser()
+    args = parser.parse_args(argv)
+
+    # Keep stdout clean for the machine-readable summary
+    setup_logger(stream=sys.stderr, level=args.log_level)
+
+    if getattr(args, "trace", False):
+        settings.tracing_enabled = True
+    if getattr(args, "preflight", False):
+        settings.preflight_checks = True
+    if getattr(args, "lean", False):
+        settings.memory_lean_mode = True
+    if getattr(args, "auto_fit", False):
+        settings.text_auto_fit = True
+
+    return args.handler(args)
@@ -12,6 +12,7 @@ from src.models.compliance import BrandGuidelines, ComplianceResult, AssetMetada
 from src.compliance.color_analyzer import ColorAnalyzer
 from src.compliance.content_validator import ContentValidator
 from src.utils.logger import app_logger
+from src.utils.tracing import traced
 
 
 class BrandComplianceChecker:
@@ -30,6 +31,7 @@ class BrandComplianceChecker:
         
         app_logger.info("BrandComplianceChecker initialized")
     
+    @traced(category="cpu")
     def validate_asset(
         self,
         image: Image.Image,
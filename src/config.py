@@ -14,10 +14,18 @@ class Settings(BaseSettings):
     
     # OpenAI Configuration
     openai_api_key: str = Field(default="", description="OpenAI API key")
+    openai_timeout_seconds: float = Field(
+        default=120.0,
+        description="Timeout of a single OpenAI request"
+    )
     
     # Application Settings
     log_level: str = Field(default="INFO", description="Logging level")
     max_image_size: int = Field(default=1024, description="Maximum image dimension")
+    resize_quality: str = Field(
+        default="balanced",
+        description="Resize quality tier: fast, balanced or best"
+    )
     
     # Supported Languages
     supported_languages: str = Field(
@@ -29,12 +37,23 @@ class Settings(BaseSettings):
     output_base_dir: Path = Field(default=Path("data/output"))
     input_assets_dir: Path = Field(default=Path("data/input/assets"))
     input_briefs_dir: Path = Field(default=Path("data/input/briefs"))
+    cache_dir: Path = Field(default=Path("data/cache"), description="Content-addressed build cache")
     
     # Image Generation Settings
     dalle_model: str = Field(default="dall-e-3", description="DALL-E model version")
     dalle_quality: str = Field(default="standard", description="Image quality: standard or hd")
     dalle_size: str = Field(default="1024x1024", description="Generated image size")
     
+    # Pricing used by run plans
+    dalle_image_cost_usd: float = Field(
+        default=0.04,
+        description="Price of one generated image at the configured size and quality"
+    )
+    translation_cost_usd: float = Field(
+        default=0.0005,
+        description="Approximate price of one message translation"
+    )
+    
     # Translation Settings
     translation_model: str = Field(default="gpt-4o-mini", description="Model for translations")
     
@@ -46,8 +65,161 @@ class Settings(BaseSettings):
     
     # Text Overlay Settings
     text_font_size: int = Field(default=20, description="Font size for text overlays")
+    text_auto_fit: bool = Field(
+        default=False,
+        description="Pick the largest font size that fits the text band per language and ratio"
+    )
+    text_max_lines: int = Field(
+        default=3,
+        description="Most lines an auto-fitted message may wrap to"
+    )
+    text_box_height_ratio: float = Field(
+        default=0.3,
+        description="Largest share of the image height the auto-fitted text band may cover"
+    )
+    min_text_size: int = Field(default=16, description="Smallest font size auto-fit may choose")
+    max_text_size: int = Field(default=96, description="Largest font size auto-fit may choose")
     text_shadow_enabled: bool = Field(default=False, description="Enable shadow effect on text")
     text_shadow_offset: int = Field(default=2, description="Shadow offset in pixels")
+    font_cache_mb: int = Field(
+        default=64,
+        description="Estimated memory of loaded fonts kept per process"
+    )
+    font_preload_sizes: str = Field(
+        default="",
+        description="Comma-separated font sizes preloaded at startup (empty uses TEXT_FONT_SIZE)"
+    )
+    overlay_tile_cache_mb: int = Field(
+        default=64,
+        description="Pre-rendered text bands kept for reuse across products"
+    )
+    
+    # Incremental Build Settings
+    incremental_builds: bool = Field(
+        default=True,
+        description="Reuse rendered assets, generations and translations whose inputs are unchanged"
+    )
+    
+    # Batch Settings
+    batch_workers: int = Field(default=2, description="Briefs processed concurrently by the CLI")
+    
+    # Stage Graph Settings
+    stage_network_workers: int = Field(
+        default=4,
+        description="Concurrent network stages per run (image generation, translation)"
+    )
+    stage_cpu_workers: int = Field(
+        default=2,
+        description="Concurrent CPU stages per run (resize, overlay, encode)"
+    )
+    stage_disk_workers: int = Field(
+        default=2,
+        description="Concurrent disk stages per run (cache lookups, saves)"
+    )
+    stage_memory_budget_mb: int = Field(
+        default=512,
+        description="Decoded image data a run holds between stages before fetching more sources"
+    )
+    
+    stage_network_timeout_seconds: float = Field(
+        default=180.0,
+        description="Seconds a generation or translation task may run (0 disables)"
+    )
+    stage_local_timeout_seconds: float = Field(
+        default=60.0,
+        description="Seconds a CPU or disk task may run before it is abandoned (0 disables)"
+    )
+    watchdog_stall_seconds: float = Field(
+        default=300.0,
+        description="Seconds a service or queue job may go without progress (0 disables)"
+    )
+    
+    memory_lean_mode: bool = Field(
+        default=False,
+        description="Render one image at a time with a small memory budget (for very large briefs)"
+    )
+    lean_memory_budget_mb: int = Field(
+        default=64,
+        description="Stage memory budget in memory-lean mode"
+    )
+    
+    # Admission Control Settings
+    generation_concurrency: int = Field(
+        default=4,
+        description="Image generations in flight at once per process"
+    )
+    generation_queue_limit: int = Field(
+        default=8,
+        description="Generations waiting for a slot before new ones are shed (0 never sheds)"
+    )
+    library_match_threshold: float = Field(
+        default=0.85,
+        description="Name similarity (0-1) for a library image to stand in for a shed generation"
+    )
+    
+    # Job Queue Settings
+    job_queue_path: Path = Field(
+        default=Path("data/queue/jobs.db"),
+        description="SQLite job queue shared by workers"
+    )
+    job_queue_journal_mode: str = Field(
+        default="wal",
+        description="SQLite journal mode; use 'delete' when the queue lives on a network filesystem"
+    )
+    job_lease_seconds: int = Field(
+        default=120,
+        description="Seconds a job lease lasts without heartbeats"
+    )
+    job_max_attempts: int = Field(default=3, description="Leases before a job fails for good")
+    job_retry_base_seconds: float = Field(
+        default=5.0,
+        description="Delay before retrying a failed job (doubles per attempt)"
+    )
+    worker_poll_seconds: float = Field(
+        default=2.0,
+        description="Wait between polls of an empty queue"
+    )
+    
+    # Render Service Settings
+    render_service_host: str = Field(
+        default="127.0.0.1",
+        description="Interface the render service listens on"
+    )
+    render_service_port: int = Field(default=8765, description="Port of the render service")
+    render_service_url: str = Field(
+        default="",
+        description="Render service used by the UI and 'submit'; empty runs pipelines in-process"
+    )
+    render_service_workers: int = Field(
+        default=1,
+        description="Briefs the render service renders concurrently"
+    )
+    render_service_history: int = Field(
+        default=200,
+        description="Finished jobs the render service remembers"
+    )
+    
+    # Retry Settings
+    retry_max_attempts: int = Field(
+        default=2,
+        description="Rounds of retrying assets lost to transient errors at the end of a run"
+    )
+    retry_base_seconds: float = Field(
+        default=2.0,
+        description="Delay before the first retry round (doubles per round)"
+    )
+    
+    # Preflight Settings
+    preflight_checks: bool = Field(
+        default=False,
+        description="Plan each run first; abort if an asset or font is missing or text does not fit"
+    )
+    
+    # Tracing Settings
+    tracing_enabled: bool = Field(
+        default=False,
+        description="Write a Chrome trace-event file (trace.json) into each campaign directory"
+    )
     
     model_config = SettingsConfigDict(
         env_file=".env",
@@ -61,6 +233,12 @@ class Settings(BaseSettings):
         """Return supported languages as a list."""
         return [lang.strip() for lang in self.supported_languages.split(",")]
     
+    @property
+    def font_preload_sizes_list(self) -> List[int]:
+        """Return font preload sizes as a list."""
+        sizes = [int(size) for size in self.font_preload_sizes.split(",") if size.strip()]
+        return sizes or [self.text_font_size]
+    
     def get_aspect_ratio_dimensions(self, aspect_ratio: str, base_size: int = 1024) -> tuple[int, int]:
         """
         Calculate dimensions for a given aspect ratio.
@@ -0,0 +1,69 @@
+"""
+Data models for batch runs.
+Defines the machine-readable summary produced by headless batch execution.
+"""
+
+from typing import List, Optional
+from pydantic import BaseModel, Field
+
+
+class BriefRunResult(BaseModel):
+    """Outcome of running the pipeline for a single brief."""
+
+    brief_path: str = Field(..., description="Path of the processed brief")
+    status: str = Field(..., description="succeeded, partial or failed")
+    campaign_id: Optional[str] = Field(None, description="Campaign identifier")
+    output_directory: Optional[str] = Field(None, description="Campaign output directory")
+    assets_generated: int = Field(default=0, description="Number of assets written")
+    errors: List[str] = Field(default_factory=list, description="Errors raised for this brief")
+    duration_seconds: float = Field(default=0.0, description="Wall time spent on this brief")
+
+    def is_success(self) -> bool:
+        """Check if the brief completed without any errors."""
+        return self.status == "succeeded"
+
+
+class BatchSummary(BaseModel):
+    """Summary of a batch run over many briefs."""
+
+    started_at: str
+    finished_at: Optional[str] = None
+    workers: int
+    results: List[BriefRunResult] = Field(default_factory=list)
+
+    @property
+    def total(self) -> int:
+        """Number of briefs in the batch."""
+        return len(self.results)
+
+    @property
+    def succeeded(self) -> int:
+        """Number of briefs that completed without errors."""
+        return sum(1 for r in self.results if r.status == "succeeded")
+
+    @property
+    def partial(self) -> int:
+        """Number of briefs that produced assets but also errors."""
+        return sum(1 for r in self.results if r.status == "partial")
+
+    @property
+    def failed(self) -> int:
+        """Number of briefs that could not be processed."""
+        return sum(1 for r in self.results if r.status == "failed")
+
+    def has_failures(self) -> bool:
+        """Check if any brief failed or finished with errors."""
+        return any(not r.is_success() for r in self.results)
+
+    def to_dict(self) -> dict:
+        """Return the summary with aggregate counts as a plain dictionary."""
+        data = self.model_dump()
+        data.update(
+            {
+                "total": self.total,
+                "succeeded": self.succeeded,
+                "partial": self.partial,
+                "failed": self.failed,
+            }
+        )
+        return data
@@ -99,6 +99,7 @@ class CampaignOutput(BaseModel):
     output_directory: str
     generated_assets: List[dict] = Field(default_factory=list)
     errors: List[str] = Field(default_factory=list)
+    peak_rss_mb: Optional[float] = Field(None, description="Peak resident memory while rendering")
     
     def add_asset(self, product_name: str, aspect_ratio: str, filepath: str):
         """Add a generated asset to the output record."""
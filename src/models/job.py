@@ -0,0 +1,77 @@
+"""
+Data models for queued jobs.
+Defines the per-asset jobs stored in the persistent job queue and the
+briefs submitted to the render service.
+"""
+
+from typing import Optional
+from pydantic import BaseModel, Field
+
+
+class Job(BaseModel):
+    """One asset (product, aspect ratio, language) of a queued run."""
+
+    id: int = Field(..., description="Job identifier")
+    run_id: str = Field(..., description="Campaign directory name of the run")
+    product_id: str
+    aspect_ratio: str
+    language: str
+    status: str = Field(..., description="queued, leased, done or failed")
+    attempts: int = Field(default=0, description="Times the job has been leased")
+    max_attempts: int = Field(default=3, description="Attempts before the job fails for good")
+    lease_owner: Optional[str] = Field(None, description="Worker holding the lease")
+    lease_expires: Optional[float] = Field(None, description="Unix time the lease runs out")
+    available_at: float = Field(default=0.0, description="Unix time the job may next be leased")
+    last_error: Optional[str] = None
+    result_path: Optional[str] = Field(
+        None, description="Asset path relative to the output directory"
+    )
+
+    @property
+    def cell(self) -> dict:
+        """Get the pipeline cell rendered by this job."""
+        return {
+            "product_id": self.product_id,
+            "aspect_ratio": self.aspect_ratio,
+            "language": self.language,
+        }
+
+
+class QueuedRun(BaseModel):
+    """A brief expanded into jobs."""
+
+    run_id: str = Field(..., description="Campaign directory name of the run")
+    pipeline: str = Field(default="standard", description="Pipeline variant rendering the jobs")
+    guidelines: Optional[str] = Field(
+        None, description="Brand guidelines for the enhanced pipeline"
+    )
+    status: str = Field(default="active", description="active or finished")
+    priority: int = Field(default=0, description="Higher priorities are leased first")
+    deadline: Optional[float] = Field(None, description="Unix time the run should be finished by")
+    created_at: float
+
+
+class RenderJob(BaseModel):
+    """A brief submitted to the render service."""
+
+    id: str = Field(..., description="Job identifier")
+    brief_path: str = Field(..., description="Brief file the job renders")
+    guidelines: Optional[str] = Field(
+        None, description="Brand guidelines for the enhanced pipeline"
+    )
+    enable_compliance: bool = True
+    resize_quality: Optional[str] = Field(None, description="Resize quality tier of the run")
+    status: str = Field(
+        default="queued", description="queued, running, succeeded, failed or cancelled"
+    )
+    run_id: Optional[str] = Field(None, description="Campaign directory name once the run started")
+    completed: int = 0
+    total: int = 0
+    error: Optional[str] = None
+    output: Optional[dict] = Field(None, description="CampaignOutput of a finished run")
+    created_at: float
+    finished_at: Optional[float] = None
+
+    def is_finished(self) -> bool:
+        """Check if the job reached a final status."""
+        return self.status in ("succeeded", "failed", "cancelled")
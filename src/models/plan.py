@@ -0,0 +1,42 @@
+"""
+Data models for run plans.
+Describes what a pipeline run would do without executing it.
+"""
+
+from typing import List, Optional
+from pydantic import BaseModel, Field
+
+
+class ProductPlan(BaseModel):
+    """Where a product's base image would come from."""
+
+    product_id: str
+    product_name: str
+    source: str = Field(..., description="existing, cached_generation, generate or missing")
+    path: Optional[str] = Field(None, description="Existing or cached image the run would use")
+    cached_assets: int = Field(default=0, description="Aspect ratios already in the build cache")
+
+
+class CampaignPlan(BaseModel):
+    """Dry-run expansion of a brief with checks and estimates."""
+
+    campaign_id: str
+    campaign_name: str
+    language: str
+    aspect_ratios: List[str]
+    products: List[ProductPlan] = Field(default_factory=list)
+    total_assets: int = Field(default=0, description="Product x ratio cells in the brief")
+    cached_assets: int = Field(default=0, description="Cells the build cache would supply")
+    image_generations: int = Field(default=0, description="Expected image generation API calls")
+    translations: int = Field(default=0, description="Expected translation API calls")
+    cached_generations: int = Field(default=0, description="Generated images reused from the cache")
+    cached_translations: int = Field(default=0, description="Translations reused from the cache")
+    font_path: Optional[str] = None
+    estimated_seconds: float = Field(default=0.0, description="Estimated wall time of the run")
+    estimated_cost_usd: float = Field(default=0.0, description="Estimated API spend")
+    problems: List[str] = Field(default_factory=list, description="Issues that would fail assets")
+    warnings: List[str] = Field(default_factory=list)
+
+    def is_runnable(self) -> bool:
+        """Check if the run would produce every asset."""
+        return not self.problems
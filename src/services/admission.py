@@ -0,0 +1,158 @@
+"""
+Admission Control Service
+Sheds image generations while generation capacity is saturated.
+
+All pipelines in a process (batch workers, render service jobs) share one
+AdmissionController. It caps concurrent generation requests and counts the
+ones waiting for a slot. Once that queue is longer than
+GENERATION_QUEUE_LIMIT, a new generation is only admitted if nothing else
+will do:
+
+1. a near-duplicate image in the asset library (e.g. an earlier generation
+   of the same product) is used instead, or
+2. the generation is deferred once: its cells move to the end-of-run retry
+   queue, so the brief's other assets are not held up behind it.
+
+Products with a usable existing_image never reach the controller.
+"""
+
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import NamedTuple, Optional
+from src.config import settings
+from src.services.asset_manager import AssetManager
+from src.utils import cancellation
+from src.utils.logger import app_logger
+
+# How often a request waiting for a slot checks for cancellation
+SLOT_POLL_SECONDS = 0.1
+
+
+class Admission(NamedTuple):
+    """Decision on one generation request."""
+
+    action: str  # "generate", "library" or "defer"
+    path: Optional[Path] = None
+
+
+class AdmissionController:
+    """Limits concurrent image generations and sheds load when they back up."""
+
+    def __init__(self, concurrency: Optional[int] = None, queue_limit: Optional[int] = None):
+        """
+        Initialize AdmissionController.
+
+        Args:
+            concurrency: Generation requests in flight at once (defaults to config)
+            queue_limit: Waiting requests before new ones are shed, 0 to
+                never shed (defaults to config)
+        """
+        self.concurrency = concurrency or settings.generation_concurrency
+        self.queue_limit = settings.generation_queue_limit if queue_limit is None else queue_limit
+        self._slots = threading.BoundedSemaphore(self.concurrency)
+        self._lock = threading.Lock()
+        self._waiting = 0
+        self._in_flight = 0
+        self._counts = {"admitted": 0, "library": 0, "deferred": 0}
+
+    @property
+    def queue_depth(self) -> int:
+        """Generation requests waiting for a slot."""
+        return self._waiting
+
+    def is_saturated(self) -> bool:
+        """Check if the generation queue is past its limit."""
+        return self.queue_limit > 0 and self._waiting >= self.queue_limit
+
+    def admit(self, product, asset_manager: AssetManager, may_defer: bool = False) -> Admission:
+        """
+        Decide how to source a product image that would need generation.
+
+        Args:
+            product: Product needing an image
+            asset_manager: Asset library searched for near-duplicates
+            may_defer: Whether the generation may be postponed
+
+        Returns:
+            Admission with the action to take (and the library image to use)
+        """
+        if self.is_saturated():
+            match = asset_manager.find_similar(
+                product.product_name, settings.library_match_threshold
+            )
+            if match is not None:
+                self._count("library")
+                app_logger.info(
+                    f"   Generation queue saturated ({self.queue_depth} waiting); "
+                    f"using library image {match.name}"
+                )
+                return Admission("library", match)
+            if may_defer:
+                self._count("deferred")
+                return Admission("defer")
+
+        self._count("admitted")
+        return Admission("generate")
+
+    @contextmanager
+    def slot(self):
+        """
+        Hold one of the generation slots; waiting counts toward the queue depth.
+
+        Raises:
+            RunCancelled: If the run is cancelled while waiting
+        """
+        with self._lock:
+            self._waiting += 1
+        try:
+            while not self._slots.acquire(timeout=SLOT_POLL_SECONDS):
+                cancellation.check()
+        finally:
+            with self._lock:
+                self._waiting -= 1
+
+        with self._lock:
+            self._in_flight += 1
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+            self._slots.release()
+
+    def metrics(self) -> dict:
+        """
+        Get the current load and shed counts.
+
+        Returns:
+            Dictionary with queue depth, requests in flight, limits, and the
+            number of requests admitted, served from the library or deferred
+        """
+        with self._lock:
+            return {
+                "queue_depth": self._waiting,
+                "in_flight": self._in_flight,
+                "concurrency": self.concurrency,
+                "queue_limit": self.queue_limit,
+                "saturated": self.is_saturated(),
+                **self._counts,
+                "shed": self._counts["library"] + self._counts["deferred"],
+            }
+
+    def _count(self, name: str):
+        with self._lock:
+            self._counts[name] += 1
+
+
+_controller: Optional[AdmissionController] = None
+_controller_lock = threading.Lock()
+
+
+def get_controller() -> AdmissionController:
+    """Get the admission controller shared by all pipelines of this process."""
+    global _controller
+    with _controller_lock:
+        if _controller is None:
+            _controller = AdmissionController()
+        return _controller
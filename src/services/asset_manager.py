@@ -3,14 +3,25 @@ Asset Manager Service
 Manages loading and checking of existing product images.
 """
 
+import os
+import re
+import tempfile
+from difflib import SequenceMatcher
 from pathlib import Path
-from typing import Optional, Dict
+from typing import Callable, Optional, Dict, Tuple
 from PIL import Image
 from src.config import settings
 from src.utils.logger import app_logger
 from src.utils.validators import validate_image_file
 
 
+# Suffixes the pipelines give generated images saved to the library
+GENERATED_SUFFIXES = ("_generated", "_gen")
+
+# Maps an image's full size to the smallest size it may be decoded at
+DecodeSize = Callable[[Tuple[int, int]], Tuple[int, int]]
+
+
 class AssetManager:
     """Manages campaign asset files."""
     
@@ -64,12 +75,17 @@ class AssetManager:
             return self.assets_dir / filename
         return None
     
-    def load_image(self, filename: str) -> Optional[Image.Image]:
+    def load_image(
+        self,
+        filename: str,
+        decode_size: Optional[DecodeSize] = None
+    ) -> Optional[Image.Image]:
         """
         Load an image asset.
         
         Args:
             filename: Name of the image file
+            decode_size: Smallest size needed for a given full size (see open_image)
             
         Returns:
             PIL Image object if successful, None otherwise
@@ -85,7 +101,7 @@ class AssetManager:
             return None
         
         try:
-            img = Image.open(filepath)
+            img = self.open_image(filepath, decode_size)
             app_logger.info(f" Loaded image: {filename} ({img.size[0]}x{img.size[1]})")
             return img
             
@@ -93,6 +109,54 @@ class AssetManager:
             app_logger.error(f"Failed to load image {filename}: {e}")
             return None
     
+    @staticmethod
+    def open_image(filepath: Path, decode_size: Optional[DecodeSize] = None) -> Image.Image:
+        """
+        Decode an image file completely and close it.
+        
+        PIL opens images lazily and keeps the file handle until the pixels
+        are read; decoding up front makes the file handle's lifetime explicit.
+        The returned image keeps its ``filename`` for content hashing.
+        
+        With decode_size, JPEGs are decoded at the smallest DCT scale (1/2,
+        1/4 or 1/8) that is still at least the size it returns, which skips
+        most of the decoding work for large photos. Other formats are
+        decoded in full.
+        
+        Args:
+            filepath: Image file
+            decode_size: Smallest size needed for a given full size
+            
+        Returns:
+            Decoded PIL Image
+        """
+        with Image.open(filepath) as img:
+            AssetManager._draft(img, decode_size)
+            img.load()
+        return img
+    
+    @staticmethod
+    def decoded_size(filepath: Path, decode_size: Optional[DecodeSize] = None) -> Tuple[int, int]:
+        """
+        Get the size open_image would decode an image file at, reading only its header.
+        
+        Args:
+            filepath: Image file
+            decode_size: Smallest size needed for a given full size
+            
+        Returns:
+            (width, height) of the decoded image
+        """
+        with Image.open(filepath) as img:
+            AssetManager._draft(img, decode_size)
+            return img.size
+    
+    @staticmethod
+    def _draft(img: Image.Image, decode_size: Optional[DecodeSize]):
+        """Configure a JPEG that is not yet loaded to decode at reduced scale."""
+        if decode_size is not None and img.format == 'JPEG':
+            img.draft(img.mode, decode_size(img.size))
+    
     def save_image(self, image: Image.Image, filename: str, optimize: bool = True) -> bool:
         """
         Save an image to the assets directory.
@@ -107,7 +171,19 @@ class AssetManager:
         """
         try:
             filepath = self.assets_dir / filename
-            image.save(filepath, optimize=optimize)
+            
+            # Replace atomically so cached hardlinks of the old file stay intact;
+            # each writer gets its own temporary file
+            fd, tmp_name = tempfile.mkstemp(
+                dir=filepath.parent, prefix=f".{filepath.name}.", suffix=".tmp"
+            )
+            os.close(fd)
+            try:
+                image_format = Image.registered_extensions().get(filepath.suffix.lower())
+                image.save(tmp_name, format=image_format, optimize=optimize)
+                os.replace(tmp_name, filepath)
+            finally:
+                Path(tmp_name).unlink(missing_ok=True)
             
             size = filepath.stat().st_size
             app_logger.info(f" Saved image: {filename} ({size:,} bytes)")
@@ -133,7 +209,8 @@ class AssetManager:
             return None
         
         try:
-            img = Image.open(filepath)
+            with Image.open(filepath) as img:
+                pass
             info = {
                 'filename': filename,
                 'path': str(filepath),
@@ -166,6 +243,43 @@ class AssetManager:
         app_logger.info(f"Found {len(assets)} assets in {self.assets_dir}")
         return sorted(assets)
     
+    def find_similar(self, name: str, threshold: float = 0.85) -> Optional[Path]:
+        """
+        Find the library image whose name best matches a product name.
+        
+        Names are compared case- and punctuation-insensitively, ignoring the
+        suffixes of generated images, so an earlier generation of the same
+        product (e.g. wireless_earbuds_generated.png) matches.
+        
+        Args:
+            name: Product name
+            threshold: Minimum similarity (0-1) of an accepted match
+            
+        Returns:
+            Path of the best match, or None if nothing is similar enough
+        """
+        target = self._normalize_name(name)
+        if not target:
+            return None
+        
+        best, best_score = None, threshold
+        for filename in self.list_assets():
+            score = SequenceMatcher(None, target, self._normalize_name(Path(filename).stem)).ratio()
+            if score >= best_score:
+                best, best_score = filename, score
+        
+        return self.assets_dir / best if best else None
+    
+    @staticmethod
+    def _normalize_name(name: str) -> str:
+        """Lowercase a name and drop generated-image suffixes and punctuation."""
+        name = name.lower()
+        for suffix in GENERATED_SUFFIXES:
+            if name.endswith(suffix):
+                name = name[:-len(suffix)]
+                break
+        return re.sub(r'[^a-z0-9]', '', name)
+    
     def validate_asset(self, filename: str) -> tuple[bool, Optional[str]]:
         """
         Validate an asset file.
@@ -185,8 +299,8 @@ class AssetManager:
             return False, f"Unsupported image format: {filename}"
         
         try:
-            img = Image.open(filepath)
-            img.verify()
+            with Image.open(filepath) as img:
+                img.verify()
             app_logger.debug(f" Asset validated: {filename}")
             return True, None
             
@@ -0,0 +1,70 @@
+"""
+Back-pressure Service
+Byte budget for data held between pipeline stages.
+
+Base images are decoded to full-resolution pixels, so a brief with hundreds of
+products could hold gigabytes if image sources ran ahead of rendering. The
+stage graph charges every stage output to a MemoryBudget and holds back new
+source work while the budget is full, which bounds peak memory regardless of
+brief size.
+"""
+
+import threading
+from typing import Any
+from PIL import Image
+
+
+def payload_size(value: Any) -> int:
+    """
+    Estimate the memory held by a stage output.
+
+    Decoded images count their pixel buffer, encoded assets their bytes;
+    anything else (text, paths, small records) counts as zero.
+
+    Args:
+        value: Stage output
+
+    Returns:
+        Size in bytes
+    """
+    if isinstance(value, Image.Image):
+        return value.width * value.height * len(value.getbands())
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return len(value)
+    return 0
+
+
+class MemoryBudget:
+    """Thread-safe count of bytes held against a limit."""
+
+    def __init__(self, limit_bytes: int):
+        """
+        Initialize MemoryBudget.
+
+        Args:
+            limit_bytes: Bytes that may be held before producers are held back
+        """
+        self.limit_bytes = limit_bytes
+        self.held_bytes = 0
+        self.peak_bytes = 0
+        self._lock = threading.Lock()
+
+    def charge(self, nbytes: int):
+        """Account for bytes now held."""
+        if nbytes <= 0:
+            return
+        with self._lock:
+            self.held_bytes += nbytes
+            self.peak_bytes = max(self.peak_bytes, self.held_bytes)
+
+    def release(self, nbytes: int):
+        """Account for bytes no longer held."""
+        if nbytes <= 0:
+            return
+        with self._lock:
+            self.held_bytes = max(0, self.held_bytes - nbytes)
+
+    def has_room(self) -> bool:
+        """Check if producers may start more work."""
+        with self._lock:
+            return self.held_bytes < self.limit_bytes
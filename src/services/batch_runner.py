@@ -0,0 +1,153 @@
+"""
+Batch Runner Service
+Runs the campaign pipeline over many briefs with a bounded worker pool.
+"""
+
+import glob
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Iterable, Optional
+
+from src.models.batch import BatchSummary, BriefRunResult
+from src.utils.logger import app_logger
+from src.config import settings
+
+BRIEF_EXTENSIONS = (".json", ".yaml", ".yml")
+
+
+class BatchRunner:
+    """Runs many campaign briefs in parallel, one pipeline per worker."""
+
+    def __init__(
+        self,
+        pipeline_factory: Callable[[], Any],
+        max_workers: Optional[int] = None,
+        run_kwargs: Optional[dict] = None,
+    ):
+        """
+        Initialize BatchRunner.
+
+        Args:
+            pipeline_factory: Callable returning a pipeline with a run(brief_path) method
+            max_workers: Number of briefs processed concurrently (defaults to config)
+            run_kwargs: Extra keyword arguments passed to pipeline.run
+        """
+        self.pipeline_factory = pipeline_factory
+        self.max_workers = max(1, max_workers or settings.batch_workers)
+        self.run_kwargs = run_kwargs or {}
+        self._local = threading.local()
+
+    @staticmethod
+    def collect_briefs(patterns: Iterable[str]) -> list[Path]:
+        """
+        Expand files, directories and glob patterns into brief paths.
+
+        Args:
+            patterns: Brief files, directories or glob patterns
+
+        Returns:
+            De-duplicated list of brief paths in the order given
+        """
+        briefs = []
+        seen = set()
+
+        for pattern in patterns:
+            path = Path(pattern)
+
+            if path.is_dir():
+                candidates = sorted(
+                    p
+                    for p in path.iterdir()
+                    if p.is_file() and p.suffix.lower() in BRIEF_EXTENSIONS
+                )
+            elif path.is_file():
+                candidates = [path]
+            else:
+                candidates = sorted(
+                    Path(p)
+                    for p in glob.glob(pattern, recursive=True)
+                    if Path(p).is_file() and Path(p).suffix.lower() in BRIEF_EXTENSIONS
+                )
+
+            if not candidates:
+                app_logger.warning(f"No briefs matched: {pattern}")
+
+            for candidate in candidates:
+                key = candidate.resolve()
+                if key not in seen:
+                    seen.add(key)
+                    briefs.append(candidate)
+
+        return briefs
+
+    def run(self, brief_paths: Iterable[Path]) -> BatchSummary:
+        """
+        Run the pipeline for every brief.
+
+        Args:
+            brief_paths: Brief files to process
+
+        Returns:
+            BatchSummary with one result per brief, in input order
+        """
+        brief_paths = list(brief_paths)
+        summary = BatchSummary(started_at=datetime.now().isoformat(), workers=self.max_workers)
+
+        app_logger.info(f"📦 Batch run: {len(brief_paths)} briefs with {self.max_workers} workers")
+
+        with ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix="brief-worker"
+        ) as executor:
+            summary.results = list(executor.map(self._run_one, brief_paths))
+
+        summary.finished_at = datetime.now().isoformat()
+
+        app_logger.info(
+            f"📊 Batch complete: {summary.succeeded} succeeded, "
+            f"{summary.partial} partial, {summary.failed} failed"
+        )
+
+        return summary
+
+    def _get_pipeline(self):
+        """Get the pipeline owned by the current worker thread."""
+        pipeline = getattr(self._local, "pipeline", None)
+        if pipeline is None:
+            pipeline = self.pipeline_factory()
+            self._local.pipeline = pipeline
+        return pipeline
+
+    def _run_one(self, brief_path: Path) -> BriefRunResult:
+        """Run a single brief and convert the outcome into a result record."""
+        started = time.perf_counter()
+
+        try:
+            output = self._get_pipeline().run(Path(brief_path), **self.run_kwargs)
+        except Exception as e:
+            app_logger.error(f"Brief failed: {brief_path}: {e}")
+            return BriefRunResult(
+                brief_path=str(brief_path),
+                status="failed",
+                errors=[str(e)],
+                duration_seconds=round(time.perf_counter() - started, 3),
+            )
+
+        if not output.has_errors():
+            status = "succeeded"
+        elif output.success_count() > 0:
+            status = "partial"
+        else:
+            status = "failed"
+
+        return BriefRunResult(
+            brief_path=str(brief_path),
+            status=status,
+            campaign_id=output.campaign_id,
+            output_directory=output.output_directory,
+            assets_generated=output.success_count(),
+            errors=list(output.errors),
+            duration_seconds=round(time.perf_counter() - started, 3),
+        )
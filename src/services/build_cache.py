@@ -0,0 +1,200 @@
+"""
+Build Cache Service
+Content-addressed store for rendered assets and expensive intermediate results.
+
+Every output asset is keyed by a hash of everything that affects its pixels
+(source image bytes, text, font file, layout, ratio, encoder settings and
+renderer version). Re-runs link existing objects into the new campaign
+directory instead of rendering them again.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+from pathlib import Path
+from typing import Any, Optional
+from PIL import Image
+from src.config import settings
+from src.utils.logger import app_logger
+
+
+class BuildCache:
+    """Content-addressed object and value store."""
+
+    def __init__(self, cache_dir: Optional[Path] = None):
+        """
+        Initialize BuildCache.
+
+        Args:
+            cache_dir: Root directory of the cache (defaults to config)
+        """
+        self.cache_dir = Path(cache_dir or settings.cache_dir)
+        self.objects_dir = self.cache_dir / "objects"
+        self.values_dir = self.cache_dir / "values"
+        self.objects_dir.mkdir(parents=True, exist_ok=True)
+        self.values_dir.mkdir(parents=True, exist_ok=True)
+
+        self._digests: dict[tuple, str] = {}
+        self._lock = threading.Lock()
+
+        app_logger.info(f"BuildCache initialized: {self.cache_dir}")
+
+    @staticmethod
+    def make_key(**parts: Any) -> str:
+        """
+        Build a cache key from named inputs.
+
+        Args:
+            **parts: JSON-serializable values that determine the result
+
+        Returns:
+            Hex SHA-256 digest of the canonical JSON encoding
+        """
+        payload = json.dumps(parts, sort_keys=True, default=str, ensure_ascii=False)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def file_digest(self, path: Path) -> str:
+        """
+        Hash a file's bytes, memoized by path, size and modification time.
+
+        Args:
+            path: File to hash
+
+        Returns:
+            Hex SHA-256 digest of the file contents
+        """
+        path = Path(path)
+        stat = path.stat()
+        memo_key = (str(path.resolve()), stat.st_size, stat.st_mtime_ns)
+
+        with self._lock:
+            digest = self._digests.get(memo_key)
+        if digest:
+            return digest
+
+        sha = hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                sha.update(chunk)
+        digest = sha.hexdigest()
+
+        with self._lock:
+            self._digests[memo_key] = digest
+        return digest
+
+    def image_digest(self, image: Image.Image) -> str:
+        """
+        Hash a source image, preferring the bytes of the file it was opened from.
+
+        Args:
+            image: PIL Image
+
+        Returns:
+            Hex SHA-256 digest
+        """
+        filename = getattr(image, "filename", None)
+        if filename and Path(filename).is_file():
+            return self.file_digest(Path(filename))
+
+        sha = hashlib.sha256()
+        sha.update(f"{image.mode}:{image.size}".encode("utf-8"))
+        sha.update(image.tobytes())
+        return sha.hexdigest()
+
+    def object_path(self, key: str, suffix: str = ".png") -> Path:
+        """Get the store location for an object key."""
+        return self.objects_dir / key[:2] / f"{key}{suffix}"
+
+    def get_object(self, key: str, suffix: str = ".png") -> Optional[Path]:
+        """
+        Look up a stored object.
+
+        Args:
+            key: Object key
+            suffix: File extension of the object
+
+        Returns:
+            Path to the object if present, None otherwise
+        """
+        path = self.object_path(key, suffix)
+        return path if path.is_file() else None
+
+    def put_object(self, key: str, source: Path) -> Path:
+        """
+        Add a file to the store under a key.
+
+        The file is hardlinked when possible and copied otherwise; the store
+        entry is published atomically so readers never see partial objects.
+
+        Args:
+            key: Object key
+            source: File to store
+
+        Returns:
+            Path to the stored object
+        """
+        source = Path(source)
+        target = self.object_path(key, source.suffix)
+        if target.is_file():
+            return target
+
+        target.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=target.parent, suffix=".tmp")
+        os.close(fd)
+        tmp_path = Path(tmp_name)
+
+        try:
+            tmp_path.unlink()
+            try:
+                os.link(source, tmp_path)
+            except OSError:
+                shutil.copy2(source, tmp_path)
+            os.replace(tmp_path, target)
+        finally:
+            tmp_path.unlink(missing_ok=True)
+
+        app_logger.debug(f"Stored object {key[:12]} from {source.name}")
+        return target
+
+    def get_value(self, key: str) -> Optional[Any]:
+        """
+        Look up a cached JSON value.
+
+        Args:
+            key: Value key
+
+        Returns:
+            Cached value, or None if missing or unreadable
+        """
+        path = self.values_dir / key[:2] / f"{key}.json"
+        if not path.is_file():
+            return None
+
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except Exception as e:
+            app_logger.warning(f"Ignoring unreadable cache value {key[:12]}: {e}")
+            return None
+
+    def put_value(self, key: str, value: Any):
+        """
+        Store a JSON value atomically.
+
+        Args:
+            key: Value key
+            value: JSON-serializable value
+        """
+        path = self.values_dir / key[:2] / f"{key}.json"
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(value, f, ensure_ascii=False)
+            os.replace(tmp_name, path)
+        finally:
+            Path(tmp_name).unlink(missing_ok=True)
@@ -0,0 +1,123 @@
+"""
+Cost Model Service
+Per-stage time estimates learned from past runs.
+
+After every stage graph execution the pipeline records how long each stage
+took per asset. Estimates are exponentially weighted moving averages, so they
+follow changes in API latency or hardware without being thrown off by a
+single slow run. The job queue uses them to decide whether a deadline can
+still be met.
+"""
+
+import json
+import os
+import tempfile
+import threading
+from pathlib import Path
+from typing import Optional
+from src.config import settings
+from src.utils.logger import app_logger
+
+COST_FILENAME = "stage_costs.json"
+
+# Weight of the newest observation in the moving averages
+EWMA_ALPHA = 0.3
+
+# Seconds per asset assumed before any run has been observed
+DEFAULT_CELL_SECONDS = 2.0
+
+
+class CostModel:
+    """Moving averages of stage seconds per asset, persisted in the cache directory."""
+
+    def __init__(self, path: Optional[Path] = None):
+        """
+        Initialize CostModel, loading earlier observations.
+
+        Args:
+            path: JSON file holding the estimates (defaults to the cache directory)
+        """
+        self.path = Path(path or settings.cache_dir / COST_FILENAME)
+        self.stages: dict[str, dict] = {}
+        self._mtime: Optional[float] = None
+        self._lock = threading.Lock()
+        self.refresh()
+
+    def refresh(self):
+        """Reload the estimates if another process saved newer ones."""
+        try:
+            mtime = self.path.stat().st_mtime
+        except FileNotFoundError:
+            return
+        if mtime == self._mtime:
+            return
+
+        try:
+            stages = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError) as e:
+            app_logger.warning(f"Ignoring unreadable cost model {self.path}: {e}")
+            return
+        with self._lock:
+            self.stages = stages
+            self._mtime = mtime
+
+    def observe(self, stage_seconds: dict[str, float], cells: int):
+        """
+        Fold one run's stage timings into the estimates.
+
+        Args:
+            stage_seconds: Total seconds spent in each stage
+            cells: Assets the run produced
+        """
+        if cells <= 0:
+            return
+        with self._lock:
+            for stage, seconds in stage_seconds.items():
+                sample = seconds / cells
+                entry = self.stages.get(stage)
+                if entry is None:
+                    self.stages[stage] = {"seconds": sample, "samples": 1}
+                else:
+                    entry["seconds"] += EWMA_ALPHA * (sample - entry["seconds"])
+                    entry["samples"] += 1
+
+    def stage_seconds(self, stage: str) -> Optional[float]:
+        """
+        Get the per-asset estimate of one stage.
+
+        Args:
+            stage: Stage name
+
+        Returns:
+            Seconds per asset, or None if the stage was never observed
+        """
+        with self._lock:
+            entry = self.stages.get(stage)
+            return entry["seconds"] if entry else None
+
+    def cell_seconds(self) -> float:
+        """
+        Estimate the time to produce one asset.
+
+        Returns:
+            Sum of the per-asset stage estimates
+        """
+        with self._lock:
+            if not self.stages:
+                return DEFAULT_CELL_SECONDS
+            return sum(entry["seconds"] for entry in self.stages.values())
+
+    def save(self):
+        """Write the estimates atomically."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            payload = json.dumps(self.stages, indent=2, sort_keys=True)
+
+        fd, tmp_name = tempfile.mkstemp(dir=self.path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(payload)
+            os.replace(tmp_name, self.path)
+            self._mtime = self.path.stat().st_mtime
+        finally:
+            Path(tmp_name).unlink(missing_ok=True)
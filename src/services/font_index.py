@@ -0,0 +1,340 @@
+"""
+Font Index Service
+Records which characters each bundled font covers, so text is drawn with a
+font that has glyphs for it instead of rendering tofu boxes.
+
+The index reads every font under data/fonts once: family, style, weight
+and its cmap as sorted codepoint ranges. It is saved to the cache directory
+and rebuilt only when a font directory's modification time changes.
+Checking a string costs one range lookup per distinct character.
+"""
+
+import bisect
+import json
+import struct
+import threading
+from pathlib import Path
+from typing import NamedTuple, Optional
+from src.config import settings
+from src.utils.logger import app_logger
+
+FONT_SUFFIXES = (".ttf", ".otf", ".ttc")
+
+# cmap subtables in order of preference: full Unicode first, then the BMP
+UNICODE_SUBTABLES = [(3, 10), (0, 6), (0, 4), (3, 1), (0, 3), (0, 2), (0, 1), (0, 0)]
+
+
+class FontInfo(NamedTuple):
+    """A font file and the characters it covers."""
+
+    path: str
+    family: str
+    style: str
+    weight: int
+    ranges: tuple[tuple[int, int], ...]
+
+    def covers(self, codepoint: int) -> bool:
+        """Check if the font has a glyph for a codepoint."""
+        i = bisect.bisect_right(self.ranges, (codepoint, 0x10FFFF)) - 1
+        return i >= 0 and self.ranges[i][0] <= codepoint <= self.ranges[i][1]
+
+
+def _merge(ranges: list[tuple[int, int]]) -> tuple[tuple[int, int], ...]:
+    """Sort ranges and join overlapping or adjacent ones."""
+    merged: list[list[int]] = []
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1] + 1:
+            merged[-1][1] = max(merged[-1][1], end)
+        else:
+            merged.append([start, end])
+    return tuple((start, end) for start, end in merged)
+
+
+def _read_cmap_format4(data: bytes, offset: int) -> list[tuple[int, int]]:
+    """Read the mapped codepoints of a segment-mapping (BMP) subtable."""
+    seg_count = struct.unpack_from(">H", data, offset + 6)[0] // 2
+    ends = offset + 14
+    starts = ends + seg_count * 2 + 2
+    deltas = starts + seg_count * 2
+    range_offsets = deltas + seg_count * 2
+
+    ranges = []
+    for i in range(seg_count):
+        end = struct.unpack_from(">H", data, ends + i * 2)[0]
+        start = struct.unpack_from(">H", data, starts + i * 2)[0]
+        delta = struct.unpack_from(">H", data, deltas + i * 2)[0]
+        range_offset = struct.unpack_from(">H", data, range_offsets + i * 2)[0]
+        if start == 0xFFFF or start > end:
+            continue
+
+        if range_offset == 0:
+            # Glyph is (codepoint + delta) mod 65536; only one codepoint can map to glyph 0
+            missing = -delta & 0xFFFF
+            if start <= missing <= end:
+                ranges += [(start, missing - 1), (missing + 1, end)]
+            else:
+                ranges.append((start, end))
+            continue
+
+        for codepoint in range(start, end + 1):
+            address = range_offsets + i * 2 + range_offset + (codepoint - start) * 2
+            glyph = struct.unpack_from(">H", data, address)[0]
+            if glyph and (glyph + delta) & 0xFFFF:
+                ranges.append((codepoint, codepoint))
+
+    return [(start, end) for start, end in ranges if start <= end]
+
+
+def _read_cmap_format12(data: bytes, offset: int) -> list[tuple[int, int]]:
+    """Read the mapped codepoints of a segmented-coverage (full Unicode) subtable."""
+    groups = struct.unpack_from(">I", data, offset + 12)[0]
+    ranges = []
+    for i in range(groups):
+        start, end, glyph = struct.unpack_from(">III", data, offset + 16 + i * 12)
+        if glyph == 0:
+            start += 1
+        if start <= end:
+            ranges.append((start, end))
+    return ranges
+
+
+def _read_name(data: bytes, offset: int, name_ids: tuple[int, ...]) -> str:
+    """Read the first of the given name IDs from the name table."""
+    count, strings = struct.unpack_from(">HH", data, offset + 2)
+    found = {}
+    for i in range(count):
+        platform, encoding, _, name_id, length, string_offset = struct.unpack_from(
+            ">HHHHHH", data, offset + 6 + i * 12
+        )
+        if name_id not in name_ids or name_id in found:
+            continue
+        raw = data[offset + strings + string_offset : offset + strings + string_offset + length]
+        if platform in (0, 3):
+            found[name_id] = raw.decode("utf-16-be", errors="replace")
+        elif platform == 1 and encoding == 0:
+            found[name_id] = raw.decode("latin-1")
+    return next((found[name_id] for name_id in name_ids if name_id in found), "")
+
+
+def read_font_info(path: Path) -> FontInfo:
+    """
+    Read a font's names, weight and character coverage.
+
+    Only the first face of a collection is read.
+
+    Args:
+        path: TrueType/OpenType font file
+
+    Returns:
+        FontInfo for the font
+
+    Raises:
+        ValueError: If the file is not a readable font
+    """
+    data = Path(path).read_bytes()
+    try:
+        base = struct.unpack_from(">I", data, 12)[0] if data[:4] == b"ttcf" else 0
+        table_count = struct.unpack_from(">H", data, base + 4)[0]
+        tables = {}
+        for i in range(table_count):
+            tag, _, offset, _ = struct.unpack_from(">4sIII", data, base + 12 + i * 16)
+            tables[tag.decode("latin-1")] = offset
+
+        ranges = []
+        if "cmap" in tables:
+            cmap = tables["cmap"]
+            subtable_count = struct.unpack_from(">H", data, cmap + 2)[0]
+            subtables = {}
+            for i in range(subtable_count):
+                platform, encoding, offset = struct.unpack_from(">HHI", data, cmap + 4 + i * 8)
+                subtables.setdefault((platform, encoding), cmap + offset)
+            for key in UNICODE_SUBTABLES:
+                if key not in subtables:
+                    continue
+                offset = subtables[key]
+                subtable_format = struct.unpack_from(">H", data, offset)[0]
+                if subtable_format == 12:
+                    ranges = _read_cmap_format12(data, offset)
+                elif subtable_format == 4:
+                    ranges = _read_cmap_format4(data, offset)
+                else:
+                    continue
+                break
+
+        family = style = ""
+        if "name" in tables:
+            family = _read_name(data, tables["name"], (16, 1))
+            style = _read_name(data, tables["name"], (17, 2))
+        weight = struct.unpack_from(">H", data, tables["OS/2"] + 4)[0] if "OS/2" in tables else 400
+    except struct.error as e:
+        raise ValueError(f"Unreadable font {path}: {e}") from e
+
+    return FontInfo(str(path), family or Path(path).stem, style, weight, _merge(ranges))
+
+
+class FontIndex:
+    """Coverage index of the fonts in a directory tree."""
+
+    def __init__(self, fonts_dir: Path, index_path: Optional[Path] = None):
+        """
+        Initialize FontIndex, loading the saved index or rebuilding it.
+
+        Args:
+            fonts_dir: Root font directory (searched recursively)
+            index_path: Where the index is saved (defaults to the cache directory)
+        """
+        self.fonts_dir = Path(fonts_dir)
+        self.index_path = Path(index_path or settings.cache_dir / "font_index.json")
+        self.fingerprint = self._fingerprint()
+        self.fonts: list[FontInfo] = self._load() or self._build()
+
+    def _fingerprint(self) -> dict[str, int]:
+        """Modification times of the font directories; adding or removing a font changes them."""
+        if not self.fonts_dir.is_dir():
+            return {}
+        directories = [self.fonts_dir] + sorted(p for p in self.fonts_dir.rglob("*") if p.is_dir())
+        return {str(d): d.stat().st_mtime_ns for d in directories}
+
+    def is_current(self) -> bool:
+        """Check if no font directory changed since the index was built."""
+        return self._fingerprint() == self.fingerprint
+
+    def _load(self) -> Optional[list[FontInfo]]:
+        """Read the saved index if it matches the font directories."""
+        try:
+            saved = json.loads(self.index_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        if (
+            saved.get("fonts_dir") != str(self.fonts_dir)
+            or saved.get("fingerprint") != self.fingerprint
+        ):
+            return None
+        return [
+            FontInfo(
+                f["path"], f["family"], f["style"], f["weight"], tuple(map(tuple, f["ranges"]))
+            )
+            for f in saved["fonts"]
+        ]
+
+    def _build(self) -> list[FontInfo]:
+        """Read every font and save the index."""
+        fonts = []
+        if self.fonts_dir.is_dir():
+            for path in sorted(self.fonts_dir.rglob("*")):
+                if path.suffix.lower() not in FONT_SUFFIXES:
+                    continue
+                try:
+                    fonts.append(read_font_info(path))
+                except (OSError, ValueError) as e:
+                    app_logger.warning(f"Skipping font {path}: {e}")
+
+        try:
+            self.index_path.parent.mkdir(parents=True, exist_ok=True)
+            self.index_path.write_text(
+                json.dumps(
+                    {
+                        "fonts_dir": str(self.fonts_dir),
+                        "fingerprint": self.fingerprint,
+                        "fonts": [info._asdict() for info in fonts],
+                    }
+                ),
+                encoding="utf-8",
+            )
+        except OSError as e:
+            app_logger.warning(f"Could not save font index: {e}")
+
+        app_logger.info(f"Indexed {len(fonts)} fonts in {self.fonts_dir}")
+        return fonts
+
+    def files_in(self, subdir: str) -> list[Path]:
+        """
+        List indexed font files in a subdirectory.
+
+        Args:
+            subdir: Subdirectory of the font directory (latin, japanese, fallback)
+
+        Returns:
+            Font paths, sorted by name
+        """
+        directory = self.fonts_dir / subdir
+        return [Path(f.path) for f in self.fonts if Path(f.path).parent == directory]
+
+    def info(self, path: Path) -> Optional[FontInfo]:
+        """Get the indexed entry of a font file."""
+        path = str(path)
+        return next((f for f in self.fonts if f.path == path), None)
+
+    @staticmethod
+    def _codepoints(text: str) -> set[int]:
+        """Distinct characters that need a glyph (whitespace and controls do not)."""
+        return {ord(c) for c in text if not c.isspace() and c.isprintable()}
+
+    def missing(self, path: Path, text: str) -> str:
+        """
+        Get the characters of a string a font has no glyph for.
+
+        Args:
+            path: Font file
+            text: Text to check
+
+        Returns:
+            Missing characters in codepoint order (empty if the font covers the text
+            or is not indexed)
+        """
+        info = self.info(path)
+        if info is None:
+            return ""
+        return "".join(chr(cp) for cp in sorted(self._codepoints(text)) if not info.covers(cp))
+
+    def font_for(self, text: str, preferred: Optional[Path] = None) -> Optional[Path]:
+        """
+        Choose the font that covers a string.
+
+        The preferred font is kept if it covers the text. Otherwise the font
+        covering the most characters wins, ties going to the weight closest to
+        the preferred font's.
+
+        Args:
+            text: Text to draw
+            preferred: Font picked by language
+
+        Returns:
+            Path of the chosen font, or None if no indexed font covers any of the text
+        """
+        codepoints = self._codepoints(text)
+        preferred_info = self.info(preferred) if preferred is not None else None
+        if preferred_info is not None and all(preferred_info.covers(cp) for cp in codepoints):
+            return Path(preferred_info.path)
+
+        weight = preferred_info.weight if preferred_info is not None else 700
+        best, best_key = None, None
+        for info in self.fonts:
+            covered = sum(1 for cp in codepoints if info.covers(cp))
+            key = (covered, -abs(info.weight - weight), info is preferred_info)
+            if covered and (best_key is None or key > best_key):
+                best, best_key = info, key
+
+        return Path(best.path) if best is not None else None
+
+
+_indexes: dict[tuple[str, str], FontIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_index(fonts_dir: Path) -> FontIndex:
+    """
+    Get the font index of a directory, rebuilding it if a font was added or removed.
+
+    Args:
+        fonts_dir: Root font directory
+
+    Returns:
+        Current FontIndex shared by this process
+    """
+    key = (str(fonts_dir), str(settings.cache_dir))
+    with _indexes_lock:
+        index = _indexes.get(key)
+        if index is None or not index.is_current():
+            index = _indexes[key] = FontIndex(fonts_dir)
+        return index
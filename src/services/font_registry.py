@@ -0,0 +1,168 @@
+"""
+Font Registry Service
+Process-wide cache of loaded fonts keyed by font file and size.
+
+Every ImageProcessor (one per pipeline, and pipelines are kept warm by the
+render service and queue workers) resolves fonts through this registry, so a
+font file is opened once per size per process. Entries are evicted least
+recently used first once their estimated memory exceeds the budget. The
+estimate grows with the square of the size, because FreeType's glyph
+bitmaps do, so a few very large sizes push out many small ones.
+"""
+
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Iterable, Optional
+from PIL import ImageFont
+from src.config import settings
+from src.utils.logger import app_logger
+
+# Estimated memory of a loaded face, plus rendered glyph bitmaps (one byte
+# per pixel, for roughly the glyphs a campaign message uses)
+FACE_OVERHEAD_BYTES = 64 * 1024
+CACHED_GLYPHS = 128
+
+
+def estimate_font_bytes(size: int) -> int:
+    """
+    Estimate the memory a font holds at a size.
+
+    Args:
+        size: Font size in pixels
+
+    Returns:
+        Estimated bytes
+    """
+    return FACE_OVERHEAD_BYTES + size * size * CACHED_GLYPHS
+
+
+class FontRegistry:
+    """Thread-safe LRU of loaded fonts, bounded by estimated memory."""
+
+    def __init__(self, max_bytes: Optional[int] = None):
+        """
+        Initialize FontRegistry.
+
+        Args:
+            max_bytes: Estimated font memory kept before fonts are evicted
+                (defaults to config)
+        """
+        if max_bytes is None:
+            max_bytes = settings.font_cache_mb * 1024 * 1024
+        self.max_bytes = max_bytes
+        self._fonts: OrderedDict[tuple[str, int], ImageFont.FreeTypeFont] = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._loading: dict[tuple[str, int], threading.Lock] = {}
+        self._counts = {"hits": 0, "loads": 0, "evictions": 0}
+
+    def get(self, font_path: Path, size: int) -> ImageFont.FreeTypeFont:
+        """
+        Get a font, loading it on first use.
+
+        Concurrent requests for the same font wait for one load.
+
+        Args:
+            font_path: Font file
+            size: Font size in pixels
+
+        Returns:
+            Loaded font object
+
+        Raises:
+            OSError: If the font file cannot be read
+        """
+        key = (str(font_path), size)
+        with self._lock:
+            font = self._lookup(key)
+            if font is not None:
+                return font
+            loading = self._loading.setdefault(key, threading.Lock())
+
+        with loading:
+            with self._lock:
+                font = self._lookup(key)
+                if font is not None:
+                    return font
+
+            font = ImageFont.truetype(key[0], size)
+
+            with self._lock:
+                self._loading.pop(key, None)
+                self._counts["loads"] += 1
+                self._store(key, font)
+
+        app_logger.info(f"✅ Loaded font: {Path(key[0]).name} at {size}px")
+        return font
+
+    def preload(self, fonts: Iterable[tuple[Path, int]]) -> int:
+        """
+        Load fonts ahead of the first render.
+
+        Args:
+            fonts: (font file, size) pairs
+
+        Returns:
+            Number of fonts now loaded
+        """
+        loaded = 0
+        for font_path, size in fonts:
+            try:
+                self.get(font_path, size)
+                loaded += 1
+            except OSError as e:
+                app_logger.warning(f"Could not preload {font_path} at {size}px: {e}")
+        return loaded
+
+    def clear(self):
+        """Drop all loaded fonts."""
+        with self._lock:
+            self._fonts.clear()
+            self._bytes = 0
+
+    def metrics(self) -> dict:
+        """
+        Get registry occupancy and hit counts.
+
+        Returns:
+            Dictionary with font count, estimated bytes, budget, hits, loads and evictions
+        """
+        with self._lock:
+            return {
+                "fonts": len(self._fonts),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                **self._counts,
+            }
+
+    def _lookup(self, key: tuple[str, int]) -> Optional[ImageFont.FreeTypeFont]:
+        """Find a loaded font and mark it recently used; call with the lock held."""
+        font = self._fonts.get(key)
+        if font is not None:
+            self._fonts.move_to_end(key)
+            self._counts["hits"] += 1
+        return font
+
+    def _store(self, key: tuple[str, int], font: ImageFont.FreeTypeFont):
+        """Add a font and evict until within budget; call with the lock held."""
+        self._fonts[key] = font
+        self._bytes += estimate_font_bytes(key[1])
+        # Always keep the font just loaded, even if it alone exceeds the budget
+        while self._bytes > self.max_bytes and len(self._fonts) > 1:
+            evicted, _ = self._fonts.popitem(last=False)
+            self._bytes -= estimate_font_bytes(evicted[1])
+            self._counts["evictions"] += 1
+
+
+_registry: Optional[FontRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_registry() -> FontRegistry:
+    """Get the font registry shared by all image processors of this process."""
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = FontRegistry()
+        return _registry
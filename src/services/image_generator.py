@@ -10,7 +10,14 @@ from PIL import Image
 from io import BytesIO
 from openai import OpenAI
 from src.config import settings
+from src.services.retry import TransientError, is_transient
+from src.utils import cancellation
+from src.utils.cancellation import RunCancelled
 from src.utils.logger import app_logger
+from src.utils.tracing import traced
+
+
+DOWNLOAD_CHUNK_BYTES = 64 * 1024
 
 
 class ImageGenerator:
@@ -29,9 +36,10 @@ class ImageGenerator:
             app_logger.warning("No OpenAI API key provided")
             self.client = None
         else:
-            self.client = OpenAI(api_key=self.api_key)
+            self.client = OpenAI(api_key=self.api_key, timeout=settings.openai_timeout_seconds)
             app_logger.info("ImageGenerator initialized with OpenAI client")
     
+    @traced(category="network")
     def generate_product_image(
         self,
         product_name: str,
@@ -52,21 +60,16 @@ class ImageGenerator:
             
         Returns:
             PIL Image object if successful, None otherwise
+            
+        Raises:
+            TransientError: On timeouts, rate limits and server errors,
+                which are worth retrying later
         """
         if not self.client:
             app_logger.error("OpenAI client not initialized. Check API key.")
             return None
         
-        # Build prompt
-        if prompt:
-            full_prompt = prompt
-        else:
-            full_prompt = (
-                f"Professional product photography of {product_name}. "
-                f"{description}. "
-                f"High quality, clean background, centered composition, "
-                f"studio lighting, commercial photography style."
-            )
+        full_prompt = self.build_prompt(product_name, description, prompt)
         
         app_logger.info(f" Generating image for '{product_name}'...")
         app_logger.debug(f"Prompt: {full_prompt}")
@@ -94,10 +97,42 @@ class ImageGenerator:
             
             return image
             
+        except (TransientError, RunCancelled):
+            raise
         except Exception as e:
             app_logger.error(f"Failed to generate image for '{product_name}': {e}")
+            if is_transient(e):
+                raise TransientError(f"Image generation for '{product_name}' failed: {e}") from e
             return None
     
+    @staticmethod
+    def build_prompt(
+        product_name: str,
+        description: str,
+        prompt: Optional[str] = None
+    ) -> str:
+        """
+        Build the generation prompt for a product.
+        
+        Args:
+            product_name: Name of the product
+            description: Product description
+            prompt: Custom generation prompt (optional)
+            
+        Returns:
+            Prompt sent to DALL-E
+        """
+        if prompt:
+            return prompt
+        
+        return (
+            f"Professional product photography of {product_name}. "
+            f"{description}. "
+            f"High quality, clean background, centered composition, "
+            f"studio lighting, commercial photography style."
+        )
+    
+    @traced(category="network")
     def _download_image(self, url: str) -> Optional[Image.Image]:
         """
         Download image from URL.
@@ -107,16 +142,30 @@ class ImageGenerator:
             
         Returns:
             PIL Image object if successful, None otherwise
+            
+        Raises:
+            TransientError: If the download timed out or the server failed
+            RunCancelled: If the run was cancelled mid-download
         """
         try:
-            response = requests.get(url, timeout=30)
-            response.raise_for_status()
+            # Stream in chunks so a cancelled run stops downloading
+            buffer = BytesIO()
+            with requests.get(url, timeout=30, stream=True) as response:
+                response.raise_for_status()
+                for chunk in response.iter_content(chunk_size=DOWNLOAD_CHUNK_BYTES):
+                    cancellation.check()
+                    buffer.write(chunk)
             
-            image = Image.open(BytesIO(response.content))
+            buffer.seek(0)
+            image = Image.open(buffer)
             return image
             
+        except RunCancelled:
+            raise
         except Exception as e:
             app_logger.error(f"Failed to download image from URL: {e}")
+            if is_transient(e):
+                raise TransientError(f"Image download failed: {e}") from e
             return None
     
     def generate_and_save(
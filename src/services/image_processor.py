@@ -3,12 +3,38 @@ Image Processor Service
 Handles image resizing, aspect ratio conversion, and multi-language text overlays.
 """
 
+import math
+import threading
+from collections import OrderedDict
 from pathlib import Path
 from typing import Tuple, Optional
 from PIL import Image, ImageDraw, ImageFont
-from functools import lru_cache
 from src.config import settings
+from src.services.font_index import FontIndex, get_index
+from src.services.font_registry import get_registry
+from src.services.overlay_cache import get_tile_cache
+from src.services.text_layout import TextLayout, font_key, get_engine
 from src.utils.logger import app_logger
+from src.utils.script_segmenter import detect_language, font_language, segment
+from src.utils.tracing import traced
+
+
+# Bump whenever a change alters rendered pixels, so cached assets are rebuilt
+RENDERER_VERSION = "4"
+
+# Resize quality tiers: (final resampling filter, reducing gap). With a
+# reducing gap, the image is first shrunk by an integer factor with reduce()
+# until it is no more than that many times the target size; None resamples
+# the full image. Tiers other than "best" also decode JPEGs at reduced scale.
+RESIZE_QUALITY = {
+    "fast": (Image.Resampling.BILINEAR, 1.0),
+    "balanced": (Image.Resampling.LANCZOS, 3.0),
+    "best": (Image.Resampling.LANCZOS, None),
+}
+
+# Memoized font choices per text and fitted font sizes kept per processor
+TEXT_FONT_CACHE_SIZE = 1024
+FIT_CACHE_SIZE = 1024
 
 
 class ImageProcessor:
@@ -17,7 +43,13 @@ class ImageProcessor:
     def __init__(self):
         """Initialize image processor with font directory."""
         self.fonts_dir = Path("data/fonts")
-        self._font_cache = {}
+        self._font_path_cache = {}
+        self._text_font_cache: OrderedDict[tuple, Path] = OrderedDict()
+        self._fit_cache: OrderedDict[tuple, int] = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self.fonts = get_registry()
+        self.layout_engine = get_engine()
+        self.tile_cache = get_tile_cache()
         
         # Log font directory status
         if self.fonts_dir.exists():
@@ -54,38 +86,40 @@ class ImageProcessor:
         Returns:
             Path to font file if found, None otherwise
         """
-        font_path = self.fonts_dir / font_dir
+        font_files = {f.name: f for f in self.font_index.files_in(font_dir)}
         
-        if not font_path.exists():
-            app_logger.debug(f"Font directory not found: {font_path}")
+        if not font_files:
+            app_logger.debug(f"No fonts indexed in: {self.fonts_dir / font_dir}")
             return None
         
         # Try exact matches first
         for name in possible_names:
-            candidate = font_path / name
-            if candidate.exists():
-                app_logger.debug(f"Found exact match: {candidate}")
-                return candidate
+            if name in font_files:
+                app_logger.debug(f"Found exact match: {font_files[name]}")
+                return font_files[name]
         
         # Try case-insensitive and partial matches
-        try:
-            for font_file in font_path.glob("*.ttf"):
-                font_name_lower = font_file.name.lower()
-                for name in possible_names:
-                    name_lower = name.lower()
-                    # Check if names match (ignoring case)
-                    if name_lower == font_name_lower:
-                        app_logger.debug(f"Found case-insensitive match: {font_file}")
-                        return font_file
-                    # Check if font file contains the expected name
-                    if name_lower.replace('-', '').replace('.ttf', '') in font_name_lower.replace('-', ''):
-                        app_logger.debug(f"Found partial match: {font_file}")
-                        return font_file
-        except Exception as e:
-            app_logger.error(f"Error searching fonts in {font_path}: {e}")
+        for font_file in font_files.values():
+            font_name_lower = font_file.name.lower()
+            for name in possible_names:
+                name_lower = name.lower()
+                # Check if names match (ignoring case)
+                if name_lower == font_name_lower:
+                    app_logger.debug(f"Found case-insensitive match: {font_file}")
+                    return font_file
+                # Check if font file contains the expected name
+                stem = name_lower.replace('-', '').replace('.ttf', '')
+                if stem in font_name_lower.replace('-', ''):
+                    app_logger.debug(f"Found partial match: {font_file}")
+                    return font_file
         
         return None
     
+    @property
+    def font_index(self) -> FontIndex:
+        """Coverage index of the bundled fonts (rebuilt when a font directory changes)."""
+        return get_index(self.fonts_dir)
+    
     def get_font_path(self, language: str = 'en') -> Path:
         """
         Get appropriate font path for language.
@@ -102,6 +136,9 @@ class ImageProcessor:
         # Normalize language code
         lang = language.lower()[:2] if language else 'en'
         
+        if lang in self._font_path_cache:
+            return self._font_path_cache[lang]
+        
         app_logger.debug(f"Getting font for language: {lang}")
         
         # Define font search strategy
@@ -156,18 +193,17 @@ class ImageProcessor:
             font_path = self._find_font_file(font_dir, possible_names)
             if font_path:
                 app_logger.info(f"✅ Using font for '{lang}': {font_path}")
+                self._font_path_cache[lang] = font_path
                 return font_path
         
-        # Last resort: search all directories for any .ttf file
+        # Last resort: any indexed font
         app_logger.warning(f"Font for '{lang}' not found in expected locations, searching all directories...")
         
         for subdir in ['japanese', 'latin', 'fallback']:
-            font_path = self.fonts_dir / subdir
-            if font_path.exists():
-                ttf_files = list(font_path.glob("*.ttf"))
-                if ttf_files:
-                    app_logger.warning(f"Using fallback font: {ttf_files[0]}")
-                    return ttf_files[0]
+            font_files = self.font_index.files_in(subdir)
+            if font_files:
+                app_logger.warning(f"Using fallback font: {font_files[0]}")
+                return font_files[0]
         
         # Try system fonts as absolute last resort
         system_fonts = [
@@ -199,14 +235,54 @@ class ImageProcessor:
             f"Run: python scripts/maintenance/download_fonts.py"
         )
     
-    @lru_cache(maxsize=20)
-    def load_font(self, language: str = 'en', size: int = None) -> ImageFont.FreeTypeFont:
+    def select_font_path(self, text: str, language: str = 'en') -> Path:
         """
-        Load font with caching.
+        Get the font to draw text with: the language's font if it has glyphs
+        for every character, otherwise the indexed font covering the most.
+        
+        Args:
+            text: Text to draw
+            language: Language code
+        
+        Returns:
+            Path to font file
+        
+        Raises:
+            FileNotFoundError: If no suitable font found
+        """
+        cache_key = (text, language)
+        cached = self._cached(self._text_font_cache, cache_key)
+        if cached is not None:
+            return cached
+        
+        preferred = self.get_font_path(language)
+        font_path = self.font_index.font_for(text, preferred) or preferred
+        
+        if font_path != preferred:
+            app_logger.info(
+                f"Font for '{language}' lacks glyphs for this text; using {font_path.name}"
+            )
+        missing = self.font_index.missing(font_path, text)
+        if missing:
+            app_logger.warning(f"No bundled font has glyphs for: {missing[:20]}")
+        
+        self._remember(self._text_font_cache, cache_key, font_path, TEXT_FONT_CACHE_SIZE)
+        return font_path
+    
+    def load_font(
+        self,
+        language: str = 'en',
+        size: int = None,
+        text: Optional[str] = None
+    ) -> ImageFont.FreeTypeFont:
+        """
+        Load font through the process-wide font registry.
         
         Args:
             language: Language code
             size: Font size in pixels (uses settings default if None)
+            text: Text the font must cover; picks a covering font if the
+                language's font lacks glyphs for it
         
         Returns:
             Loaded font object
@@ -214,22 +290,12 @@ class ImageProcessor:
         if size is None:
             size = settings.text_font_size
         
-        cache_key = (language, size)
-        
-        # Check cache
-        if cache_key in self._font_cache:
-            app_logger.debug(f"Using cached font for '{language}' at {size}px")
-            return self._font_cache[cache_key]
-        
         try:
-            font_path = self.get_font_path(language)
-            font = ImageFont.truetype(str(font_path), size)
-            
-            # Cache it
-            self._font_cache[cache_key] = font
-            
-            app_logger.info(f"✅ Loaded font: {font_path.name} at {size}px for '{language}'")
-            return font
+            if text:
+                font_path = self.select_font_path(text, language)
+            else:
+                font_path = self.get_font_path(language)
+            return self.fonts.get(font_path, size)
             
         except FileNotFoundError:
             raise
@@ -241,6 +307,35 @@ class ImageProcessor:
             except Exception as e2:
                 raise RuntimeError(f"Failed to load any font: {e}, {e2}")
     
+    def preload_fonts(
+        self,
+        languages: Optional[list[str]] = None,
+        sizes: Optional[list[int]] = None
+    ) -> int:
+        """
+        Load the fonts of the given languages and sizes before the first render.
+        
+        Args:
+            languages: Language codes (uses supported languages if None)
+            sizes: Font sizes in pixels (uses configured preload sizes if None)
+        
+        Returns:
+            Number of fonts loaded
+        """
+        languages = languages or settings.supported_languages_list
+        sizes = sizes or settings.font_preload_sizes_list
+        
+        font_paths = set()
+        for language in languages:
+            try:
+                font_paths.add(self.get_font_path(language))
+            except FileNotFoundError as e:
+                app_logger.warning(f"No font to preload for '{language}': {e}")
+        
+        loaded = self.fonts.preload((path, size) for path in sorted(font_paths) for size in sizes)
+        app_logger.info(f"Preloaded {loaded} fonts for {', '.join(languages)} at {sizes}px")
+        return loaded
+    
     def detect_language(self, text: str) -> str:
         """
         Detect language from text based on character ranges.
@@ -254,69 +349,332 @@ class ImageProcessor:
         if not text:
             return 'en'
         
-        # Japanese (Hiragana, Katakana, Kanji)
-        if any('\u3040' <= c <= '\u309F' or '\u30A0' <= c <= '\u30FF' or '\u4E00' <= c <= '\u9FFF' for c in text):
-            app_logger.debug("Detected Japanese characters")
-            return 'ja'
-        
-        # Chinese (Han characters)
-        if any('\u4E00' <= c <= '\u9FFF' for c in text):
-            app_logger.debug("Detected Chinese characters")
-            return 'zh'
-        
-        # Korean (Hangul)
-        if any('\uAC00' <= c <= '\uD7AF' for c in text):
-            app_logger.debug("Detected Korean characters")
-            return 'ko'
-        
-        # French specific characters
-        if any(c in 'àâæçéèêëïîôùûüÿœÀÂÆÇÉÈÊËÏÎÔÙÛÜŸŒ' for c in text):
-            app_logger.debug("Detected French characters")
-            return 'fr'
-        
-        # Spanish specific characters
-        if any(c in 'áéíñóúüÁÉÍÑÓÚÜ¿¡' for c in text):
-            app_logger.debug("Detected Spanish characters")
-            return 'es'
-        
-        # German specific characters
-        if any(c in 'äöüßÄÖÜ' for c in text):
-            app_logger.debug("Detected German characters")
-            return 'de'
-        
-        # Italian
-        if any(c in 'àèéìíîòóùúÀÈÉÌÍÎÒÓÙÚ' for c in text):
-            app_logger.debug("Detected Italian characters")
-            return 'it'
-        
-        # Portuguese
-        if any(c in 'ãõÃÕ' for c in text):
-            app_logger.debug("Detected Portuguese characters")
-            return 'pt'
-        
-        # Default to English
-        app_logger.debug("Defaulting to English")
-        return 'en'
+        language = detect_language(text)
+        app_logger.debug(f"Detected language: {language}")
+        return language
+    
+    def font_paths_for(self, text: str, language: str = 'en') -> list[tuple[str, Path]]:
+        """
+        Split text into script runs and pick the font file for each.
+        
+        CJK and Hangul runs use their script's font, and Latin (or other
+        script) runs inside a CJK message use the default font; everything
+        else uses the language's font. Neighbouring runs that end up with the
+        same font are merged.
+        
+        Args:
+            text: Text to draw
+            language: Language code of the message
+        
+        Returns:
+            (run text, font path) pairs covering the text in order
+        
+        Raises:
+            FileNotFoundError: If no suitable font found
+        """
+        runs: list[tuple[str, Path]] = []
+        for run in segment(text):
+            font_path = self.select_font_path(run.text, font_language(run.script, language))
+            if runs and runs[-1][1] == font_path:
+                runs[-1] = (runs[-1][0] + run.text, font_path)
+            else:
+                runs.append((run.text, font_path))
+        return runs
+    
+    def load_font_runs(
+        self,
+        text: str,
+        language: str = 'en',
+        size: int = None
+    ) -> list[tuple[str, ImageFont.FreeTypeFont]]:
+        """
+        Load the font of each script run of a text.
+        
+        Args:
+            text: Text to draw
+            language: Language code of the message
+            size: Font size in pixels (uses settings default if None)
+        
+        Returns:
+            (run text, font) pairs covering the text in order
+        """
+        if size is None:
+            size = settings.text_font_size
+        
+        runs = []
+        for run_text, font_path in self.font_paths_for(text, language):
+            try:
+                font = self.fonts.get(font_path, size)
+            except Exception as e:
+                app_logger.error(f"Failed to load font {font_path}: {e}")
+                font = self.load_font(language, size)
+            runs.append((run_text, font))
+        return runs
     
+    def fit_font_size(
+        self,
+        text: str,
+        width: int,
+        height: int,
+        language: Optional[str] = None,
+        padding: int = 20,
+        max_lines: Optional[int] = None,
+        min_size: Optional[int] = None,
+        max_size: Optional[int] = None
+    ) -> int:
+        """
+        Find the largest font size at which text fits its band on a canvas.
+        
+        Binary-searches sizes between min_size and max_size. Each probe only
+        wraps the text with the layout engine (cached advances and font
+        metrics); nothing is rasterized. Results are memoized per text,
+        language and canvas size.
+        
+        Args:
+            text: Overlay text
+            width: Canvas width in pixels
+            height: Canvas height in pixels
+            language: Language code (auto-detect if None)
+            padding: Padding around text, as passed to add_text_overlay
+            max_lines: Most lines allowed (uses settings default if None)
+            min_size: Smallest size to try (uses settings default if None)
+            max_size: Largest size to try (uses settings default if None)
+        
+        Returns:
+            Font size in pixels; min_size if even that does not fit
+        """
+        if language is None:
+            language = self.detect_language(text)
+        max_lines = max_lines or settings.text_max_lines
+        min_size = min_size or settings.min_text_size
+        max_size = max(max_size or settings.max_text_size, min_size)
+        key = (
+            text, language, width, height, padding, max_lines, min_size, max_size,
+            settings.text_box_height_ratio
+        )
+        cached = self._cached(self._fit_cache, key)
+        if cached is not None:
+            return cached
+        
+        def fits(size: int) -> bool:
+            overflow = self._layout_overflow(
+                text, language, size, width, height, padding, max_lines
+            )
+            return overflow is None
+        
+        if not fits(min_size):
+            app_logger.warning(
+                f"Text does not fit {width}x{height} at {min_size}px ({language}): '{text[:50]}'"
+            )
+            size = min_size
+        else:
+            low, high = min_size, max_size
+            while low < high:
+                mid = (low + high + 1) // 2
+                if fits(mid):
+                    low = mid
+                else:
+                    high = mid - 1
+            size = low
+        
+        self._remember(self._fit_cache, key, size, FIT_CACHE_SIZE)
+        return size
+    
+    def _cached(self, cache: OrderedDict, key: tuple):
+        """Look up a memoized value, marking it recently used (None on a miss)."""
+        with self._cache_lock:
+            value = cache.get(key)
+            if value is not None:
+                cache.move_to_end(key)
+            return value
+    
+    def _remember(self, cache: OrderedDict, key: tuple, value, max_entries: int):
+        """Memoize a value, dropping the least recently used beyond max_entries."""
+        with self._cache_lock:
+            cache[key] = value
+            cache.move_to_end(key)
+            while len(cache) > max_entries:
+                cache.popitem(last=False)
+    
+    def _layout_overflow(
+        self,
+        text: str,
+        language: str,
+        size: int,
+        width: int,
+        height: int,
+        padding: int,
+        max_lines: int
+    ) -> Optional[str]:
+        """Describe how text drawn at a size overflows its band, or None if it fits."""
+        max_width = width - (padding * 4)
+        font_runs = self.load_font_runs(text, language, size)
+        layout = self.layout_engine.layout_runs(font_runs, max_width)
+        band_height = height * settings.text_box_height_ratio
+        
+        if layout.width > max_width:
+            return f"a line is {layout.width:.0f}px wide, over {max_width}px"
+        if len(layout.lines) > max_lines:
+            return f"wraps to {len(layout.lines)} lines, over {max_lines}"
+        if layout.height + padding * 2 > band_height:
+            return f"text band is {layout.height + padding * 2}px tall, over {band_height:.0f}px"
+        return None
+    
+    def check_layout(
+        self,
+        text: str,
+        aspect_ratio: str,
+        language: Optional[str] = None,
+        base_size: int = 1024,
+        font_size: Optional[int] = None,
+        padding: int = 20
+    ) -> Optional[str]:
+        """
+        Check that an overlay would fit its band, without rendering it.
+        
+        Uses the same size add_text_overlay would (explicit, auto-fitted or
+        default) and only wraps the text with font metrics. Text fits when it
+        is drawn at MIN_TEXT_SIZE or larger, no line is wider than the canvas
+        allows, and it wraps to at most TEXT_MAX_LINES lines within
+        TEXT_BOX_HEIGHT_RATIO of the image height.
+        
+        Args:
+            text: Overlay text
+            aspect_ratio: Target aspect ratio
+            language: Language code (auto-detect if None)
+            base_size: Base dimension for sizing
+            font_size: Font size in pixels (auto-fitted or config default if None)
+            padding: Padding around text
+        
+        Returns:
+            Description of the problem, or None if the text fits
+        """
+        if language is None:
+            language = self.detect_language(text)
+        aspect_ratio = aspect_ratio.replace('x', ':')
+        width, height = settings.get_aspect_ratio_dimensions(aspect_ratio, base_size)
+        size = self.resolve_font_size(text, width, height, language, font_size, padding)
+        
+        if size < settings.min_text_size:
+            problem = f"font size {size}px is under MIN_TEXT_SIZE ({settings.min_text_size}px)"
+        else:
+            problem = self._layout_overflow(
+                text, language, size, width, height, padding, settings.text_max_lines
+            )
+        
+        if problem:
+            return f"Text does not fit {aspect_ratio} ({language}) at {size}px: {problem}"
+        return None
+    
+    def resolve_font_size(
+        self,
+        text: str,
+        width: int,
+        height: int,
+        language: str,
+        font_size: Optional[int] = None,
+        padding: int = 20
+    ) -> int:
+        """
+        Get the font size an overlay is drawn at.
+        
+        Args:
+            text: Overlay text
+            width: Canvas width in pixels
+            height: Canvas height in pixels
+            language: Language code
+            font_size: Explicit font size, used as is when given
+            padding: Padding around text
+        
+        Returns:
+            font_size if given, the auto-fitted size when TEXT_AUTO_FIT is
+            enabled, otherwise the configured default
+        """
+        if font_size is not None:
+            return font_size
+        if settings.text_auto_fit:
+            return self.fit_font_size(text, width, height, language, padding)
+        return settings.text_font_size
+    
+    @staticmethod
+    def resize_quality(quality: Optional[str] = None) -> str:
+        """
+        Validate a resize quality tier.
+        
+        Args:
+            quality: fast, balanced or best (uses settings default if None)
+        
+        Returns:
+            The tier name
+        
+        Raises:
+            ValueError: If the tier is unknown
+        """
+        quality = quality or settings.resize_quality
+        if quality not in RESIZE_QUALITY:
+            raise ValueError(
+                f"Unknown resize quality '{quality}' (expected one of {', '.join(RESIZE_QUALITY)})"
+            )
+        return quality
+    
+    @staticmethod
+    def decode_size(
+        source_size: Tuple[int, int],
+        aspect_ratios: list[str],
+        base_size: int = 1024
+    ) -> Tuple[int, int]:
+        """
+        Get the smallest size a source can be decoded at and still cover every target.
+        
+        Args:
+            source_size: Full (width, height) of the source
+            aspect_ratios: Aspect ratios the source will be resized to
+            base_size: Base dimension for sizing
+        
+        Returns:
+            (width, height) with the source's aspect ratio, at most source_size
+        """
+        width, height = source_size
+        scale = 0.0
+        for aspect_ratio in aspect_ratios:
+            target_width, target_height = settings.get_aspect_ratio_dimensions(
+                aspect_ratio.replace('x', ':'), base_size
+            )
+            scale = max(scale, target_width / width, target_height / height)
+        scale = min(scale, 1.0)
+        return math.ceil(width * scale), math.ceil(height * scale)
+    
+    @traced(category="cpu")
     def resize_to_aspect_ratio(
         self,
         image: Image.Image,
         aspect_ratio: str,
         base_size: int = 1024,
-        fill_color: Tuple[int, int, int] = (255, 255, 255)
+        fill_color: Tuple[int, int, int] = (255, 255, 255),
+        quality: Optional[str] = None
     ) -> Image.Image:
         """
         Resize image to specific aspect ratio.
         
+        Large sources are first shrunk with an integer reduce() (except in the
+        "best" tier), then resampled to the final size. Sources already at
+        the target size are only converted to RGB.
+        
         Args:
             image: Source PIL Image
             aspect_ratio: Target aspect ratio (e.g., "16:9", "16x9")
             base_size: Base dimension for sizing
             fill_color: Background fill color for letterboxing
+            quality: Resize quality tier (uses settings default if None)
             
         Returns:
             Resized PIL Image
+        
+        Raises:
+            ValueError: If the quality tier is unknown
         """
+        resample, reducing_gap = RESIZE_QUALITY[self.resize_quality(quality)]
+        
         # Normalize aspect ratio notation
         aspect_ratio = aspect_ratio.replace('x', ':')
         
@@ -330,6 +688,12 @@ class ImageProcessor:
             f"({target_width}x{target_height})"
         )
         
+        if image.size == (target_width, target_height):
+            app_logger.info(
+                f"✅ Already {aspect_ratio}: {target_width}x{target_height}, not resized"
+            )
+            return image.copy() if image.mode == 'RGB' else image.convert('RGB')
+        
         # Create new image with target size
         new_image = Image.new('RGB', (target_width, target_height), fill_color)
         
@@ -347,8 +711,8 @@ class ImageProcessor:
         new_width = int(image.width * scale)
         new_height = int(image.height * scale)
         
-        # Resize image
-        resized = image.resize((new_width, new_height), Image.Resampling.LANCZOS)
+        # Resize image (Pillow skips resampling when the size already matches)
+        resized = image.resize((new_width, new_height), resample, reducing_gap=reducing_gap)
         
         # Center the image
         x = (target_width - new_width) // 2
@@ -360,6 +724,58 @@ class ImageProcessor:
         
         return new_image
     
+    def render_signature(
+        self,
+        text: str,
+        aspect_ratio: str,
+        position: str = "bottom",
+        font_size: Optional[int] = None,
+        language: Optional[str] = None,
+        base_size: int = 1024,
+        resize_quality: Optional[str] = None,
+        source_size: Optional[Tuple[int, int]] = None
+    ) -> dict:
+        """
+        Describe every setting that affects a rendered asset.
+        
+        Used to build content-addressed cache keys; two renders with equal
+        signatures (and equal source images) produce identical pixels. A
+        JPEG source decoded at reduced scale renders differently from the
+        same file decoded in full, so the decoded size is part of the signature.
+        
+        Args:
+            text: Overlay text
+            aspect_ratio: Target aspect ratio
+            position: Text position (top, center, bottom)
+            font_size: Font size in pixels (auto-fitted or config default if None)
+            language: Language code (auto-detect if None)
+            base_size: Base dimension for sizing
+            resize_quality: Resize quality tier (uses settings default if None)
+            source_size: Size the source image was decoded at (None if unknown)
+            
+        Returns:
+            Dictionary of render settings
+        """
+        if language is None:
+            language = self.detect_language(text)
+        aspect_ratio = aspect_ratio.replace('x', ':')
+        width, height = settings.get_aspect_ratio_dimensions(aspect_ratio, base_size)
+        
+        return {
+            "renderer": RENDERER_VERSION,
+            "text": text,
+            "aspect_ratio": aspect_ratio,
+            "base_size": base_size,
+            "position": position,
+            "font_size": self.resolve_font_size(text, width, height, language, font_size),
+            "language": language,
+            "font_paths": [str(path) for _, path in self.font_paths_for(text, language)],
+            "shadow": settings.text_shadow_offset if settings.text_shadow_enabled else None,
+            "resize_quality": self.resize_quality(resize_quality),
+            "source_size": list(source_size) if source_size else None,
+        }
+    
+    @traced(category="cpu")
     def add_text_overlay(
         self,
         image: Image.Image,
@@ -369,7 +785,8 @@ class ImageProcessor:
         language: Optional[str] = None,
         text_color: Tuple[int, int, int] = (255, 255, 255),
         background_color: Optional[Tuple[int, int, int, int]] = (0, 0, 0, 180),
-        padding: int = 20
+        padding: int = 20,
+        in_place: bool = False
     ) -> Image.Image:
         """
         Add text overlay to image with multi-language support.
@@ -378,11 +795,12 @@ class ImageProcessor:
             image: Source PIL Image
             text: Text to overlay
             position: Position (top, center, bottom)
-            font_size: Font size in pixels (uses config default if None)
+            font_size: Font size in pixels (auto-fitted or config default if None)
             language: Language code (auto-detect if None)
             text_color: RGB color for text
             background_color: RGBA color for text background (None for no background)
             padding: Padding around text
+            in_place: Draw onto an RGB image itself instead of a copy
             
         Returns:
             Image with text overlay
@@ -391,126 +809,125 @@ class ImageProcessor:
             app_logger.warning("Empty text provided, skipping overlay")
             return image
         
-        # Use config font size if not specified
-        if font_size is None:
-            font_size = settings.text_font_size
-        
         # Detect language if not specified
         if language is None:
             language = self.detect_language(text)
             app_logger.info(f"Auto-detected language: {language}")
         
-        # Create a copy to avoid modifying original
-        img_copy = image.copy()
-        
-        # Convert to RGBA for transparency support
-        if img_copy.mode != 'RGBA':
-            img_copy = img_copy.convert('RGBA')
+        # Use the fitted or config font size if not specified
+        font_size = self.resolve_font_size(
+            text, image.width, image.height, language, font_size, padding
+        )
         
-        # Create overlay layer
-        overlay = Image.new('RGBA', img_copy.size, (255, 255, 255, 0))
-        draw = ImageDraw.Draw(overlay)
+        # Work on an RGB copy unless the caller hands the image over; only
+        # the text band's rows are blended, the rest is never converted
+        if image.mode != 'RGB':
+            result = image.convert('RGB')
+        else:
+            result = image if in_place else image.copy()
         
-        # Load appropriate font for language
+        # Load a font for each script run of the text
         try:
-            font = self.load_font(language, font_size)
-            app_logger.info(f"✅ Loaded font for language '{language}' at {font_size}px")
+            font_runs = self.load_font_runs(text, language, font_size)
+            app_logger.info(
+                f"✅ Loaded {len(font_runs)} font run(s) for language '{language}' "
+                f"at {font_size}px"
+            )
         except Exception as e:
             app_logger.error(f"Failed to load font: {e}")
             raise
         
-        # Calculate text size and position
-        # Wrap text if too long
-        max_width = img_copy.width - (padding * 4)
-        lines = self._wrap_text(text, font, draw, max_width)
-        
-        # Calculate total text height
-        line_heights = [draw.textbbox((0, 0), line, font=font)[3] for line in lines]
-        total_height = sum(line_heights) + (len(lines) - 1) * 10  # 10px spacing
+        # Wrap text to the canvas width (memoized per text, fonts and width)
+        max_width = result.width - (padding * 4)
+        layout = self.layout_engine.layout_runs(font_runs, max_width)
+        total_height = layout.height
         
         # Determine vertical position
         if position == "top":
             y = padding * 2
         elif position == "center":
-            y = (img_copy.height - total_height) // 2
+            y = (result.height - total_height) // 2
         else:  # bottom
-            y = img_copy.height - total_height - padding * 2
+            y = result.height - total_height - padding * 2
         
-        # Draw background rectangle if specified
-        if background_color:
-            bg_height = total_height + padding * 2
-            draw.rectangle(
-                [(0, y - padding), (img_copy.width, y + bg_height - padding)],
-                fill=background_color
+        # Render the text band once per message, width, fonts and style
+        shadow = settings.text_shadow_offset if settings.text_shadow_enabled else None
+        tile_key = (
+            tuple((run_text, font_key(font)) for run_text, font in font_runs), result.width,
+            text_color, background_color, padding, shadow
+        )
+        tile = self.tile_cache.get(tile_key)
+        if tile is None:
+            tile = self._render_text_band(
+                layout, result.width, text_color, background_color, padding, shadow
             )
+            self.tile_cache.put(tile_key, tile)
         
-        # Draw each line of text
-        for line in lines:
-            bbox = draw.textbbox((0, 0), line, font=font)
-            text_width = bbox[2] - bbox[0]
-            text_height = bbox[3] - bbox[1]
-            
-            x = (img_copy.width - text_width) // 2
-            
-            # Draw text with optional shadow
-            if settings.text_shadow_enabled:
-                shadow_offset = settings.text_shadow_offset
-                draw.text(
-                    (x + shadow_offset, y + shadow_offset),
-                    line,
-                    font=font,
-                    fill=(0, 0, 0, 200)
-                )
-            
-            # Draw main text
-            draw.text((x, y), line, font=font, fill=text_color + (255,))
-            
-            y += text_height + 10  # Move to next line
-        
-        # Composite overlay onto image
-        result = Image.alpha_composite(img_copy, overlay)
-        
-        # Convert back to RGB
-        result = result.convert('RGB')
+        # Blend the band in place, using its alpha as the mask
+        result.paste(tile, (0, y - padding), tile)
         
         app_logger.info(f"✅ Added text overlay ({language}): '{text[:50]}...'")
         
         return result
     
     @staticmethod
-    def _wrap_text(text: str, font, draw, max_width: int) -> list[str]:
+    def _render_text_band(
+        layout: TextLayout,
+        width: int,
+        text_color: Tuple[int, int, int],
+        background_color: Optional[Tuple[int, int, int, int]],
+        padding: int,
+        shadow: Optional[int]
+    ) -> Image.Image:
         """
-        Wrap text to fit within max width.
+        Rasterize wrapped text and its background strip into an RGBA tile.
+        
+        The tile starts `padding` pixels above the first line and is as wide
+        as the canvas, so it can be composited at (0, text_top - padding).
         
         Args:
-            text: Text to wrap
-            font: Font object
-            draw: ImageDraw object
-            max_width: Maximum width in pixels
+            layout: Wrapped text
+            width: Canvas width in pixels
+            text_color: RGB color for text
+            background_color: RGBA color for the strip (None for no background)
+            padding: Padding above and below the text
+            shadow: Shadow offset in pixels (None for no shadow)
             
         Returns:
-            List of text lines
+            RGBA tile of the text band
         """
-        words = text.split()
-        lines = []
-        current_line = []
+        height = layout.height + padding * 2 + 1 + (shadow or 0)
+        tile = Image.new('RGBA', (width, height), (255, 255, 255, 0))
+        draw = ImageDraw.Draw(tile)
         
-        for word in words:
-            test_line = ' '.join(current_line + [word])
-            bbox = draw.textbbox((0, 0), test_line, font=font)
-            width = bbox[2] - bbox[0]
-            
-            if width <= max_width:
-                current_line.append(word)
-            else:
-                if current_line:
-                    lines.append(' '.join(current_line))
-                current_line = [word]
+        if background_color:
+            draw.rectangle(
+                [(0, 0), (width, layout.height + padding * 2)],
+                fill=background_color
+            )
         
-        if current_line:
-            lines.append(' '.join(current_line))
+        y = padding
+        for pieces, text_width in zip(layout.pieces, layout.widths):
+            x = int((width - text_width) // 2)
+            
+            for piece in pieces:
+                position = (x + piece.x, y + piece.y)
+                
+                # Draw text with optional shadow
+                if shadow is not None:
+                    draw.text(
+                        (position[0] + shadow, position[1] + shadow),
+                        piece.text,
+                        font=piece.font,
+                        fill=(0, 0, 0, 200)
+                    )
+                
+                # Draw main text
+                draw.text(position, piece.text, font=piece.font, fill=text_color + (255,))
+            
+            y += layout.line_height + layout.spacing  # Move to next line
         
-        return lines if lines else [text]
+        return tile
     
     @staticmethod
     def ensure_rgb(image: Image.Image) -> Image.Image:
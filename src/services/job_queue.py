@@ -0,0 +1,565 @@
+"""
+Job Queue Service
+Durable SQLite queue of per-asset jobs shared by any number of workers.
+
+Briefs are expanded into one job per product/aspect ratio/language. Workers
+(see queue_worker.py) lease a job, keep the lease alive with heartbeats while
+rendering, and either complete it or fail it; failed jobs are retried with
+exponential backoff until they run out of attempts. Leases of crashed workers
+expire and the job is handed to another worker.
+
+Runs carry a priority and an optional deadline. Every lease picks the most
+urgent run: higher priority first, then earliest deadline among runs that can
+still meet it (judged by the stage cost model), then runs already past
+saving, then runs without a deadline in arrival order. Because a job is a
+single asset, an urgent brief overtakes a large batch within one asset.
+
+The database uses WAL journaling by default. All hosts must see the database
+through a filesystem with working POSIX locks; on network filesystems without
+shared-memory support set JOB_QUEUE_JOURNAL_MODE=delete.
+"""
+
+import math
+import random
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Optional
+from src.config import settings
+from src.models.job import Job, QueuedRun
+from src.services.brief_parser import BriefParser
+from src.services.cost_model import CostModel
+from src.services.image_processor import ImageProcessor
+from src.services.output_manager import OutputManager
+from src.services.run_manifest import RunManifest
+from src.utils.logger import app_logger
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id TEXT PRIMARY KEY,
+    pipeline TEXT NOT NULL,
+    guidelines TEXT,
+    status TEXT NOT NULL DEFAULT 'active',
+    priority INTEGER NOT NULL DEFAULT 0,
+    deadline REAL,
+    created_at REAL NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    run_id TEXT NOT NULL REFERENCES runs(run_id),
+    product_id TEXT NOT NULL,
+    aspect_ratio TEXT NOT NULL,
+    language TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'queued',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL,
+    lease_owner TEXT,
+    lease_expires REAL,
+    available_at REAL NOT NULL DEFAULT 0,
+    last_error TEXT,
+    result_path TEXT,
+    updated_at REAL NOT NULL,
+    UNIQUE (run_id, product_id, aspect_ratio, language)
+);
+
+CREATE INDEX IF NOT EXISTS jobs_by_status ON jobs (status, available_at);
+CREATE INDEX IF NOT EXISTS jobs_by_run ON jobs (run_id, status);
+
+CREATE TABLE IF NOT EXISTS locks (
+    name TEXT PRIMARY KEY,
+    owner TEXT NOT NULL,
+    expires REAL NOT NULL
+);
+"""
+
+# Columns added to the runs table after its first release
+RUN_MIGRATIONS = {
+    "priority": "INTEGER NOT NULL DEFAULT 0",
+    "deadline": "REAL",
+}
+
+MAX_RETRY_DELAY_SECONDS = 300.0
+
+
+class JobQueue:
+    """Persistent queue of asset jobs."""
+
+    def __init__(
+        self,
+        db_path: Optional[Path] = None,
+        lease_seconds: Optional[float] = None,
+        max_attempts: Optional[int] = None,
+        retry_base_seconds: Optional[float] = None,
+        cost_model: Optional[CostModel] = None,
+    ):
+        """
+        Initialize JobQueue, creating the database if needed.
+
+        Args:
+            db_path: SQLite database file (defaults to config)
+            lease_seconds: How long a lease lasts without heartbeats
+            max_attempts: Leases before a job fails for good
+            retry_base_seconds: Delay before the first retry (doubles per attempt)
+            cost_model: Stage cost estimates used to judge deadlines
+        """
+        self.db_path = Path(db_path or settings.job_queue_path)
+        self.lease_seconds = lease_seconds or settings.job_lease_seconds
+        self.max_attempts = max_attempts or settings.job_max_attempts
+        self.retry_base_seconds = (
+            retry_base_seconds
+            if retry_base_seconds is not None
+            else settings.job_retry_base_seconds
+        )
+        self.cost_model = cost_model or CostModel()
+        self._local = threading.local()
+
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        conn = self._connection()
+        conn.executescript(SCHEMA)
+        self._migrate(conn)
+
+    @staticmethod
+    def _migrate(conn: sqlite3.Connection):
+        """Add columns missing from queues created by older versions."""
+        columns = {row["name"] for row in conn.execute("PRAGMA table_info(runs)")}
+        for name, definition in RUN_MIGRATIONS.items():
+            if name not in columns:
+                conn.execute(f"ALTER TABLE runs ADD COLUMN {name} {definition}")
+
+    def _connection(self) -> sqlite3.Connection:
+        """Get this thread's connection to the database."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30.0, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute(f"PRAGMA journal_mode={settings.job_queue_journal_mode}")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA busy_timeout=30000")
+            self._local.conn = conn
+        return conn
+
+    @contextmanager
+    def _transaction(self):
+        """Run a block in a write transaction, taking the lock up front."""
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    def close(self):
+        """Close this thread's connection."""
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    def enqueue_brief(
+        self,
+        brief_path: Path,
+        guidelines: Optional[Path] = None,
+        enable_compliance: bool = True,
+        priority: int = 0,
+        deadline: Optional[float] = None,
+        resize_quality: Optional[str] = None,
+    ) -> QueuedRun:
+        """
+        Create a run for a brief and queue one job per asset.
+
+        The campaign directory and run manifest are created right away so
+        workers write into the usual output layout.
+
+        Args:
+            brief_path: Campaign brief file
+            guidelines: Brand guidelines JSON; selects the enhanced pipeline
+            enable_compliance: Whether the enhanced pipeline checks compliance
+            priority: Higher priorities are leased first
+            deadline: Unix time the run should be finished by (optional)
+            resize_quality: Resize quality tier (uses settings default if None)
+
+        Returns:
+            The queued run
+        """
+        brief_path = Path(brief_path)
+        resize_quality = ImageProcessor.resize_quality(resize_quality)
+        brief = BriefParser().parse_file(brief_path)
+        campaign_dir = OutputManager().create_campaign_directory(brief.campaign_id)
+
+        pipeline = "enhanced" if guidelines else "standard"
+        details = {"resize_quality": resize_quality}
+        if guidelines:
+            details.update(enable_compliance=enable_compliance, guidelines=str(guidelines))
+        RunManifest.create(campaign_dir, brief_path, pipeline=pipeline, **details)
+
+        now = time.time()
+        run = QueuedRun(
+            run_id=campaign_dir.name,
+            pipeline=pipeline,
+            guidelines=str(guidelines) if guidelines else None,
+            priority=priority,
+            deadline=deadline,
+            created_at=now,
+        )
+
+        with self._transaction() as conn:
+            conn.execute(
+                "INSERT INTO runs (run_id, pipeline, guidelines, status, priority, deadline, "
+                "created_at) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    run.run_id,
+                    run.pipeline,
+                    run.guidelines,
+                    run.status,
+                    run.priority,
+                    run.deadline,
+                    run.created_at,
+                ),
+            )
+            conn.executemany(
+                "INSERT INTO jobs (run_id, product_id, aspect_ratio, language, "
+                "max_attempts, available_at, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (
+                        run.run_id,
+                        product.product_id,
+                        aspect_ratio,
+                        brief.language,
+                        self.max_attempts,
+                        now,
+                        now,
+                    )
+                    for product in brief.products
+                    for aspect_ratio in brief.aspect_ratios
+                ],
+            )
+
+        app_logger.info(
+            f"📥 Queued {len(brief.products) * len(brief.aspect_ratios)} jobs for {run.run_id}"
+        )
+        return run
+
+    def lease(self, worker_id: str) -> Optional[Job]:
+        """
+        Lease the next available job of the most urgent run.
+
+        Jobs whose lease expired are leased again; if they are out of
+        attempts they are failed instead (see idle_runs for finishing
+        their runs).
+
+        Args:
+            worker_id: Identifier of the leasing worker
+
+        Returns:
+            The leased job, or None if nothing is available
+        """
+        now = time.time()
+        with self._transaction() as conn:
+            conn.execute(
+                "UPDATE jobs SET status = 'failed', updated_at = ?, "
+                "last_error = COALESCE(last_error, 'Lease expired (worker lost)') "
+                "WHERE status = 'leased' AND lease_expires < ? AND attempts >= max_attempts",
+                (now, now),
+            )
+            row = None
+            for run in self._schedule(conn, now):
+                row = conn.execute(
+                    "SELECT id FROM jobs WHERE run_id = ? AND ("
+                    "   (status = 'queued' AND available_at <= ?) "
+                    "   OR (status = 'leased' AND lease_expires < ?)) "
+                    "ORDER BY available_at, id LIMIT 1",
+                    (run["run_id"], now, now),
+                ).fetchone()
+                if row is not None:
+                    break
+            if row is None:
+                return None
+
+            conn.execute(
+                "UPDATE jobs SET status = 'leased', lease_owner = ?, lease_expires = ?, "
+                "attempts = attempts + 1, updated_at = ? WHERE id = ?",
+                (worker_id, now + self.lease_seconds, now, row["id"]),
+            )
+            job = conn.execute("SELECT * FROM jobs WHERE id = ?", (row["id"],)).fetchone()
+
+        return self._job(job)
+
+    def heartbeat(self, job_id: int, worker_id: str) -> bool:
+        """
+        Extend a lease.
+
+        Args:
+            job_id: Leased job
+            worker_id: Worker holding the lease
+
+        Returns:
+            False if the lease was lost (expired and taken by another worker)
+        """
+        now = time.time()
+        with self._transaction() as conn:
+            cursor = conn.execute(
+                "UPDATE jobs SET lease_expires = ?, updated_at = ? "
+                "WHERE id = ? AND status = 'leased' AND lease_owner = ?",
+                (now + self.lease_seconds, now, job_id, worker_id),
+            )
+        return cursor.rowcount == 1
+
+    def complete(self, job_id: int, worker_id: str, result_path: Optional[str] = None) -> bool:
+        """
+        Mark a leased job as done.
+
+        Args:
+            job_id: Leased job
+            worker_id: Worker holding the lease
+            result_path: Path of the produced asset
+
+        Returns:
+            False if the lease was lost before completion
+        """
+        with self._transaction() as conn:
+            cursor = conn.execute(
+                "UPDATE jobs SET status = 'done', result_path = ?, lease_owner = NULL, "
+                "lease_expires = NULL, last_error = NULL, updated_at = ? "
+                "WHERE id = ? AND status = 'leased' AND lease_owner = ?",
+                (result_path, time.time(), job_id, worker_id),
+            )
+        return cursor.rowcount == 1
+
+    def fail(
+        self, job_id: int, worker_id: str, error: str, transient: bool = True
+    ) -> Optional[str]:
+        """
+        Record a failed attempt, scheduling a retry if attempts remain.
+
+        Args:
+            job_id: Leased job
+            worker_id: Worker holding the lease
+            error: Error message
+            transient: Whether retrying may help; permanent failures fail right away
+
+        Returns:
+            New job status ('queued' or 'failed'), or None if the lease was lost
+        """
+        now = time.time()
+        with self._transaction() as conn:
+            row = conn.execute(
+                "SELECT attempts, max_attempts FROM jobs "
+                "WHERE id = ? AND status = 'leased' AND lease_owner = ?",
+                (job_id, worker_id),
+            ).fetchone()
+            if row is None:
+                return None
+
+            if not transient or row["attempts"] >= row["max_attempts"]:
+                status, available_at = "failed", now
+            else:
+                status, available_at = "queued", now + self.retry_delay(row["attempts"])
+
+            conn.execute(
+                "UPDATE jobs SET status = ?, available_at = ?, last_error = ?, "
+                "lease_owner = NULL, lease_expires = NULL, updated_at = ? WHERE id = ?",
+                (status, available_at, error, now, job_id),
+            )
+        return status
+
+    def acquire_lock(self, name: str, owner: str) -> bool:
+        """
+        Take a named lock shared by all workers of the queue.
+
+        Locks last lease_seconds unless refreshed, so a crashed holder does
+        not block others for long. Taking a lock already held by the same
+        owner refreshes it.
+
+        Args:
+            name: Lock name
+            owner: Worker taking the lock
+
+        Returns:
+            True if the owner now holds the lock
+        """
+        now = time.time()
+        with self._transaction() as conn:
+            conn.execute("DELETE FROM locks WHERE name = ? AND expires < ?", (name, now))
+            conn.execute(
+                "INSERT INTO locks (name, owner, expires) VALUES (?, ?, ?) "
+                "ON CONFLICT (name) DO UPDATE SET expires = excluded.expires "
+                "WHERE locks.owner = excluded.owner",
+                (name, owner, now + self.lease_seconds),
+            )
+            row = conn.execute("SELECT owner FROM locks WHERE name = ?", (name,)).fetchone()
+        return row is not None and row["owner"] == owner
+
+    def release_lock(self, name: str, owner: str):
+        """Release a named lock if the owner still holds it."""
+        with self._transaction() as conn:
+            conn.execute("DELETE FROM locks WHERE name = ? AND owner = ?", (name, owner))
+
+    def schedule(self) -> list[dict]:
+        """
+        List active runs from most to least urgent.
+
+        Returns:
+            Dictionaries with run_id, priority, deadline, remaining jobs,
+            estimated finish time and whether the deadline is feasible
+        """
+        return self._schedule(self._connection(), time.time())
+
+    def _schedule(self, conn: sqlite3.Connection, now: float) -> list[dict]:
+        """Rank active runs with pending jobs by urgency."""
+        self.cost_model.refresh()
+        cell_seconds = self.cost_model.cell_seconds()
+        workers = conn.execute(
+            "SELECT COUNT(DISTINCT lease_owner) FROM jobs "
+            "WHERE status = 'leased' AND lease_expires >= ?",
+            (now,),
+        ).fetchone()[0]
+        workers = max(1, workers)
+
+        runs = []
+        for row in conn.execute(
+            "SELECT r.run_id, r.priority, r.deadline, r.created_at, COUNT(j.id) AS remaining "
+            "FROM runs r JOIN jobs j ON j.run_id = r.run_id "
+            "WHERE r.status = 'active' AND j.status IN ('queued', 'leased') "
+            "GROUP BY r.run_id"
+        ):
+            estimated_finish = now + row["remaining"] * cell_seconds / workers
+            deadline = row["deadline"]
+            runs.append(
+                {
+                    "run_id": row["run_id"],
+                    "priority": row["priority"],
+                    "deadline": deadline,
+                    "remaining": row["remaining"],
+                    "estimated_finish": estimated_finish,
+                    "feasible": deadline is None or estimated_finish <= deadline,
+                    "created_at": row["created_at"],
+                }
+            )
+
+        def urgency(run: dict) -> tuple:
+            if run["deadline"] is None:
+                tier, deadline = 2, math.inf
+            else:
+                tier, deadline = (0 if run["feasible"] else 1), run["deadline"]
+            return (-run["priority"], tier, deadline, run["created_at"])
+
+        return sorted(runs, key=urgency)
+
+    def retry_delay(self, attempts: int) -> float:
+        """
+        Get the backoff before retrying a job.
+
+        Args:
+            attempts: Attempts made so far
+
+        Returns:
+            Delay in seconds (exponential with jitter, capped)
+        """
+        delay = self.retry_base_seconds * (2 ** max(0, attempts - 1))
+        return min(MAX_RETRY_DELAY_SECONDS, delay) * random.uniform(1.0, 1.1)
+
+    def claim_finalization(self, run_id: str) -> bool:
+        """
+        Claim the right to finish a run once none of its jobs are pending.
+
+        Exactly one caller wins per run.
+
+        Args:
+            run_id: Run to finish
+
+        Returns:
+            True if the caller should write the run's metadata
+        """
+        with self._transaction() as conn:
+            pending = conn.execute(
+                "SELECT COUNT(*) FROM jobs WHERE run_id = ? AND status IN ('queued', 'leased')",
+                (run_id,),
+            ).fetchone()[0]
+            if pending:
+                return False
+            cursor = conn.execute(
+                "UPDATE runs SET status = 'finished' WHERE run_id = ? AND status = 'active'",
+                (run_id,),
+            )
+        return cursor.rowcount == 1
+
+    def idle_runs(self) -> list[QueuedRun]:
+        """
+        List active runs none of whose jobs are queued or leased.
+
+        These runs are ready to finish, including runs whose last job was
+        failed by lease() after its worker died on the final attempt.
+
+        Returns:
+            Runs awaiting finalization
+        """
+        rows = (
+            self._connection()
+            .execute(
+                "SELECT * FROM runs r WHERE r.status = 'active' AND NOT EXISTS ("
+                "   SELECT 1 FROM jobs j"
+                "   WHERE j.run_id = r.run_id AND j.status IN ('queued', 'leased'))"
+            )
+            .fetchall()
+        )
+        return [QueuedRun(**dict(row)) for row in rows]
+
+    def get_run(self, run_id: str) -> Optional[QueuedRun]:
+        """Get a queued run."""
+        row = (
+            self._connection().execute("SELECT * FROM runs WHERE run_id = ?", (run_id,)).fetchone()
+        )
+        return QueuedRun(**dict(row)) if row else None
+
+    def get_job(self, job_id: int) -> Optional[Job]:
+        """Get a job."""
+        row = self._connection().execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return self._job(row) if row else None
+
+    def run_errors(self, run_id: str) -> list[str]:
+        """Get the errors of a run's failed jobs."""
+        rows = (
+            self._connection()
+            .execute(
+                "SELECT product_id, aspect_ratio, last_error FROM jobs "
+                "WHERE run_id = ? AND status = 'failed' ORDER BY id",
+                (run_id,),
+            )
+            .fetchall()
+        )
+        return [
+            f"Job {row['product_id']} {row['aspect_ratio']} failed: {row['last_error']}"
+            for row in rows
+        ]
+
+    def stats(self, run_id: Optional[str] = None) -> dict[str, int]:
+        """
+        Count jobs by status.
+
+        Args:
+            run_id: Limit counts to one run (optional)
+
+        Returns:
+            Dictionary of status to job count
+        """
+        query = "SELECT status, COUNT(*) AS count FROM jobs"
+        params: tuple = ()
+        if run_id:
+            query += " WHERE run_id = ?"
+            params = (run_id,)
+        rows = self._connection().execute(query + " GROUP BY status", params).fetchall()
+
+        counts = {"queued": 0, "leased": 0, "done": 0, "failed": 0}
+        counts.update({row["status"]: row["count"] for row in rows})
+        return counts
+
+    @staticmethod
+    def _job(row: sqlite3.Row) -> Job:
+        data = dict(row)
+        data.pop("updated_at", None)
+        return Job(**data)
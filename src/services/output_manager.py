@@ -3,12 +3,17 @@ Output Manager Service
 Manages organization and storage of generated campaign assets.
 """
 
+import io
+import os
+import shutil
+import tempfile
 from pathlib import Path
 from datetime import datetime
-from typing import Optional
+from typing import Optional, Union
 from PIL import Image
 from src.config import settings
 from src.utils.logger import app_logger
+from src.utils.tracing import traced
 from src.models.campaign import CampaignOutput
 
 
@@ -36,6 +41,9 @@ class OutputManager:
         """
         Create directory structure for a campaign.
         
+        Each call gets a new directory: runs of the same campaign that start
+        in the same second get a numeric suffix (_2, _3, ...).
+        
         Args:
             campaign_id: Campaign identifier
             timestamp: Optional timestamp (defaults to now)
@@ -48,9 +56,18 @@ class OutputManager:
         
         # Create directory name: campaign_YYYYMMDD_HHMMSS
         dir_name = f"{campaign_id}_{timestamp.strftime('%Y%m%d_%H%M%S')}"
-        campaign_dir = self.base_output_dir / dir_name
+        self.base_output_dir.mkdir(parents=True, exist_ok=True)
         
-        campaign_dir.mkdir(parents=True, exist_ok=True)
+        # Claim the name atomically; another run may create it concurrently
+        attempt = 1
+        while True:
+            name = dir_name if attempt == 1 else f"{dir_name}_{attempt}"
+            campaign_dir = self.base_output_dir / name
+            try:
+                campaign_dir.mkdir()
+                break
+            except FileExistsError:
+                attempt += 1
         
         app_logger.info(f"📁 Created campaign directory: {campaign_dir.name}")
         
@@ -81,9 +98,64 @@ class OutputManager:
         
         return product_dir
     
+    def get_asset_path(
+        self,
+        campaign_dir: Path,
+        product_name: str,
+        aspect_ratio: str,
+        format: str = "PNG"
+    ) -> Path:
+        """
+        Get the destination path of an asset, creating its product directory.
+        
+        Args:
+            campaign_dir: Campaign directory
+            product_name: Product name
+            aspect_ratio: Aspect ratio (e.g., "16:9")
+            format: Image format (PNG, JPEG)
+            
+        Returns:
+            Path the asset is saved to
+        """
+        product_dir = self.create_product_directory(campaign_dir, product_name)
+        
+        # Create filename: aspectratio.ext
+        ratio_str = aspect_ratio.replace(":", "x")
+        return product_dir / f"{ratio_str}.{format.lower()}"
+    
+    @staticmethod
+    def encoder_settings(format: str = "PNG") -> dict:
+        """
+        Get the encoder settings used for saved assets.
+        
+        Args:
+            format: Image format (PNG, JPEG)
+            
+        Returns:
+            Dictionary of settings that affect the encoded bytes
+        """
+        return {"format": format.upper(), "optimize": True}
+    
+    @traced(category="cpu")
+    def encode_asset(self, image: Image.Image, format: str = "PNG") -> bytes:
+        """
+        Encode an asset in memory, without touching the disk.
+        
+        Args:
+            image: PIL Image to encode
+            format: Image format (PNG, JPEG)
+            
+        Returns:
+            Encoded file contents
+        """
+        buffer = io.BytesIO()
+        image.save(buffer, **self.encoder_settings(format))
+        return buffer.getvalue()
+    
+    @traced(category="disk")
     def save_asset(
         self,
-        image: Image.Image,
+        image: Union[Image.Image, bytes],
         campaign_dir: Path,
         product_name: str,
         aspect_ratio: str,
@@ -93,7 +165,7 @@ class OutputManager:
         Save a generated asset.
         
         Args:
-            image: PIL Image to save
+            image: PIL Image to save, or bytes from encode_asset
             campaign_dir: Campaign directory
             product_name: Product name
             aspect_ratio: Aspect ratio (e.g., "16:9")
@@ -103,20 +175,27 @@ class OutputManager:
             Path to saved file if successful, None otherwise
         """
         try:
-            # Create product directory
-            product_dir = self.create_product_directory(campaign_dir, product_name)
+            filepath = self.get_asset_path(campaign_dir, product_name, aspect_ratio, format)
             
-            # Create filename: aspectratio.ext
-            ratio_str = aspect_ratio.replace(":", "x")
-            filename = f"{ratio_str}.{format.lower()}"
-            filepath = product_dir / filename
-            
-            # Save image
-            image.save(filepath, format=format, optimize=True)
+            # Write to a temporary file and rename so the asset is replaced
+            # atomically (and hardlinked copies elsewhere are never modified)
+            fd, tmp_name = tempfile.mkstemp(
+                dir=filepath.parent, prefix=f".{filepath.name}.", suffix=".tmp"
+            )
+            try:
+                if isinstance(image, bytes):
+                    with os.fdopen(fd, 'wb') as f:
+                        f.write(image)
+                else:
+                    os.close(fd)
+                    image.save(tmp_name, **self.encoder_settings(format))
+                os.replace(tmp_name, filepath)
+            finally:
+                Path(tmp_name).unlink(missing_ok=True)
             
             file_size = filepath.stat().st_size
             app_logger.info(
-                f" Saved asset: {product_name}/{filename} ({file_size:,} bytes)"
+                f" Saved asset: {product_name}/{filepath.name} ({file_size:,} bytes)"
             )
             
             return filepath
@@ -125,6 +204,56 @@ class OutputManager:
             app_logger.error(f"Failed to save asset for {product_name}: {e}")
             return None
     
+    @traced(category="disk")
+    def link_asset(
+        self,
+        source: Path,
+        campaign_dir: Path,
+        product_name: str,
+        aspect_ratio: str,
+        format: str = "PNG"
+    ) -> Optional[Path]:
+        """
+        Place an already rendered asset into a campaign directory.
+        
+        The file is hardlinked when possible and copied otherwise.
+        
+        Args:
+            source: Previously rendered asset file
+            campaign_dir: Campaign directory
+            product_name: Product name
+            aspect_ratio: Aspect ratio (e.g., "16:9")
+            format: Image format (PNG, JPEG)
+            
+        Returns:
+            Path to the linked file if successful, None otherwise
+        """
+        try:
+            filepath = self.get_asset_path(campaign_dir, product_name, aspect_ratio, format)
+            fd, tmp_name = tempfile.mkstemp(
+                dir=filepath.parent, prefix=f".{filepath.name}.", suffix=".tmp"
+            )
+            os.close(fd)
+            tmp_path = Path(tmp_name)
+            
+            try:
+                tmp_path.unlink()
+                try:
+                    os.link(source, tmp_path)
+                except OSError:
+                    shutil.copy2(source, tmp_path)
+                os.replace(tmp_path, filepath)
+            finally:
+                tmp_path.unlink(missing_ok=True)
+            
+            app_logger.info(f" Reused asset: {product_name}/{filepath.name}")
+            return filepath
+            
+        except Exception as e:
+            app_logger.error(f"Failed to reuse asset for {product_name}: {e}")
+            return None
+    
+    @traced(category="disk")
     def save_metadata(
         self,
         campaign_dir: Path,
@@ -153,11 +282,20 @@ class OutputManager:
                 "output_directory": str(output.output_directory),
                 "assets_count": output.success_count(),
                 "generated_assets": output.generated_assets,
-                "errors": output.errors
+                "errors": output.errors,
+                "peak_rss_mb": output.peak_rss_mb
             }
             
-            with open(metadata_file, 'w', encoding='utf-8') as f:
-                json.dump(metadata, f, indent=2, ensure_ascii=False)
+            # Write to a temporary file and rename so readers never see partial metadata
+            fd, tmp_name = tempfile.mkstemp(
+                dir=campaign_dir, prefix=f".{metadata_file.name}.", suffix=".tmp"
+            )
+            try:
+                with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                    json.dump(metadata, f, indent=2, ensure_ascii=False)
+                os.replace(tmp_name, metadata_file)
+            finally:
+                Path(tmp_name).unlink(missing_ok=True)
             
             app_logger.info(f" Saved metadata: {metadata_file.name}")
             return True
@@ -0,0 +1,121 @@
+"""
+Overlay Cache Service
+Keeps pre-rendered text bands so a campaign message is rasterized once.
+
+A text band (background strip plus wrapped, shadowed text) depends only on
+the message, canvas width, font, size and style, not on the product image
+underneath. ImageProcessor renders each band once into an RGBA tile stored
+here. Every product sharing the ratio and language composites the same tile.
+Tiles are evicted least recently used first once their pixel data exceeds
+the byte budget.
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Optional
+from PIL import Image
+from src.config import settings
+from src.utils.logger import app_logger
+
+
+def tile_bytes(tile: Image.Image) -> int:
+    """Approximate memory held by a tile's pixel data."""
+    return tile.width * tile.height * len(tile.getbands())
+
+
+class OverlayTileCache:
+    """Thread-safe LRU of RGBA text-band tiles, bounded by bytes."""
+
+    def __init__(self, max_bytes: Optional[int] = None):
+        """
+        Initialize OverlayTileCache.
+
+        Args:
+            max_bytes: Pixel data kept before tiles are evicted (defaults to config)
+        """
+        if max_bytes is None:
+            max_bytes = settings.overlay_tile_cache_mb * 1024 * 1024
+        self.max_bytes = max_bytes
+        self._tiles: OrderedDict[tuple, Image.Image] = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._counts = {"hits": 0, "misses": 0, "evictions": 0}
+
+    def get(self, key: tuple) -> Optional[Image.Image]:
+        """
+        Look up a tile, marking it recently used.
+
+        Args:
+            key: Tile key
+
+        Returns:
+            The cached tile, or None on a miss
+        """
+        with self._lock:
+            tile = self._tiles.get(key)
+            if tile is None:
+                self._counts["misses"] += 1
+                return None
+            self._tiles.move_to_end(key)
+            self._counts["hits"] += 1
+            return tile
+
+    def put(self, key: tuple, tile: Image.Image):
+        """
+        Store a tile, evicting the least recently used ones to stay in budget.
+
+        Tiles larger than the whole budget are not stored.
+
+        Args:
+            key: Tile key
+            tile: Rendered RGBA tile; callers must not modify it afterwards
+        """
+        size = tile_bytes(tile)
+        if size > self.max_bytes:
+            app_logger.debug(f"Text band of {size} bytes exceeds the tile cache budget; not cached")
+            return
+
+        with self._lock:
+            previous = self._tiles.pop(key, None)
+            if previous is not None:
+                self._bytes -= tile_bytes(previous)
+            self._tiles[key] = tile
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                _, evicted = self._tiles.popitem(last=False)
+                self._bytes -= tile_bytes(evicted)
+                self._counts["evictions"] += 1
+
+    def clear(self):
+        """Drop all tiles."""
+        with self._lock:
+            self._tiles.clear()
+            self._bytes = 0
+
+    def metrics(self) -> dict:
+        """
+        Get cache occupancy and hit counts.
+
+        Returns:
+            Dictionary with tile count, bytes held, budget, hits, misses and evictions
+        """
+        with self._lock:
+            return {
+                "tiles": len(self._tiles),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                **self._counts,
+            }
+
+
+_cache: Optional[OverlayTileCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_tile_cache() -> OverlayTileCache:
+    """Get the tile cache shared by all image processors of this process."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = OverlayTileCache()
+        return _cache
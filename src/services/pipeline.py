@@ -1,25 +1,126 @@
 """
 Campaign Pipeline Orchestrator
 Main pipeline that coordinates all services to generate campaign assets.
+
+The work of a run is expressed as a stage graph (see stage_graph.py):
+
+    source (per product)       translate (per language)
+             \\                   /
+              lookup (per asset)
+                    |
+          resize -> overlay -> encode
+                                  \\
+                                   save (per asset)
+
+Subclasses add or replace stages to build other pipeline variants.
 """
 
+import functools
+from contextlib import contextmanager
 from pathlib import Path
 from datetime import datetime
-from typing import Optional
+from typing import NamedTuple, Optional
+from PIL import Image
 from src.models.campaign import CampaignBrief, CampaignOutput
+from src.models.plan import CampaignPlan
+from src.services.admission import get_controller
 from src.services.brief_parser import BriefParser
-from src.services.asset_manager import AssetManager
+from src.services.asset_manager import AssetManager, DecodeSize
 from src.services.image_generator import ImageGenerator
 from src.services.image_processor import ImageProcessor
 from src.services.translator import TranslationService
 from src.services.output_manager import OutputManager
+from src.services.build_cache import BuildCache
+from src.services.cost_model import CostModel
+from src.services.planner import CampaignPlanner
+from src.services.retry import CellFailure, TransientError, backoff_delay, is_transient
+from src.services.run_manifest import RunManifest
+from src.services.progress import EventCallback, EventStream, ProgressTracker
+from src.services.stage_graph import (
+    SKIP, ResourceClass, Stage, StageGraph, TaskContext, default_limits
+)
+from src.utils.cancellation import CancellationToken, RunCancelled
 from src.utils.logger import app_logger
+from src.utils import tracing
+from src.utils.tracing import TRACE_FILENAME, Tracer
+from src.utils.memory import RssSampler
 from src.config import settings
 
 
+class AssetLookup(NamedTuple):
+    """Build cache lookup of one asset."""
+    
+    key: Optional[str]
+    cached: Optional[Path]
+    source_digest: Optional[str]
+
+
+class RunState:
+    """Everything the stages of one run share."""
+    
+    def __init__(
+        self,
+        brief: CampaignBrief,
+        campaign_dir: Path,
+        output: CampaignOutput,
+        manifest: RunManifest,
+        tracker: ProgressTracker,
+        enable_compliance: bool = False,
+        token: Optional[CancellationToken] = None,
+        resize_quality: str = "balanced"
+    ):
+        """
+        Initialize RunState.
+        
+        Args:
+            brief: Parsed campaign brief
+            campaign_dir: Campaign directory
+            output: Output record receiving assets and errors
+            manifest: Run manifest recording each completed asset
+            tracker: Progress tracker receiving stage and asset events
+            enable_compliance: Whether compliance checks run
+            token: Cancellation token of the run
+            resize_quality: Resize quality tier of the run
+        """
+        self.brief = brief
+        self.campaign_dir = campaign_dir
+        self.output = output
+        self.manifest = manifest
+        self.tracker = tracker
+        self.enable_compliance = enable_compliance
+        self.token = token or CancellationToken()
+        self.resize_quality = resize_quality
+        self.products = {product.product_id: product for product in brief.products}
+        self.compliance_results = []
+        self.peak_rss_bytes = 0
+        self.cells: list[dict] = []
+        self.failures: list[CellFailure] = []
+        # Products whose generation was already offered for deferral
+        self.sourced: set[str] = set()
+    
+    def cells_in(self, scope: dict) -> list[dict]:
+        """Get the cells being executed that fall within a task scope."""
+        return [
+            cell for cell in self.cells
+            if all(cell.get(key) == value for key, value in scope.items())
+        ]
+    
+    def cell(self, ctx: TaskContext) -> dict:
+        """Get the product and language fields of a task for progress events."""
+        fields = {"language": ctx.scope.get("language", self.brief.language)}
+        product_id = ctx.scope.get("product_id")
+        if product_id:
+            fields["product_id"] = product_id
+            fields["product_name"] = self.products[product_id].product_name
+        return fields
+
+
 class CampaignPipeline:
     """Main pipeline for campaign asset generation."""
     
+    PIPELINE_NAME = "standard"
+    GENERATED_SUFFIX = "_generated"
+    
     def __init__(self, api_key: Optional[str] = None):
         """
         Initialize pipeline with all services.
@@ -33,141 +134,926 @@ class CampaignPipeline:
         self.image_processor = ImageProcessor()
         self.translator = TranslationService(api_key=api_key)
         self.output_manager = OutputManager()
+        self.build_cache = BuildCache() if settings.incremental_builds else None
+        self.cost_model = CostModel()
+        self.admission = get_controller()
+        self.graph = self._build_graph()
         
         app_logger.info(" Campaign Pipeline initialized")
     
-    def run(self, brief_path: Path) -> CampaignOutput:
+    def _build_graph(self) -> StageGraph:
+        """
+        Build the stage graph, tightened in memory-lean mode.
+        
+        Lean mode renders one image at a time on the CPU and holds at most
+        LEAN_MEMORY_BUDGET_MB of images between stages, trading throughput
+        for a small, flat memory footprint on very large briefs.
+        """
+        if not settings.memory_lean_mode:
+            return StageGraph(self._build_stages())
+        
+        limits = default_limits()
+        limits[ResourceClass.CPU] = 1
+        return StageGraph(
+            self._build_stages(),
+            limits=limits,
+            memory_budget=settings.lean_memory_budget_mb * 1024 * 1024
+        )
+    
+    def _build_stages(self) -> list[Stage]:
+        """Describe the stages of the pipeline."""
+        return [
+            Stage(
+                "source", self._source_stage,
+                scope=("product_id",),
+                resource=ResourceClass.NETWORK,
+                throttled=True
+            ),
+            Stage(
+                "translate", self._translate_stage,
+                scope=("language",),
+                resource=ResourceClass.NETWORK
+            ),
+            Stage(
+                "lookup", self._lookup_stage,
+                inputs=("source", "translate"),
+                scope=("product_id", "aspect_ratio", "language"),
+                resource=ResourceClass.DISK
+            ),
+            Stage(
+                "resize", self._resize_stage,
+                inputs=("source", "lookup"),
+                scope=("product_id", "aspect_ratio", "language"),
+                resource=ResourceClass.CPU,
+                cache_key=self._resize_key
+            ),
+            Stage(
+                "overlay", self._overlay_stage,
+                inputs=("resize", "translate"),
+                scope=("product_id", "aspect_ratio", "language"),
+                resource=ResourceClass.CPU,
+                mutates=("resize",)
+            ),
+            Stage(
+                "encode", self._encode_stage,
+                inputs=("overlay",),
+                scope=("product_id", "aspect_ratio", "language"),
+                resource=ResourceClass.CPU
+            ),
+            Stage(
+                "save", self._save_stage,
+                inputs=("lookup", "encode"),
+                scope=("product_id", "aspect_ratio", "language"),
+                resource=ResourceClass.DISK,
+                accepts_skipped=True
+            ),
+        ]
+    
+    def run(
+        self,
+        brief_path: Path,
+        on_event: Optional[EventCallback] = None,
+        token: Optional[CancellationToken] = None,
+        resize_quality: Optional[str] = None
+    ) -> CampaignOutput:
         """
         Run complete pipeline for a campaign brief.
         
         Args:
             brief_path: Path to campaign brief file
-            
+            on_event: Callback receiving ProgressEvents as the run advances
+            token: Cancellation token that stops the run when cancelled
+            resize_quality: Resize quality tier (uses settings default if None)
+        
         Returns:
             CampaignOutput with results and metadata
+            
+        Raises:
+            RunCancelled: If the token was cancelled; the run can be resumed
+            ValueError: If the resize quality tier is unknown
         """
-        app_logger.info("=" * 70)
-        app_logger.info(f" Starting Campaign Pipeline")
-        app_logger.info(f"📄 Brief: {brief_path.name}")
-        app_logger.info("=" * 70)
+        with self._tracing():
+            return self._run(brief_path, on_event, token=token, resize_quality=resize_quality)
+    
+    def plan(self, brief_path: Path, resize_quality: Optional[str] = None) -> CampaignPlan:
+        """
+        Plan a run of a brief without executing it.
         
-        # Step 1: Parse brief
+        Args:
+            brief_path: Path to campaign brief file
+            resize_quality: Resize quality tier (uses settings default if None)
+            
+        Returns:
+            CampaignPlan with asset checks, API call and cache hit counts,
+            and time and cost estimates
+        """
+        brief = self.brief_parser.parse_file(brief_path)
+        return CampaignPlanner(self).plan(brief, resize_quality)
+    
+    def iter_run(self, brief_path: Path, resize_quality: Optional[str] = None) -> EventStream:
+        """
+        Run the pipeline in the background and iterate over its progress events.
+        
+        Args:
+            brief_path: Path to campaign brief file
+            resize_quality: Resize quality tier (uses settings default if None)
+        
+        Returns:
+            EventStream yielding ProgressEvents; its ``result`` holds the
+            CampaignOutput once iteration completes, and ``cancel()`` stops it
+        """
+        return EventStream(
+            self.run, brief_path, token=CancellationToken(), resize_quality=resize_quality
+        )
+    
+    def _run(
+        self,
+        brief_path: Path,
+        on_event: Optional[EventCallback],
+        enable_compliance: bool = False,
+        token: Optional[CancellationToken] = None,
+        resize_quality: Optional[str] = None
+    ) -> CampaignOutput:
+        """Parse a brief, run its stage graph and finish the run."""
+        # Resolve the tier once so the whole run (and its resumes) uses the same one
+        resize_quality = self.image_processor.resize_quality(resize_quality)
+        self._log_start(brief_path, enable_compliance)
+        tracker = ProgressTracker(on_event)
+        
+        # Step 1: Parse brief (ahead of the graph, which is expanded from it)
         try:
-            brief = self.brief_parser.parse_file(brief_path)
+            with tracker.stage("parse"), tracing.span("parse", "disk"):
+                brief = self.brief_parser.parse_file(brief_path)
             app_logger.info(f" Parsed brief: {brief.campaign_name}")
         except Exception as e:
             app_logger.error(f" Failed to parse brief: {e}")
+            tracker.error(f"Failed to parse brief: {e}", stage="parse")
             raise
         
-        # Create output tracking
-        output = CampaignOutput(
+        if settings.preflight_checks:
+            self._preflight(brief, tracker)
+        
+        if token is not None:
+            token.raise_if_cancelled()
+        
+        # Step 2: Create output directory and run manifest
+        campaign_dir = self.output_manager.create_campaign_directory(brief.campaign_id)
+        output = self._new_output(brief, campaign_dir)
+        manifest = RunManifest.create(
+            campaign_dir,
+            brief_path,
+            pipeline=self.PIPELINE_NAME,
+            resize_quality=resize_quality,
+            **self._manifest_details(enable_compliance)
+        )
+        state = RunState(
+            brief,
+            campaign_dir,
+            output,
+            manifest,
+            tracker,
+            enable_compliance,
+            token,
+            resize_quality=resize_quality
+        )
+        tracker.start(campaign_dir.name, len(brief.products) * len(brief.aspect_ratios))
+        
+        # Step 3: Produce every asset, then retry transient failures
+        self._execute(state, self._pending_cells(brief))
+        self._drain_retries(state)
+        
+        # Step 4: Save metadata and summary
+        return self._finish(state)
+    
+    def resume(
+        self,
+        run_id: str,
+        on_event: Optional[EventCallback] = None,
+        token: Optional[CancellationToken] = None
+    ) -> CampaignOutput:
+        """
+        Finish an interrupted run.
+        
+        Only product/ratio/language cells missing from the run manifest are
+        processed; recorded base images (e.g. paid generations) are reused.
+        
+        Args:
+            run_id: Campaign directory name of the run
+            on_event: Callback receiving ProgressEvents as the run advances
+            token: Cancellation token that stops the run when cancelled
+        
+        Returns:
+            CampaignOutput covering both earlier and newly created assets
+        """
+        with self._tracing():
+            return self._resume(run_id, on_event, token)
+    
+    def _resume(
+        self,
+        run_id: str,
+        on_event: Optional[EventCallback],
+        token: Optional[CancellationToken] = None
+    ) -> CampaignOutput:
+        """Load an interrupted run and run the stage graph for its missing cells."""
+        state, completed = self._load_run(run_id, on_event, token=token)
+        brief = state.brief
+        
+        app_logger.info("=" * 70)
+        app_logger.info(f" Resuming run {run_id} ({len(completed)} assets already done)")
+        app_logger.info("=" * 70)
+        
+        state.tracker.start(run_id, len(brief.products) * len(brief.aspect_ratios) - len(completed))
+        
+        self._execute(state, self._pending_cells(brief, completed))
+        self._drain_retries(state)
+        
+        return self._finish(state)
+    
+    def render_cells(
+        self,
+        run_id: str,
+        cells: list[dict],
+        on_event: Optional[EventCallback] = None,
+        token: Optional[CancellationToken] = None
+    ) -> CampaignOutput:
+        """
+        Render selected cells of an existing run without finishing it.
+        
+        Used by queue workers that each produce part of a run. Cells already
+        recorded in the run manifest are skipped.
+        
+        Args:
+            run_id: Campaign directory name of the run
+            cells: Cells as dicts with product_id, aspect_ratio and language
+            on_event: Callback receiving ProgressEvents as the cells advance
+            token: Cancellation token that stops rendering when cancelled
+            
+        Returns:
+            CampaignOutput holding only the assets and errors of these cells
+        """
+        state, completed = self._load_run(run_id, on_event, restore=False, token=token)
+        pending = [
+            cell for cell in cells
+            if (cell["product_id"], cell["aspect_ratio"], cell["language"]) not in completed
+        ]
+        
+        state.tracker.start(run_id, len(pending))
+        self._execute(state, pending)
+        self._report_failures(state)
+        
+        return state.output
+    
+    def retry_failed(
+        self,
+        run_id: str,
+        on_event: Optional[EventCallback] = None,
+        transient_only: bool = False,
+        token: Optional[CancellationToken] = None
+    ) -> CampaignOutput:
+        """
+        Re-run only the failed cells of a run.
+        
+        Cells recorded as failed in the run manifest (and not completed
+        since) are executed again; every other asset is kept as is.
+        
+        Args:
+            run_id: Campaign directory name of the run
+            on_event: Callback receiving ProgressEvents as the run advances
+            transient_only: Skip cells whose last failure was permanent
+            token: Cancellation token that stops the run when cancelled
+            
+        Returns:
+            CampaignOutput covering both earlier and newly created assets
+        """
+        with self._tracing():
+            return self._retry_failed(run_id, on_event, transient_only, token)
+    
+    def _retry_failed(
+        self,
+        run_id: str,
+        on_event: Optional[EventCallback],
+        transient_only: bool,
+        token: Optional[CancellationToken] = None
+    ) -> CampaignOutput:
+        """Load a run and run the stage graph for its failed cells."""
+        state, _ = self._load_run(run_id, on_event, token=token)
+        failed = state.manifest.failed_cells()
+        cells = [
+            {"product_id": product_id, "aspect_ratio": aspect_ratio, "language": language}
+            for (product_id, aspect_ratio, language), record in failed.items()
+            if product_id in state.products and (record.get("transient") or not transient_only)
+        ]
+        
+        app_logger.info("=" * 70)
+        app_logger.info(f" Retrying {len(cells)} failed assets of run {run_id}")
+        app_logger.info("=" * 70)
+        
+        state.tracker.start(run_id, len(cells))
+        self._execute(state, cells)
+        self._drain_retries(state)
+        
+        return self._finish(state)
+    
+    def source_lock_key(self, run_id: str, product_id: str) -> Optional[str]:
+        """
+        Get the lock that serializes generating a product's image across workers.
+        
+        Jobs of sibling cells each run the source stage; holding this lock
+        while rendering lets the first one generate and the others reuse
+        the image it recorded.
+        
+        Args:
+            run_id: Campaign directory name of the run
+            product_id: Product of the cell about to be rendered
+            
+        Returns:
+            Lock name, or None if the product's image needs no generation
+        """
+        manifest = RunManifest.load(self.output_manager.base_output_dir / run_id)
+        recorded = manifest.sources().get(product_id)
+        if recorded and recorded.exists():
+            return None
+        
+        brief = self.brief_parser.parse_file(manifest.brief_path)
+        product = next((p for p in brief.products if p.product_id == product_id), None)
+        if product is None or not product.needs_generation():
+            return None
+        if product.existing_image and self.asset_manager.get_asset_path(product.existing_image):
+            return None
+        
+        generation_key = self._generation_key(product)
+        if generation_key and self.build_cache.get_object(generation_key):
+            return None
+        return f"generation:{generation_key or f'{run_id}:{product_id}'}"
+    
+    def finalize(self, run_id: str, errors: Optional[list[str]] = None) -> CampaignOutput:
+        """
+        Write the metadata of a run whose cells were rendered separately.
+        
+        Args:
+            run_id: Campaign directory name of the run
+            errors: Errors of cells that could not be produced
+            
+        Returns:
+            CampaignOutput covering every recorded asset
+        """
+        state, _ = self._load_run(run_id)
+        for error in errors or []:
+            state.output.add_error(error)
+        
+        return self._finish(state)
+    
+    def _preflight(self, brief: CampaignBrief, tracker: ProgressTracker):
+        """
+        Plan a brief and abort before any work if assets would fail.
+        
+        Raises:
+            ValueError: If the plan found missing assets or fonts
+        """
+        with tracker.stage("plan"), tracing.span("plan", "disk"):
+            plan = CampaignPlanner(self).plan(brief)
+        
+        if not plan.is_runnable():
+            message = "Preflight failed: " + "; ".join(plan.problems)
+            app_logger.error(f" {message}")
+            tracker.error(message, stage="plan")
+            raise ValueError(message)
+    
+    def _load_run(
+        self,
+        run_id: str,
+        on_event: Optional[EventCallback] = None,
+        restore: bool = True,
+        token: Optional[CancellationToken] = None
+    ) -> tuple[RunState, dict]:
+        """
+        Rebuild the state of a run from its manifest.
+        
+        Args:
+            run_id: Campaign directory name of the run
+            on_event: Callback receiving ProgressEvents
+            restore: Add already completed assets to the output
+            token: Cancellation token of the run
+            
+        Returns:
+            Tuple of (run state, completed cells)
+        """
+        campaign_dir = self.output_manager.base_output_dir / run_id
+        manifest = RunManifest.load(campaign_dir)
+        brief = self.brief_parser.parse_file(manifest.brief_path)
+        
+        state = RunState(
+            brief,
+            campaign_dir,
+            self._new_output(brief, campaign_dir),
+            manifest,
+            ProgressTracker(on_event),
+            enable_compliance=manifest.header.get("enable_compliance", False),
+            token=token,
+            resize_quality=self.image_processor.resize_quality(
+                manifest.header.get("resize_quality")
+            )
+        )
+        
+        completed = manifest.completed_cells()
+        if restore:
+            for record in completed.values():
+                self._restore_asset(state, record)
+        
+        return state, completed
+    
+    @contextmanager
+    def _tracing(self):
+        """Record a trace of the run when tracing is enabled."""
+        with tracing.activate(Tracer() if settings.tracing_enabled else None):
+            yield
+    
+    def _log_start(self, brief_path: Path, enable_compliance: bool):
+        """Log the start of a run."""
+        app_logger.info("=" * 70)
+        app_logger.info(f" Starting Campaign Pipeline")
+        app_logger.info(f"📄 Brief: {brief_path.name}")
+        app_logger.info("=" * 70)
+    
+    def _manifest_details(self, enable_compliance: bool) -> dict:
+        """Get extra run settings recorded in the manifest header."""
+        return {}
+    
+    @staticmethod
+    def _new_output(brief: CampaignBrief, campaign_dir: Path) -> CampaignOutput:
+        """Create the output record of a run."""
+        return CampaignOutput(
             campaign_id=brief.campaign_id,
             campaign_name=brief.campaign_name,
             language=brief.language,
             generated_at=datetime.now().isoformat(),
-            output_directory=""
+            output_directory=str(campaign_dir)
         )
+    
+    def _restore_asset(self, state: RunState, record: dict):
+        """Add an asset completed by an earlier attempt to the output."""
+        state.output.add_asset(record["product_name"], record["aspect_ratio"], record["filepath"])
+    
+    @staticmethod
+    def _pending_cells(brief: CampaignBrief, completed: Optional[dict] = None) -> list[dict]:
+        """
+        List the product/ratio/language cells of a brief not yet completed.
         
-        # Step 2: Create output directory
-        campaign_dir = self.output_manager.create_campaign_directory(brief.campaign_id)
-        output.output_directory = str(campaign_dir)
+        Args:
+            brief: Parsed campaign brief
+            completed: Cells already done, keyed by (product_id, ratio, language)
+            
+        Returns:
+            Cells as dicts with product_id, aspect_ratio and language
+        """
+        completed = completed or {}
         
-        # Step 3: Process each product
+        cells = []
         for product in brief.products:
-            app_logger.info(f"\n📦 Processing product: {product.product_name}")
+            pending = [
+                aspect_ratio for aspect_ratio in brief.aspect_ratios
+                if (product.product_id, aspect_ratio, brief.language) not in completed
+            ]
+            if not pending:
+                app_logger.info(f"\n📦 Skipping completed product: {product.product_name}")
+            cells.extend(
+                {
+                    "product_id": product.product_id,
+                    "aspect_ratio": aspect_ratio,
+                    "language": brief.language,
+                }
+                for aspect_ratio in pending
+            )
+        return cells
+    
+    def _execute(self, state: RunState, cells: list[dict]):
+        """
+        Run the stage graph for the given cells.
+        
+        Args:
+            state: Run state
+            cells: Cells as dicts with product_id, aspect_ratio and language
             
+        Raises:
+            RunCancelled: If the run's token was cancelled
+        """
+        state.cells = cells
+        try:
+            with RssSampler() as rss:
+                report = self.graph.execute(
+                    cells,
+                    state,
+                    on_error=self._on_stage_error,
+                    token=state.token
+                )
+        except RunCancelled as e:
+            self._on_cancelled(state, str(e))
+            raise
+        state.peak_rss_bytes = max(state.peak_rss_bytes, rss.peak_bytes or 0)
+        app_logger.info(
+            f"Stage graph: {report.completed} tasks, "
+            f"peak {report.peak_bytes / (1024 * 1024):.1f} MB held between stages, "
+            f"peak RSS {rss.peak_mb} MB"
+        )
+        
+        # Learn per-asset stage costs for deadline scheduling
+        if cells and not report.failed:
+            self.cost_model.observe(report.stage_seconds, len(cells))
             try:
-                # Get or generate base image
-                base_image = self._get_or_generate_image(product)
-                
-                if not base_image:
-                    error_msg = f"Could not obtain image for {product.product_name}"
-                    app_logger.error(f" {error_msg}")
-                    output.add_error(error_msg)
-                    continue
-                
-                # Translate campaign message if needed
-                message = self._translate_message(brief)
-                
-                # Generate assets for each aspect ratio
-                for aspect_ratio in brief.aspect_ratios:
-                    app_logger.info(f"  📐 Creating {aspect_ratio} asset...")
-                    
-                    try:
-                        # Resize to aspect ratio
-                        resized = self.image_processor.resize_to_aspect_ratio(
-                            base_image,
-                            aspect_ratio
-                        )
-                        
-                        # Add text overlay
-                        final_image = self.image_processor.add_text_overlay(
-                            resized,
-                            message,
-                            position="bottom"
-                        )
-                        
-                        # Save asset
-                        saved_path = self.output_manager.save_asset(
-                            final_image,
-                            campaign_dir,
-                            product.product_name,
-                            aspect_ratio
-                        )
-                        
-                        if saved_path:
-                            output.add_asset(
-                                product.product_name,
-                                aspect_ratio,
-                                self.output_manager.get_relative_path(saved_path)
-                            )
-                            app_logger.info(f"   Created {aspect_ratio} asset")
-                        
-                    except Exception as e:
-                        error_msg = f"Failed to create {aspect_ratio} for {product.product_name}: {e}"
-                        app_logger.error(f"   {error_msg}")
-                        output.add_error(error_msg)
-                
-            except Exception as e:
-                error_msg = f"Failed to process {product.product_name}: {e}"
-                app_logger.error(f" {error_msg}")
-                output.add_error(error_msg)
-        
-        # Step 4: Save metadata
-        self.output_manager.save_metadata(campaign_dir, output)
-        
-        # Step 5: Summary
-        self._print_summary(output)
-        
-        return output
-    
-    def _get_or_generate_image(self, product):
-        """Get existing image or generate new one."""
+                self.cost_model.save()
+            except OSError as e:
+                app_logger.warning(f"Could not save stage cost estimates: {e}")
+    
+    def _drain_retries(self, state: RunState):
+        """
+        Re-execute cells lost to transient failures, with exponential backoff.
+        
+        Permanent failures are left alone; transient ones still failing after
+        the last round stay recorded for retry_failed.
+        
+        Args:
+            state: Run state
+        """
+        for attempt in range(1, settings.retry_max_attempts + 1):
+            retry = [failure for failure in state.failures if failure.transient]
+            if not retry:
+                return
+            
+            cells = {}
+            for failure in retry:
+                for cell in failure.cells:
+                    cells[(cell["product_id"], cell["aspect_ratio"], cell["language"])] = cell
+            
+            delay = backoff_delay(attempt, settings.retry_base_seconds)
+            app_logger.warning(
+                f" Retrying {len(cells)} assets after transient errors in {delay:.1f}s "
+                f"(attempt {attempt}/{settings.retry_max_attempts})"
+            )
+            state.token.wait(delay)
+            
+            state.failures = [failure for failure in state.failures if not failure.transient]
+            self._execute(state, list(cells.values()))
+    
+    def _on_cancelled(self, state: RunState, reason: str):
+        """Record a cancelled run; completed assets are kept for resume."""
+        app_logger.warning(f" Run {state.campaign_dir.name} cancelled: {reason}")
+        state.manifest.record_cancelled(reason)
+        state.tracker.cancelled(reason)
+    
+    def _report_failures(self, state: RunState):
+        """Add the failures left after retrying to the output errors."""
+        for failure in state.failures:
+            state.output.add_error(failure.message)
+        state.failures = []
+    
+    def _on_stage_error(self, ctx: TaskContext, error: Exception):
+        """
+        Record a failed stage; the cells depending on it are dropped.
+        
+        Each dropped cell is written to the run manifest with the error
+        class. Errors reach the output once retries are exhausted.
+        """
+        state = ctx.state
+        cell = state.cell(ctx)
+        aspect_ratio = ctx.scope.get("aspect_ratio")
+        
+        if aspect_ratio:
+            error_msg = f"Failed to create {aspect_ratio} for {cell['product_name']}: {error}"
+        elif "product_name" in cell:
+            error_msg = f"Failed to process {cell['product_name']}: {error}"
+        else:
+            error_msg = f"Failed to translate message to {cell['language']}: {error}"
+        
+        transient = is_transient(error)
+        cells = state.cells_in(ctx.scope)
+        state.failures.append(CellFailure(
+            stage=ctx.stage,
+            scope=dict(ctx.scope),
+            cells=cells,
+            error_type=type(error).__name__,
+            message=error_msg,
+            transient=transient
+        ))
+        for failed in cells:
+            state.manifest.record_failure(
+                stage=ctx.stage,
+                error_type=type(error).__name__,
+                error=str(error),
+                transient=transient,
+                **failed
+            )
+        
+        app_logger.error(f" {error_msg}")
+        state.tracker.error(error_msg, stage=ctx.stage, aspect_ratio=aspect_ratio, **cell)
+    
+    def _finish(self, state: RunState) -> CampaignOutput:
+        """Save metadata, close the manifest and print the summary."""
+        self._report_failures(state)
+        brief = state.brief
+        product_order = {p.product_name: i for i, p in enumerate(brief.products)}
+        ratio_order = {ratio: i for i, ratio in enumerate(brief.aspect_ratios)}
+        
+        # Stages finish in any order; keep metadata in brief order
+        state.output.generated_assets.sort(
+            key=lambda asset: (
+                product_order.get(asset["product_name"], len(product_order)),
+                ratio_order.get(asset["aspect_ratio"], len(ratio_order))
+            )
+        )
+        
+        if state.peak_rss_bytes:
+            state.output.peak_rss_mb = round(state.peak_rss_bytes / (1024 * 1024), 1)
+        
+        self.output_manager.save_metadata(state.campaign_dir, state.output)
+        self._save_reports(state)
+        state.manifest.record_finished(peak_rss_mb=state.output.peak_rss_mb)
+        state.tracker.finish(
+            message=f"{state.output.success_count()} assets, {len(state.output.errors)} errors"
+        )
+        
+        self._print_summary(state)
+        self._save_trace(state)
+        
+        return state.output
+    
+    def _save_reports(self, state: RunState):
+        """Write additional reports into the campaign directory."""
+    
+    def _save_trace(self, state: RunState):
+        """Export the run's trace and log where the time went."""
+        tracer = tracing.current_tracer()
+        if tracer is None:
+            return
+        
+        tracer.export(state.campaign_dir / TRACE_FILENAME)
+        
+        slowest = sorted(tracer.summary().items(), key=lambda item: item[1], reverse=True)[:5]
+        app_logger.info(
+            "⏱  Time by span: " + ", ".join(f"{name} {ms:.0f}ms" for name, ms in slowest)
+        )
+    
+    # Stages
+    
+    def _source_stage(self, ctx: TaskContext) -> Image.Image:
+        """Get or generate the base image of a product."""
+        state = ctx.state
+        product = state.products[ctx.scope["product_id"]]
+        app_logger.info(f"\n📦 Processing product: {product.product_name}")
+        
+        # A generation may be deferred once per run, and only if retries will pick it up
+        may_defer = settings.retry_max_attempts > 0 and product.product_id not in state.sourced
+        state.sourced.add(product.product_id)
+        
+        with state.tracker.stage("source", **state.cell(ctx)):
+            image = self._get_or_generate_image(
+                product, state.manifest, may_defer=may_defer,
+                decode_size=self._decode_size(state.brief.aspect_ratios, state.resize_quality)
+            )
+        
+        if not image:
+            raise ValueError(f"Could not obtain image for {product.product_name}")
+        
+        # Decode now; the image is read by several stages at once
+        image.load()
+        return image
+    
+    def _translate_stage(self, ctx: TaskContext) -> str:
+        """Translate the campaign message into the task's language."""
+        state = ctx.state
+        with state.tracker.stage("translate", language=ctx.scope["language"]):
+            return self._translate_message(state.brief)
+    
+    def _lookup_stage(
+        self,
+        ctx: TaskContext,
+        source: Image.Image,
+        translate: str
+    ) -> AssetLookup:
+        """Find an identical asset rendered by a previous run."""
+        if not self.build_cache:
+            self._check_layout(ctx, translate)
+            return AssetLookup(None, None, None)
+        
+        source_digest = self.build_cache.image_digest(source)
+        asset_key = self._asset_key(
+            source_digest,
+            translate,
+            ctx.scope["aspect_ratio"],
+            source.size,
+            ctx.state.resize_quality
+        )
+        cached = self.build_cache.get_object(asset_key) if asset_key else None
+        if not cached:
+            self._check_layout(ctx, translate)
+        return AssetLookup(asset_key, cached, source_digest)
+    
+    def _check_layout(self, ctx: TaskContext, translate: str):
+        """
+        Fail a cell before rendering if preflight checks are on and its text would not fit.
+        
+        Raises:
+            ValueError: If the translated message overflows its band or is too small
+        """
+        if not settings.preflight_checks:
+            return
+        
+        problem = self.image_processor.check_layout(
+            translate,
+            ctx.scope["aspect_ratio"],
+            base_size=settings.max_image_size
+        )
+        if problem:
+            raise ValueError(problem)
+    
+    def _resize_key(
+        self,
+        ctx: TaskContext,
+        source: Image.Image,
+        lookup: AssetLookup
+    ) -> Optional[str]:
+        """Share resized images between cells with the same source and ratio."""
+        if lookup.cached or not lookup.source_digest:
+            return None
+        return f"{lookup.source_digest}:{ctx.scope['aspect_ratio']}"
+    
+    def _resize_stage(
+        self,
+        ctx: TaskContext,
+        source: Image.Image,
+        lookup: AssetLookup
+    ):
+        """Resize the base image to the cell's aspect ratio."""
+        if lookup.cached:
+            return SKIP
+        
+        app_logger.info(f"  📐 Creating {ctx.scope['aspect_ratio']} asset...")
+        return self.image_processor.resize_to_aspect_ratio(
+            source,
+            ctx.scope["aspect_ratio"],
+            base_size=settings.max_image_size,
+            quality=ctx.state.resize_quality
+        )
+    
+    def _overlay_stage(
+        self,
+        ctx: TaskContext,
+        resize: Image.Image,
+        translate: str
+    ) -> Image.Image:
+        """Add the campaign message to a resized image, drawing onto it in place."""
+        return self.image_processor.add_text_overlay(
+            resize, translate, position="bottom", in_place=True
+        )
+    
+    def _encode_stage(self, ctx: TaskContext, overlay: Image.Image) -> bytes:
+        """Encode a finished image."""
+        return self.output_manager.encode_asset(overlay)
+    
+    def _save_stage(
+        self,
+        ctx: TaskContext,
+        lookup: AssetLookup,
+        encode,
+        comply=None
+    ) -> Path:
+        """Write an asset (or link the cached copy) and record it."""
+        state = ctx.state
+        product = state.products[ctx.scope["product_id"]]
+        aspect_ratio = ctx.scope["aspect_ratio"]
+        reused = encode is SKIP
+        
+        if reused:
+            saved_path = self.output_manager.link_asset(
+                lookup.cached,
+                state.campaign_dir,
+                product.product_name,
+                aspect_ratio
+            )
+        else:
+            saved_path = self.output_manager.save_asset(
+                encode,
+                state.campaign_dir,
+                product.product_name,
+                aspect_ratio
+            )
+            if saved_path and lookup.key:
+                self.build_cache.put_object(lookup.key, saved_path)
+        
+        if not saved_path:
+            raise IOError("asset could not be written")
+        
+        details = {}
+        if comply is not None:
+            details["compliance"] = comply.model_dump()
+        
+        relative_path = self.output_manager.get_relative_path(saved_path)
+        state.output.add_asset(product.product_name, aspect_ratio, relative_path)
+        state.manifest.record_asset(
+            product.product_id,
+            product.product_name,
+            aspect_ratio,
+            ctx.scope["language"],
+            relative_path,
+            **details
+        )
+        state.tracker.asset_done(
+            aspect_ratio=aspect_ratio,
+            filepath=str(saved_path.resolve()),
+            reused=reused,
+            **state.cell(ctx)
+        )
+        app_logger.info(f"   Created {aspect_ratio} asset")
+        return saved_path
+    
+    # Helpers
+    
+    def _get_or_generate_image(
+        self,
+        product,
+        manifest: Optional[RunManifest] = None,
+        may_defer: bool = False,
+        decode_size: Optional[DecodeSize] = None
+    ):
+        """
+        Get existing image or generate new one.
+        
+        Generations pass the admission controller: while generation capacity
+        is saturated a near-duplicate library image may be used instead, or
+        the generation deferred.
+        
+        Args:
+            product: Product needing an image
+            manifest: Run manifest recording obtained images (optional)
+            may_defer: Allow deferring the generation under load
+            decode_size: Smallest size the image is needed at, for reduced JPEG decoding
+            
+        Returns:
+            Image, or None if none could be obtained
+            
+        Raises:
+            TransientError: If the generation was deferred
+        """
+        # Reuse the base image recorded by an interrupted run
+        if manifest:
+            recorded = manifest.sources().get(product.product_id)
+            if recorded and recorded.exists():
+                app_logger.info(f"   Reusing recorded image: {recorded.name}")
+                return self.asset_manager.open_image(recorded, decode_size)
+        
         # Try to load existing image
         if product.existing_image:
-            image = self.asset_manager.load_image(product.existing_image)
+            image = self.asset_manager.load_image(product.existing_image, decode_size)
             if image:
                 app_logger.info(f"   Loaded existing image: {product.existing_image}")
                 return image
         
         # Generate new image if needed
         if product.needs_generation():
+            # Reuse a previous generation with the same prompt and settings
+            generation_key = self._generation_key(product)
+            if generation_key:
+                cached = self.build_cache.get_object(generation_key)
+                if cached:
+                    app_logger.info(f"   Reusing generated image for {product.product_name}")
+                    return self.asset_manager.open_image(cached, decode_size)
+            
             if not self.image_generator.is_available():
                 app_logger.warning("    Image generation not available (no API key)")
                 return None
             
+            admission = self.admission.admit(product, self.asset_manager, may_defer=may_defer)
+            if admission.action == "library":
+                if manifest:
+                    manifest.record_source(product.product_id, admission.path)
+                return self.asset_manager.open_image(admission.path, decode_size)
+            if admission.action == "defer":
+                raise TransientError(
+                    f"Generation deferred: {self.admission.queue_depth} generations waiting"
+                )
+            
             app_logger.info(f"   Generating image via DALL-E...")
             
-            image = self.image_generator.generate_product_image(
-                product.product_name,
-                product.description,
-                prompt=product.image_prompt
-            )
+            with self.admission.slot():
+                image = self.image_generator.generate_product_image(
+                    product.product_name,
+                    product.description,
+                    prompt=product.image_prompt,
+                    size=settings.dalle_size,
+                    quality=settings.dalle_quality
+                )
             
             if image:
                 # Save generated image to assets
-                filename = f"{product.product_name.lower().replace(' ', '_')}_generated.png"
-                self.asset_manager.save_image(image, filename)
+                filename = (
+                    f"{product.product_name.lower().replace(' ', '_')}{self.GENERATED_SUFFIX}.png"
+                )
+                if self.asset_manager.save_image(image, filename):
+                    saved = self.asset_manager.assets_dir / filename
+                    if generation_key:
+                        saved = self.build_cache.put_object(generation_key, saved)
+                        image = self.asset_manager.open_image(saved)
+                    if manifest:
+                        manifest.record_source(product.product_id, saved)
                 app_logger.info(f"   Generated and saved: {filename}")
             
             return image
@@ -179,6 +1065,19 @@ class CampaignPipeline:
         if brief.language.lower() == 'en':
             return brief.campaign_message
         
+        translation_key = None
+        if self.build_cache:
+            translation_key = self.build_cache.make_key(
+                kind="translation",
+                text=brief.campaign_message,
+                language=brief.language,
+                model=settings.translation_model
+            )
+            cached = self.build_cache.get_value(translation_key)
+            if cached is not None:
+                app_logger.info(f"   Reusing cached {brief.language} translation")
+                return cached
+        
         if not self.translator.is_available():
             app_logger.warning("    Translation not available, using original message")
             return brief.campaign_message
@@ -188,10 +1087,74 @@ class CampaignPipeline:
             brief.language
         )
         
+        # Failed translations fall back to the original text; don't cache those
+        if translation_key and translated != brief.campaign_message:
+            self.build_cache.put_value(translation_key, translated)
+        
         return translated
     
-    def _print_summary(self, output: CampaignOutput):
+    def _decode_size(
+        self,
+        aspect_ratios: list[str],
+        resize_quality: Optional[str] = None
+    ) -> Optional[DecodeSize]:
+        """Get the decode size of sources resized to these ratios (None decodes in full)."""
+        if self.image_processor.resize_quality(resize_quality) == "best":
+            return None
+        
+        return functools.partial(
+            self.image_processor.decode_size,
+            aspect_ratios=aspect_ratios,
+            base_size=settings.max_image_size
+        )
+    
+    def _generation_key(self, product) -> Optional[str]:
+        """Build the cache key of a product's generated image."""
+        if not self.build_cache:
+            return None
+        
+        return self.build_cache.make_key(
+            kind="generation",
+            model=settings.dalle_model,
+            prompt=self.image_generator.build_prompt(
+                product.product_name, product.description, product.image_prompt
+            ),
+            size=settings.dalle_size,
+            quality=settings.dalle_quality
+        )
+    
+    def _asset_key(
+        self,
+        source_digest: Optional[str],
+        message: str,
+        aspect_ratio: str,
+        source_size: tuple[int, int],
+        resize_quality: Optional[str] = None
+    ) -> Optional[str]:
+        """Build the content-addressed key of an asset rendered from a source of source_size."""
+        if not self.build_cache or not source_digest:
+            return None
+        
+        signature = self.image_processor.render_signature(
+            message,
+            aspect_ratio,
+            position="bottom",
+            base_size=settings.max_image_size,
+            source_size=source_size,
+            resize_quality=resize_quality
+        )
+        
+        return self.build_cache.make_key(
+            kind="asset",
+            source=source_digest,
+            fonts=[self.build_cache.file_digest(Path(path)) for path in signature["font_paths"]],
+            encoder=self.output_manager.encoder_settings(),
+            **signature
+        )
+    
+    def _print_summary(self, state: RunState):
         """Print pipeline execution summary."""
+        output = state.output
         app_logger.info("\n" + "=" * 70)
         app_logger.info("📊 PIPELINE SUMMARY")
         app_logger.info("=" * 70)
@@ -200,6 +1163,13 @@ class CampaignPipeline:
         app_logger.info(f"Output: {output.output_directory}")
         app_logger.info(f"Assets Generated: {output.success_count()}")
         
+        load = self.admission.metrics()
+        if load["shed"]:
+            app_logger.info(
+                f"Generation load shedding: {load['library']} served from library, "
+                f"{load['deferred']} deferred (process totals)"
+            )
+        
         if output.has_errors():
             app_logger.warning(f"Errors: {len(output.errors)}")
             for error in output.errors:
@@ -1,29 +1,31 @@
 """
 Enhanced Campaign Pipeline with Brand Compliance
 Pipeline with integrated brand guidelines validation.
+
+Runs the stage graph of CampaignPipeline with an added ``comply`` stage
+that validates each asset before it is saved.
 """
 
 from pathlib import Path
-from datetime import datetime
 from typing import Optional
 import json
+from PIL import Image
 
-from src.models.campaign import CampaignBrief, CampaignOutput
-from src.models.compliance import BrandGuidelines
-from src.services.brief_parser import BriefParser
-from src.services.asset_manager import AssetManager
-from src.services.image_generator import ImageGenerator
-from src.services.image_processor import ImageProcessor
-from src.services.translator import TranslationService
-from src.services.output_manager import OutputManager
+from src.models.compliance import BrandGuidelines, ComplianceResult
+from src.services.pipeline import AssetLookup, CampaignPipeline, RunState
+from src.services.progress import EventCallback, EventStream
+from src.services.stage_graph import SKIP, ResourceClass, Stage, TaskContext
 from src.compliance.brand_checker import BrandComplianceChecker
+from src.utils.cancellation import CancellationToken
 from src.utils.logger import app_logger
-from src.config import settings
 
 
-class EnhancedCampaignPipeline:
+class EnhancedCampaignPipeline(CampaignPipeline):
     """Enhanced campaign pipeline with brand compliance."""
     
+    PIPELINE_NAME = "enhanced"
+    GENERATED_SUFFIX = "_gen"
+    
     def __init__(
         self,
         api_key: Optional[str] = None,
@@ -36,22 +38,34 @@ class EnhancedCampaignPipeline:
             api_key: OpenAI API key (optional)
             guidelines_path: Path to brand guidelines JSON (optional)
         """
-        # Core services
-        self.brief_parser = BriefParser()
-        self.asset_manager = AssetManager()
-        self.image_generator = ImageGenerator(api_key=api_key)
-        self.image_processor = ImageProcessor()
-        self.translator = TranslationService(api_key=api_key)
-        self.output_manager = OutputManager()
-        
         # Compliance
+        self.guidelines_path = guidelines_path
         self.guidelines = self._load_guidelines(guidelines_path)
         self.compliance_checker = BrandComplianceChecker(self.guidelines)
         
+        # Core services and stage graph
+        super().__init__(api_key=api_key)
+        
         app_logger.info(" Enhanced Campaign Pipeline initialized")
         if self.guidelines:
             app_logger.info(f"   📋 Brand: {self.guidelines.brand_name}")
     
+    def _build_stages(self) -> list[Stage]:
+        """Add the compliance check between rendering and saving."""
+        stages = []
+        for stage in super()._build_stages():
+            if stage.name == "save":
+                stages.append(Stage(
+                    "comply", self._comply_stage,
+                    inputs=("lookup", "overlay", "translate"),
+                    scope=("product_id", "aspect_ratio", "language"),
+                    resource=ResourceClass.CPU,
+                    accepts_skipped=True
+                ))
+                stage.inputs += ("comply",)
+            stages.append(stage)
+        return stages
+    
     def _load_guidelines(self, path: Optional[Path]) -> Optional[BrandGuidelines]:
         """Load brand guidelines from file."""
         if not path:
@@ -70,177 +84,151 @@ class EnhancedCampaignPipeline:
     def run(
         self,
         brief_path: Path,
-        enable_compliance: bool = True
-    ) -> CampaignOutput:
+        enable_compliance: bool = True,
+        on_event: Optional[EventCallback] = None,
+        token: Optional[CancellationToken] = None,
+        resize_quality: Optional[str] = None
+    ):
         """
         Run enhanced pipeline with compliance checking.
         
         Args:
             brief_path: Path to campaign brief
             enable_compliance: Whether to run compliance checks
-            
+            on_event: Callback receiving ProgressEvents as the run advances
+            token: Cancellation token that stops the run when cancelled
+            resize_quality: Resize quality tier (uses settings default if None)
+        
         Returns:
             CampaignOutput with results and compliance data
         """
+        with self._tracing():
+            return self._run(
+                brief_path,
+                on_event,
+                enable_compliance=enable_compliance,
+                token=token,
+                resize_quality=resize_quality
+            )
+    
+    def iter_run(
+        self,
+        brief_path: Path,
+        enable_compliance: bool = True,
+        resize_quality: Optional[str] = None
+    ) -> EventStream:
+        """
+        Run the pipeline in the background and iterate over its progress events.
+        
+        Args:
+            brief_path: Path to campaign brief
+            enable_compliance: Whether to run compliance checks
+            resize_quality: Resize quality tier (uses settings default if None)
+        
+        Returns:
+            EventStream yielding ProgressEvents; its ``result`` holds the
+            CampaignOutput once iteration completes, and ``cancel()`` stops it
+        """
+        return EventStream(
+            self.run,
+            brief_path,
+            enable_compliance=enable_compliance,
+            token=CancellationToken(),
+            resize_quality=resize_quality
+        )
+    
+    def _log_start(self, brief_path: Path, enable_compliance: bool):
+        """Log the start of a run."""
         app_logger.info("=" * 70)
         app_logger.info(f" Starting Enhanced Pipeline")
         app_logger.info(f"📄 Brief: {brief_path.name}")
         app_logger.info(f"🔍 Compliance: {'Enabled' if enable_compliance else 'Disabled'}")
         app_logger.info("=" * 70)
-        
-        # Parse brief
-        try:
-            brief = self.brief_parser.parse_file(brief_path)
-            app_logger.info(f" Parsed: {brief.campaign_name}")
-        except Exception as e:
-            app_logger.error(f" Failed to parse: {e}")
-            raise
-        
-        # Create output tracking
-        output = CampaignOutput(
-            campaign_id=brief.campaign_id,
-            campaign_name=brief.campaign_name,
-            language=brief.language,
-            generated_at=datetime.now().isoformat(),
-            output_directory=""
-        )
-        
-        campaign_dir = self.output_manager.create_campaign_directory(brief.campaign_id)
-        output.output_directory = str(campaign_dir)
-        
-        # Track compliance results
-        compliance_results = []
-        
-        # Process each product
-        for product in brief.products:
-            app_logger.info(f"\n📦 Processing: {product.product_name}")
-            
-            try:
-                # Get or generate base image
-                base_image = self._get_or_generate_image(product)
-                
-                if not base_image:
-                    error = f"Could not obtain image for {product.product_name}"
-                    app_logger.error(f" {error}")
-                    output.add_error(error)
-                    continue
-                
-                # Translate message
-                message = self._translate_message(brief)
-                
-                # Generate assets for each aspect ratio
-                for aspect_ratio in brief.aspect_ratios:
-                    app_logger.info(f"  📐 Creating {aspect_ratio}...")
-                    
-                    try:
-                        # Resize
-                        resized = self.image_processor.resize_to_aspect_ratio(
-                            base_image, aspect_ratio
-                        )
-                        
-                        # Add text
-                        final = self.image_processor.add_text_overlay(
-                            resized, message, position="bottom"
-                        )
-                        
-                        # Save asset
-                        saved_path = self.output_manager.save_asset(
-                            final, campaign_dir, product.product_name, aspect_ratio
-                        )
-                        
-                        if saved_path:
-                            # Add to output
-                            output.add_asset(
-                                product.product_name,
-                                aspect_ratio,
-                                self.output_manager.get_relative_path(saved_path)
-                            )
-                            
-                            # Run compliance check
-                            if enable_compliance and self.guidelines:
-                                compliance = self.compliance_checker.validate_asset(
-                                    final,
-                                    text_content=message,
-                                    asset_metadata={
-                                        'aspect_ratio': aspect_ratio,
-                                        'product': product.product_name
-                                    }
-                                )
-                                compliance_results.append(compliance)
-                                
-                                if compliance.is_compliant:
-                                    app_logger.info(
-                                        f"   Compliance: {compliance.compliance_score:.0f}%"
-                                    )
-                                else:
-                                    app_logger.warning(
-                                        f"    Compliance: {compliance.compliance_score:.0f}% "
-                                        f"({len(compliance.failed_checks)} issues)"
-                                    )
-                            
-                            app_logger.info(f"   Created {aspect_ratio}")
-                    
-                    except Exception as e:
-                        error = f"Failed {aspect_ratio} for {product.product_name}: {e}"
-                        app_logger.error(f"   {error}")
-                        output.add_error(error)
-            
-            except Exception as e:
-                error = f"Failed to process {product.product_name}: {e}"
-                app_logger.error(f" {error}")
-                output.add_error(error)
-        
-        # Save metadata and compliance report
-        self.output_manager.save_metadata(campaign_dir, output)
-        
-        if compliance_results and enable_compliance:
-            self._save_compliance_report(campaign_dir, compliance_results)
-        
-        # Print summary
-        self._print_summary(output, compliance_results if enable_compliance else None)
-        
-        return output
     
-    def _get_or_generate_image(self, product):
-        """Get existing or generate new image."""
-        if product.existing_image:
-            image = self.asset_manager.load_image(product.existing_image)
-            if image:
-                app_logger.info(f"   Loaded: {product.existing_image}")
-                return image
+    def _manifest_details(self, enable_compliance: bool) -> dict:
+        """Record the compliance settings so resumed runs match."""
+        return {
+            "enable_compliance": enable_compliance,
+            "guidelines": str(self.guidelines_path) if self.guidelines_path else None,
+        }
+    
+    def _restore_asset(self, state: RunState, record: dict):
+        """Add an earlier asset and its compliance result."""
+        super()._restore_asset(state, record)
+        if record.get("compliance"):
+            state.compliance_results.append(ComplianceResult(**record["compliance"]))
+    
+    def _comply_stage(
+        self,
+        ctx: TaskContext,
+        lookup: AssetLookup,
+        overlay,
+        translate: str
+    ) -> Optional[ComplianceResult]:
+        """Validate a rendered (or reused) asset against the brand guidelines."""
+        state = ctx.state
+        if not (state.enable_compliance and self.guidelines):
+            return None
         
-        if product.needs_generation():
-            if not self.image_generator.is_available():
-                app_logger.warning("    Generation unavailable")
-                return None
-            
-            app_logger.info(f"   Generating via DALL-E...")
-            image = self.image_generator.generate_product_image(
+        product = state.products[ctx.scope["product_id"]]
+        aspect_ratio = ctx.scope["aspect_ratio"]
+        
+        with state.tracker.stage("comply", aspect_ratio=aspect_ratio, **state.cell(ctx)):
+            compliance = self._check_compliance(
+                lookup.cached if overlay is SKIP else overlay,
+                translate,
+                aspect_ratio,
                 product.product_name,
-                product.description,
-                prompt=product.image_prompt
+                lookup.key
             )
-            
-            if image:
-                filename = f"{product.product_name.lower().replace(' ', '_')}_gen.png"
-                self.asset_manager.save_image(image, filename)
-            
-            return image
+        state.compliance_results.append(compliance)
         
-        return None
+        if compliance.is_compliant:
+            app_logger.info(f"   Compliance: {compliance.compliance_score:.0f}%")
+        else:
+            app_logger.warning(
+                f"    Compliance: {compliance.compliance_score:.0f}% "
+                f"({len(compliance.failed_checks)} issues)"
+            )
+        
+        return compliance
     
-    def _translate_message(self, brief):
-        """Translate campaign message."""
-        if brief.language.lower() == 'en':
-            return brief.campaign_message
+    def _check_compliance(self, image, message, aspect_ratio, product_name, asset_key):
+        """Validate an asset, reusing the result for previously checked assets."""
+        compliance_key = None
+        if self.build_cache and asset_key:
+            compliance_key = self.build_cache.make_key(
+                kind="compliance",
+                asset=asset_key,
+                guidelines=self.guidelines.model_dump()
+            )
+            cached = self.build_cache.get_value(compliance_key)
+            if cached is not None:
+                return ComplianceResult(**cached)
         
-        if not self.translator.is_available():
-            app_logger.warning("    Translation unavailable")
-            return brief.campaign_message
+        # Reused assets are only on disk; load them for validation
+        if isinstance(image, Path):
+            with Image.open(image) as saved:
+                image = saved.convert('RGB')
         
-        return self.translator.translate_campaign_message(
-            brief.campaign_message, brief.language
+        compliance = self.compliance_checker.validate_asset(
+            image,
+            text_content=message,
+            asset_metadata={
+                'aspect_ratio': aspect_ratio,
+                'product': product_name
+            }
         )
+        
+        if compliance_key:
+            self.build_cache.put_value(compliance_key, compliance.model_dump())
+        
+        return compliance
+    
+    def _save_reports(self, state: RunState):
+        """Save the compliance report."""
+        if state.compliance_results and state.enable_compliance:
+            self._save_compliance_report(state.campaign_dir, state.compliance_results)
     
     def _save_compliance_report(self, campaign_dir: Path, results: list):
         """Save compliance report."""
@@ -255,8 +243,11 @@ class EnhancedCampaignPipeline:
         except Exception as e:
             app_logger.error(f"Failed to save compliance report: {e}")
     
-    def _print_summary(self, output, compliance_results=None):
+    def _print_summary(self, state: RunState):
         """Print pipeline summary."""
+        output = state.output
+        compliance_results = state.compliance_results if state.enable_compliance else None
+        
         app_logger.info("\n" + "=" * 70)
         app_logger.info("📊 PIPELINE SUMMARY")
         app_logger.info("=" * 70)
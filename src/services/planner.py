@@ -0,0 +1,246 @@
+"""
+Planner Service
+Dry-run expansion of a campaign brief.
+
+The planner walks the product x aspect ratio matrix of a brief the way a run
+would, without generating, translating or rendering anything. It checks every
+referenced asset, the overlay font and the fit of the overlay text in every
+aspect ratio (from font metrics only) in parallel, counts the API calls and
+build-cache hits the run would see, and estimates wall time from the stage
+cost model and API spend from configured prices. Runs can use it as a
+preflight check so a brief with a missing asset fails before any work starts.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Optional
+from PIL import Image
+from src.config import settings
+from src.models.campaign import CampaignBrief, Product
+from src.models.plan import CampaignPlan, ProductPlan
+from src.services.cost_model import DEFAULT_CELL_SECONDS
+from src.utils.logger import app_logger
+
+# Asset and font checks run concurrently; they are mostly filesystem stats
+PLAN_WORKERS = 8
+
+
+class CampaignPlanner:
+    """Plans pipeline runs without executing them."""
+
+    def __init__(self, pipeline):
+        """
+        Initialize CampaignPlanner.
+
+        Args:
+            pipeline: CampaignPipeline whose services, cache and cost model are consulted
+        """
+        self.pipeline = pipeline
+
+    def plan(self, brief: CampaignBrief, resize_quality: Optional[str] = None) -> CampaignPlan:
+        """
+        Plan a run of a brief.
+
+        Args:
+            brief: Parsed campaign brief
+            resize_quality: Resize quality tier (uses settings default if None)
+
+        Returns:
+            CampaignPlan with checks, counts and estimates
+        """
+        plan = CampaignPlan(
+            campaign_id=brief.campaign_id,
+            campaign_name=brief.campaign_name,
+            language=brief.language,
+            aspect_ratios=brief.aspect_ratios,
+            total_assets=len(brief.products) * len(brief.aspect_ratios),
+        )
+        message = self._plan_translation(brief, plan)
+        resize_quality = self.pipeline.image_processor.resize_quality(resize_quality)
+
+        with ThreadPoolExecutor(max_workers=PLAN_WORKERS, thread_name_prefix="plan") as pool:
+            font = pool.submit(self._check_font, brief.language)
+            layouts = (
+                [
+                    pool.submit(self._check_layout, message, aspect_ratio)
+                    for aspect_ratio in brief.aspect_ratios
+                ]
+                if message is not None
+                else []
+            )
+            products = [
+                pool.submit(
+                    self._plan_product, product, brief.aspect_ratios, message, resize_quality
+                )
+                for product in brief.products
+            ]
+            plan.font_path, font_problem = font.result()
+            if font_problem:
+                plan.problems.append(font_problem)
+            for future in layouts:
+                layout_problem = future.result()
+                if layout_problem:
+                    plan.problems.append(layout_problem)
+            for future in products:
+                product_plan, problem = future.result()
+                plan.products.append(product_plan)
+                if problem:
+                    plan.problems.append(problem)
+
+        for product_plan in plan.products:
+            plan.cached_assets += product_plan.cached_assets
+            if product_plan.source == "generate":
+                plan.image_generations += 1
+            elif product_plan.source == "cached_generation":
+                plan.cached_generations += 1
+
+        if plan.image_generations and not self.pipeline.image_generator.is_available():
+            plan.problems.append(
+                f"{plan.image_generations} products need image generation but no API key is set"
+            )
+
+        plan.estimated_seconds = round(
+            self._estimate_seconds(plan.total_assets - plan.cached_assets), 1
+        )
+        plan.estimated_cost_usd = round(
+            plan.image_generations * settings.dalle_image_cost_usd
+            + plan.translations * settings.translation_cost_usd,
+            4,
+        )
+
+        app_logger.info(
+            f"Planned {brief.campaign_id}: {plan.total_assets} assets "
+            f"({plan.cached_assets} cached), {plan.image_generations} generations, "
+            f"~{plan.estimated_seconds:.0f}s, ~${plan.estimated_cost_usd:.2f}, "
+            f"{len(plan.problems)} problems"
+        )
+        return plan
+
+    def _plan_translation(self, brief: CampaignBrief, plan: CampaignPlan) -> Optional[str]:
+        """Count the translation call and return the overlay text if it is known."""
+        if brief.language.lower() == "en":
+            return brief.campaign_message
+
+        build_cache = self.pipeline.build_cache
+        if build_cache:
+            cached = build_cache.get_value(
+                build_cache.make_key(
+                    kind="translation",
+                    text=brief.campaign_message,
+                    language=brief.language,
+                    model=settings.translation_model,
+                )
+            )
+            if cached is not None:
+                plan.cached_translations = 1
+                return cached
+
+        if not self.pipeline.translator.is_available():
+            plan.warnings.append(
+                f"Translation to '{brief.language}' unavailable; the English message would be used"
+            )
+            return brief.campaign_message
+
+        plan.translations = 1
+        plan.warnings.append(
+            f"Text layout of the '{brief.language}' message is checked once it is translated"
+        )
+        return None
+
+    def _check_font(self, language: str) -> tuple[Optional[str], Optional[str]]:
+        """Resolve the overlay font of a language."""
+        try:
+            return str(self.pipeline.image_processor.get_font_path(language)), None
+        except FileNotFoundError:
+            return None, f"No font found for language '{language}'"
+
+    def _check_layout(self, message: str, aspect_ratio: str) -> Optional[str]:
+        """Check that the overlay text fits an aspect ratio, using font metrics only."""
+        try:
+            return self.pipeline.image_processor.check_layout(
+                message, aspect_ratio, base_size=settings.max_image_size
+            )
+        except FileNotFoundError:
+            # Reported by the font check
+            return None
+
+    def _plan_product(
+        self,
+        product: Product,
+        aspect_ratios: list[str],
+        message: Optional[str],
+        resize_quality: str,
+    ) -> tuple[ProductPlan, Optional[str]]:
+        """Decide where a product's image comes from and which of its assets are cached."""
+        pipeline = self.pipeline
+        product_plan = ProductPlan(
+            product_id=product.product_id, product_name=product.product_name, source="missing"
+        )
+        problem = None
+
+        source_path = None
+        if product.existing_image:
+            source_path = pipeline.asset_manager.get_asset_path(product.existing_image)
+            if source_path:
+                try:
+                    # Opening reads only the header, enough to reject non-images
+                    with Image.open(source_path):
+                        pass
+                    product_plan.source = "existing"
+                except Exception as e:
+                    problem = (
+                        f"Unreadable image for {product.product_name}: "
+                        f"{product.existing_image} ({e})"
+                    )
+                    source_path = None
+            elif not product.needs_generation():
+                problem = f"Missing image for {product.product_name}: {product.existing_image}"
+
+        if product_plan.source == "missing" and not problem and product.needs_generation():
+            generation_key = pipeline._generation_key(product)
+            cached = pipeline.build_cache.get_object(generation_key) if generation_key else None
+            if cached:
+                product_plan.source = "cached_generation"
+                source_path = cached
+            else:
+                product_plan.source = "generate"
+
+        if source_path:
+            product_plan.path = str(source_path)
+            if message is not None and pipeline.build_cache:
+                digest = pipeline.build_cache.file_digest(Path(source_path))
+                source_size = pipeline.asset_manager.decoded_size(
+                    Path(source_path), pipeline._decode_size(aspect_ratios, resize_quality)
+                )
+                for aspect_ratio in aspect_ratios:
+                    try:
+                        key = pipeline._asset_key(
+                            digest, message, aspect_ratio, source_size, resize_quality
+                        )
+                    except FileNotFoundError:
+                        break
+                    if key and pipeline.build_cache.get_object(key):
+                        product_plan.cached_assets += 1
+
+        return product_plan, problem
+
+    def _estimate_seconds(self, cells: int) -> float:
+        """
+        Estimate the wall time of rendering cells.
+
+        Each resource class works through its stages' per-asset costs in
+        parallel up to its worker limit; the busiest class bounds the run.
+        """
+        if cells <= 0:
+            return 0.0
+
+        graph = self.pipeline.graph
+        busy: dict = {}
+        for name, stage in graph.stages.items():
+            seconds = self.pipeline.cost_model.stage_seconds(name)
+            if seconds is not None:
+                busy[stage.resource] = busy.get(stage.resource, 0.0) + seconds * cells
+
+        if not busy:
+            return cells * DEFAULT_CELL_SECONDS / max(1, sum(graph.limits.values()))
+        return max(total / max(1, graph.limits[resource]) for resource, total in busy.items())
@@ -0,0 +1,205 @@
+"""
+Progress Reporting Service
+Structured progress events emitted by the pipelines while a run is in flight.
+
+Consumers either pass an ``on_event`` callback to ``pipeline.run`` or iterate
+over ``pipeline.iter_run(...)``, which runs the pipeline in a background
+thread and yields events as they happen.
+"""
+
+import queue
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Callable, Iterator, Optional
+from pydantic import BaseModel, Field
+from src.utils.logger import app_logger
+
+EventCallback = Callable[["ProgressEvent"], None]
+
+
+class ProgressEvent(BaseModel):
+    """A single progress update from a pipeline run."""
+
+    kind: str = Field(
+        ...,
+        description=(
+            "run_started, stage_started, stage_finished, asset_rendered, error, "
+            "run_cancelled or run_finished"
+        ),
+    )
+    run_id: Optional[str] = None
+    stage: Optional[str] = None
+    product_id: Optional[str] = None
+    product_name: Optional[str] = None
+    aspect_ratio: Optional[str] = None
+    language: Optional[str] = None
+    filepath: Optional[str] = Field(None, description="Absolute path of a rendered asset")
+    reused: bool = Field(default=False, description="Asset was reused from the build cache")
+    message: Optional[str] = None
+    completed: int = 0
+    total: int = 0
+    elapsed_seconds: float = 0.0
+    eta_seconds: Optional[float] = None
+    timestamp: str = Field(default_factory=lambda: datetime.now().isoformat())
+
+    @property
+    def progress(self) -> float:
+        """Fraction of assets completed (0.0 - 1.0)."""
+        if self.total <= 0:
+            return 1.0 if self.kind == "run_finished" else 0.0
+        return min(1.0, self.completed / self.total)
+
+
+class ProgressTracker:
+    """Counts completed assets, estimates time remaining and emits events."""
+
+    def __init__(self, callback: Optional[EventCallback] = None):
+        """
+        Initialize ProgressTracker.
+
+        Args:
+            callback: Function receiving every ProgressEvent (optional)
+        """
+        self.callback = callback
+        self.run_id: Optional[str] = None
+        self.total = 0
+        self.completed = 0
+        self._started = time.perf_counter()
+        # Events are built and delivered under the lock so consumers see
+        # them in order even when stages finish on several threads
+        self._lock = threading.RLock()
+
+    def start(self, run_id: str, total: int):
+        """Emit the start of a run with the number of assets to produce."""
+        with self._lock:
+            self.run_id = run_id
+            self.total = total
+            self.completed = 0
+            self._started = time.perf_counter()
+        self.emit("run_started")
+
+    def emit(self, kind: str, **fields: Any) -> Optional[ProgressEvent]:
+        """
+        Build and deliver an event.
+
+        Callback errors are logged and never interrupt the run.
+
+        Args:
+            kind: Event kind
+            **fields: Event fields (product, ratio, message, ...)
+
+        Returns:
+            The emitted event, or None if nobody is listening
+        """
+        if self.callback is None:
+            return None
+
+        with self._lock:
+            elapsed = time.perf_counter() - self._started
+            eta = None
+            if 0 < self.completed < self.total:
+                eta = elapsed / self.completed * (self.total - self.completed)
+            elif self.total and self.completed >= self.total:
+                eta = 0.0
+
+            event = ProgressEvent(
+                kind=kind,
+                run_id=self.run_id,
+                completed=self.completed,
+                total=self.total,
+                elapsed_seconds=round(elapsed, 3),
+                eta_seconds=round(eta, 3) if eta is not None else None,
+                **fields,
+            )
+
+            try:
+                self.callback(event)
+            except Exception as e:
+                app_logger.warning(f"Progress callback failed: {e}")
+        return event
+
+    @contextmanager
+    def stage(self, name: str, **fields: Any):
+        """Emit stage_started and stage_finished around a block."""
+        self.emit("stage_started", stage=name, **fields)
+        try:
+            yield
+        finally:
+            self.emit("stage_finished", stage=name, **fields)
+
+    def asset_done(self, **fields: Any):
+        """Count a finished asset and emit asset_rendered."""
+        with self._lock:
+            self.completed += 1
+            self.emit("asset_rendered", **fields)
+
+    def error(self, message: str, **fields: Any):
+        """Emit an error event."""
+        self.emit("error", message=message, **fields)
+
+    def cancelled(self, reason: str):
+        """Emit the end of a cancelled run."""
+        self.emit("run_cancelled", message=reason)
+
+    def finish(self, **fields: Any):
+        """Emit the end of a run."""
+        self.emit("run_finished", **fields)
+
+
+class EventStream:
+    """Runs a pipeline call in a background thread and yields its events."""
+
+    _DONE = object()
+
+    def __init__(self, target: Callable[..., Any], *args: Any, **kwargs: Any):
+        """
+        Initialize EventStream.
+
+        Args:
+            target: Pipeline method accepting an ``on_event`` keyword
+            *args: Positional arguments for target
+            **kwargs: Keyword arguments for target; a ``token`` is kept so
+                the run can be stopped with ``cancel()``
+        """
+        self.result: Any = None
+        self.token = kwargs.get("token")
+        self._target = target
+        self._args = args
+        self._kwargs = kwargs
+        self._queue: queue.Queue = queue.Queue()
+        self._error: Optional[BaseException] = None
+
+    def _run(self):
+        try:
+            self.result = self._target(*self._args, on_event=self._queue.put, **self._kwargs)
+        except BaseException as e:
+            self._error = e
+        finally:
+            self._queue.put(self._DONE)
+
+    def cancel(self, reason: str = "Cancelled by user"):
+        """Ask the run to stop; iteration ends once it has."""
+        if self.token is not None:
+            self.token.cancel(reason)
+
+    def __iter__(self) -> Iterator[ProgressEvent]:
+        """
+        Yield events until the run ends.
+
+        The pipeline's return value is available as ``result`` afterwards;
+        an exception raised by the run is re-raised here.
+        """
+        thread = threading.Thread(target=self._run, name="pipeline-run", daemon=True)
+        thread.start()
+
+        while True:
+            event = self._queue.get()
+            if event is self._DONE:
+                break
+            yield event
+
+        thread.join()
+        if self._error is not None:
+            raise self._error
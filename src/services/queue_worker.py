@@ -0,0 +1,232 @@
+"""
+Queue Worker Service
+Leases asset jobs from the JobQueue and renders them.
+
+Any number of workers, on one host or many, may share a queue as long as they
+also share the output directory. Each worker keeps one warm pipeline per
+pipeline variant, renders a single cell per job through
+CampaignPipeline.render_cells, and the first worker to find a run with no
+jobs left writes its metadata.
+
+A job that stops making progress for WATCHDOG_STALL_SECONDS, or whose lease
+was lost to another worker, is cancelled so the worker moves on. Failures
+are classified like in a local run: transient ones are retried with backoff,
+permanent ones (a missing asset, a bad brief) fail the job right away.
+
+Sibling jobs of a product whose image must be generated take a queue-wide
+lock first, so the image is generated once and the others reuse it.
+"""
+
+import os
+import socket
+import threading
+import time
+import uuid
+from typing import Optional
+from src.config import settings
+from src.models.job import Job, QueuedRun
+from src.services.job_queue import JobQueue
+from src.services.retry import is_transient
+from src.services.run_manifest import RunManifest
+from src.utils.cancellation import CancellationToken, RunCancelled, Watchdog
+from src.utils.logger import app_logger
+
+
+class _Heartbeat:
+    """Keeps a job's lease alive from a background thread while it renders."""
+
+    def __init__(self, queue: JobQueue, job: Job, worker_id: str, token: CancellationToken):
+        self.queue = queue
+        self.job = job
+        self.worker_id = worker_id
+        self.token = token
+        self.lock: Optional[str] = None
+        self.lost = False
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._beat, daemon=True)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        return False
+
+    def _beat(self):
+        interval = max(0.1, self.queue.lease_seconds / 3)
+        try:
+            while not self._stop.wait(interval):
+                if not self.queue.heartbeat(self.job.id, self.worker_id):
+                    self.lost = True
+                    app_logger.warning(f"Lost lease on job {self.job.id}")
+                    self.token.cancel("Lost lease")
+                    return
+                lock = self.lock
+                if lock and not self.queue.acquire_lock(lock, self.worker_id):
+                    app_logger.warning(f"Lost lock {lock} of job {self.job.id}")
+        finally:
+            self.queue.close()
+
+
+class QueueWorker:
+    """Processes jobs from a JobQueue."""
+
+    def __init__(
+        self,
+        queue: Optional[JobQueue] = None,
+        worker_id: Optional[str] = None,
+        poll_seconds: Optional[float] = None,
+    ):
+        """
+        Initialize QueueWorker.
+
+        Args:
+            queue: Job queue to work on (defaults to the configured one)
+            worker_id: Identifier recorded on leases (defaults to host:pid:random)
+            poll_seconds: Wait between polls of an empty queue
+        """
+        self.queue = queue or JobQueue()
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+        self.poll_seconds = (
+            poll_seconds if poll_seconds is not None else settings.worker_poll_seconds
+        )
+        self._pipelines = {}
+        self._watchdog = Watchdog(settings.watchdog_stall_seconds)
+
+    def run(self, max_jobs: Optional[int] = None, drain: bool = False) -> int:
+        """
+        Process jobs until stopped.
+
+        Args:
+            max_jobs: Stop after this many jobs (optional)
+            drain: Stop once no job is available instead of polling
+
+        Returns:
+            Number of jobs processed
+        """
+        app_logger.info(f"👷 Worker {self.worker_id} started on {self.queue.db_path}")
+        processed = 0
+        while max_jobs is None or processed < max_jobs:
+            if self.process_one():
+                processed += 1
+            elif drain:
+                break
+            else:
+                time.sleep(self.poll_seconds)
+
+        app_logger.info(f"👷 Worker {self.worker_id} stopped after {processed} jobs")
+        return processed
+
+    def process_one(self) -> bool:
+        """
+        Lease and render one job.
+
+        Returns:
+            True if a job was processed, False if none was available
+        """
+        job = self.queue.lease(self.worker_id)
+        if job is None:
+            self._finalize_idle_runs()
+            return False
+
+        run = self.queue.get_run(job.run_id)
+        app_logger.info(
+            f"Job {job.id}: {job.product_id} {job.aspect_ratio} of {job.run_id} "
+            f"(attempt {job.attempts}/{job.max_attempts})"
+        )
+
+        error = None
+        transient = True
+        result_path = None
+        token = CancellationToken()
+        with (
+            _Heartbeat(self.queue, job, self.worker_id, token) as heartbeat,
+            self._watchdog.watch(token, f"job {job.id}") as watch,
+        ):
+            try:
+                heartbeat.lock = self._lock_source(run, job, token, watch)
+                output = self._pipeline(run).render_cells(
+                    job.run_id, [job.cell], on_event=lambda event: watch.touch(), token=token
+                )
+                if output.has_errors():
+                    error = "; ".join(output.errors)
+                    transient = self._failed_transiently(run, job)
+                elif output.generated_assets:
+                    result_path = output.generated_assets[0]["filepath"]
+            except Exception as e:
+                error = f"{type(e).__name__}: {e}"
+                # Stalled jobs and lost leases are worth another attempt
+                transient = isinstance(e, RunCancelled) or is_transient(e)
+            finally:
+                if heartbeat.lock:
+                    self.queue.release_lock(heartbeat.lock, self.worker_id)
+                    heartbeat.lock = None
+
+        if error:
+            status = self.queue.fail(job.id, self.worker_id, error, transient=transient)
+            kind = "transient" if transient else "permanent"
+            app_logger.warning(f"Job {job.id} failed ({kind}, {status}): {error}")
+        else:
+            self.queue.complete(job.id, self.worker_id, result_path)
+
+        self._finalize_idle_runs()
+        return True
+
+    def _lock_source(
+        self, run: QueuedRun, job: Job, token: CancellationToken, watch
+    ) -> Optional[str]:
+        """
+        Wait for the lock on generating the job's product image, if it needs one.
+
+        Returns:
+            Name of the lock now held, or None if no generation is needed
+        """
+        lock = self._pipeline(run).source_lock_key(job.run_id, job.product_id)
+        if lock is None:
+            return None
+
+        while not self.queue.acquire_lock(lock, self.worker_id):
+            # A sibling job is generating the image; waiting is progress too
+            watch.touch()
+            token.wait(self.poll_seconds)
+            token.raise_if_cancelled()
+        return lock
+
+    def _failed_transiently(self, run: QueuedRun, job: Job) -> bool:
+        """Check if the run manifest records the job's cell as failed by a transient error."""
+        campaign_dir = self._pipeline(run).output_manager.base_output_dir / job.run_id
+        cell = (job.product_id, job.aspect_ratio, job.language)
+        record = RunManifest.load(campaign_dir).failed_cells().get(cell)
+        return record is None or bool(record.get("transient"))
+
+    def _pipeline(self, run: QueuedRun):
+        """Get the warm pipeline rendering a run's jobs."""
+        key = (run.pipeline, run.guidelines)
+        if key not in self._pipelines:
+            if run.pipeline == "enhanced":
+                from src.services.pipeline_enhanced import EnhancedCampaignPipeline
+
+                self._pipelines[key] = EnhancedCampaignPipeline(guidelines_path=run.guidelines)
+            else:
+                from src.services.pipeline import CampaignPipeline
+
+                self._pipelines[key] = CampaignPipeline()
+        return self._pipelines[key]
+
+    def _finalize_idle_runs(self):
+        """Finish every run with no jobs left, whichever worker handled its last job."""
+        for run in self.queue.idle_runs():
+            self._finalize(run)
+
+    def _finalize(self, run: QueuedRun):
+        """Write a run's metadata if its last job just finished."""
+        if not self.queue.claim_finalization(run.run_id):
+            return
+
+        errors = self.queue.run_errors(run.run_id)
+        try:
+            self._pipeline(run).finalize(run.run_id, errors=errors)
+        except Exception as e:
+            app_logger.error(f"Failed to finalize {run.run_id}: {e}")
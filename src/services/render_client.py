@@ -0,0 +1,129 @@
+"""
+Render Client
+Thin client for the render service's JSON API.
+"""
+
+import json
+import urllib.error
+import urllib.request
+from pathlib import Path
+from typing import Iterator, Optional
+from src.config import settings
+from src.models.campaign import CampaignOutput
+from src.models.job import RenderJob
+from src.services.progress import ProgressEvent
+
+
+class RenderClient:
+    """Submits briefs to a running render service and follows their jobs."""
+
+    def __init__(self, base_url: Optional[str] = None, timeout: float = 30.0):
+        """
+        Initialize RenderClient.
+
+        Args:
+            base_url: Service URL (defaults to RENDER_SERVICE_URL, then the local default)
+            timeout: Seconds to wait for a response (event streams wait indefinitely)
+        """
+        self.base_url = (
+            base_url
+            or settings.render_service_url
+            or f"http://{settings.render_service_host}:{settings.render_service_port}"
+        ).rstrip("/")
+        self.timeout = timeout
+
+    def _request(self, method: str, path: str, payload: Optional[dict] = None) -> dict:
+        """Send a request and decode its JSON response."""
+        data = json.dumps(payload).encode("utf-8") if payload is not None else None
+        request = urllib.request.Request(
+            self.base_url + path,
+            data=data,
+            method=method,
+            headers={"Content-Type": "application/json"},
+        )
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                return json.loads(response.read())
+        except urllib.error.HTTPError as e:
+            try:
+                message = json.loads(e.read()).get("error", e.reason)
+            except ValueError:
+                message = e.reason
+            raise RuntimeError(f"Render service error ({e.code}): {message}") from e
+
+    def is_available(self) -> bool:
+        """Check if the service answers."""
+        try:
+            return self._request("GET", "/health").get("status") == "ok"
+        except (OSError, RuntimeError):
+            return False
+
+    def submit(
+        self,
+        brief_path: Optional[Path] = None,
+        brief: Optional[dict] = None,
+        guidelines: Optional[Path] = None,
+        enable_compliance: bool = True,
+        resize_quality: Optional[str] = None,
+    ) -> RenderJob:
+        """
+        Submit a brief.
+
+        Args:
+            brief_path: Brief file; the service must be able to read it
+            brief: Brief content, for services on another machine
+            guidelines: Brand guidelines JSON; selects the enhanced pipeline
+            enable_compliance: Whether the enhanced pipeline checks compliance
+            resize_quality: Resize quality tier (uses the service's default if None)
+
+        Returns:
+            The queued job
+        """
+        payload = {"enable_compliance": enable_compliance}
+        if brief_path is not None:
+            payload["brief_path"] = str(Path(brief_path).resolve())
+        if brief is not None:
+            payload["brief"] = brief
+        if guidelines is not None:
+            payload["guidelines"] = str(Path(guidelines).resolve())
+        if resize_quality is not None:
+            payload["resize_quality"] = resize_quality
+        return RenderJob(**self._request("POST", "/jobs", payload))
+
+    def job(self, job_id: str) -> RenderJob:
+        """Get the status of a job."""
+        return RenderJob(**self._request("GET", f"/jobs/{job_id}"))
+
+    def metrics(self) -> dict:
+        """Get the service's generation load (queue depth and shed counts)."""
+        return self._request("GET", "/metrics")["admission"]
+
+    def cancel(self, job_id: str) -> RenderJob:
+        """Ask the service to cancel a job."""
+        return RenderJob(**self._request("DELETE", f"/jobs/{job_id}"))
+
+    def events(self, job_id: str) -> Iterator[ProgressEvent]:
+        """
+        Follow a job's progress events until it finishes.
+
+        Args:
+            job_id: Job to follow
+
+        Yields:
+            ProgressEvents as the run advances
+        """
+        with urllib.request.urlopen(f"{self.base_url}/jobs/{job_id}/events") as response:
+            for line in response:
+                if line.strip():
+                    yield ProgressEvent(**json.loads(line))
+
+    def wait(self, job_id: str) -> RenderJob:
+        """Block until a job finishes and return its final status."""
+        for _ in self.events(job_id):
+            pass
+        return self.job(job_id)
+
+    @staticmethod
+    def output(job: RenderJob) -> Optional[CampaignOutput]:
+        """Get the CampaignOutput of a succeeded job."""
+        return CampaignOutput(**job.output) if job.output else None
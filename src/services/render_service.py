@@ -0,0 +1,441 @@
+"""
+Render Service
+Long-running local service that owns warm pipelines and renders submitted briefs.
+
+Building a pipeline creates the OpenAI clients, scans the font directories and
+opens the build cache; a short-lived process pays for that on every run. The
+service keeps pipelines alive between jobs and exposes a small JSON API over
+HTTP so the Streamlit UI and the CLI can act as thin clients:
+
+    POST /jobs                 submit {"brief_path": ...} or {"brief": {...}}, optionally
+                               with "guidelines", "enable_compliance", "resize_quality"
+    GET  /jobs                 list jobs
+    GET  /jobs/<id>            job status (and CampaignOutput once finished)
+    GET  /jobs/<id>/events     progress events as newline-delimited JSON
+    DELETE /jobs/<id>          cancel a queued or running job
+    GET  /files/<path>         a file under the output directory
+    GET  /metrics              generation queue depth and shed counts
+    GET  /health               liveness check
+
+A watchdog cancels jobs that emit no progress for WATCHDOG_STALL_SECONDS, so
+a hung call cannot hold a render worker forever.
+"""
+
+import json
+import mimetypes
+import queue
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Iterator, Optional
+from urllib.parse import unquote, urlparse
+from src.config import settings
+from src.models.job import RenderJob
+from src.services.admission import get_controller
+from src.services.image_processor import ImageProcessor
+from src.services.progress import ProgressEvent
+from src.utils.cancellation import CancellationToken, RunCancelled, Watchdog
+from src.utils.logger import app_logger
+
+
+class _JobRecord:
+    """A job plus the events of its run."""
+
+    def __init__(self, job: RenderJob):
+        self.job = job
+        self.events: list[dict] = []
+        self.changed = threading.Condition()
+        self.token = CancellationToken()
+
+
+class RenderService:
+    """Runs submitted briefs on warm pipelines."""
+
+    def __init__(self, workers: Optional[int] = None, history: Optional[int] = None):
+        """
+        Initialize RenderService.
+
+        Args:
+            workers: Briefs rendered concurrently (defaults to config)
+            history: Finished jobs kept for status queries (defaults to config)
+        """
+        self.workers = workers or settings.render_service_workers
+        self.history = history or settings.render_service_history
+        self._jobs: dict[str, _JobRecord] = {}
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="render")
+        self._watchdog = Watchdog(settings.watchdog_stall_seconds)
+        # Idle pipelines per guidelines file; a pipeline serves one job at a time
+        self._pipelines: dict[Optional[str], queue.LifoQueue] = {}
+
+    def submit(
+        self,
+        brief_path: Optional[Path] = None,
+        brief: Optional[dict] = None,
+        guidelines: Optional[str] = None,
+        enable_compliance: bool = True,
+        resize_quality: Optional[str] = None,
+    ) -> RenderJob:
+        """
+        Queue a brief for rendering.
+
+        Args:
+            brief_path: Brief file readable by the service
+            brief: Brief content, written to the submitted briefs directory
+            guidelines: Brand guidelines JSON; selects the enhanced pipeline
+            enable_compliance: Whether the enhanced pipeline checks compliance
+            resize_quality: Resize quality tier (uses settings default if None)
+
+        Returns:
+            The queued job
+
+        Raises:
+            ValueError: If neither or both of brief_path and brief are given,
+                the brief file does not exist or the resize quality is unknown
+        """
+        if (brief_path is None) == (brief is None):
+            raise ValueError("Submit exactly one of brief_path or brief")
+        resize_quality = ImageProcessor.resize_quality(resize_quality)
+
+        job_id = uuid.uuid4().hex[:12]
+        if brief is not None:
+            brief_path = settings.input_briefs_dir / "submitted" / f"{job_id}.json"
+            brief_path.parent.mkdir(parents=True, exist_ok=True)
+            brief_path.write_text(json.dumps(brief, ensure_ascii=False), encoding="utf-8")
+        elif not Path(brief_path).is_file():
+            raise ValueError(f"Brief not found: {brief_path}")
+
+        job = RenderJob(
+            id=job_id,
+            brief_path=str(brief_path),
+            guidelines=str(guidelines) if guidelines else None,
+            enable_compliance=enable_compliance,
+            resize_quality=resize_quality,
+            created_at=time.time(),
+        )
+        record = _JobRecord(job)
+        with self._lock:
+            self._jobs[job_id] = record
+            self._prune()
+
+        self._executor.submit(self._run, record)
+        app_logger.info(f"📥 Job {job_id} queued: {brief_path}")
+        return job.model_copy()
+
+    def get(self, job_id: str) -> Optional[RenderJob]:
+        """Get a snapshot of a job."""
+        record = self._jobs.get(job_id)
+        if record is None:
+            return None
+        with record.changed:
+            return record.job.model_copy()
+
+    def list_jobs(self) -> list[RenderJob]:
+        """Get snapshots of all known jobs, newest first."""
+        with self._lock:
+            records = list(self._jobs.values())
+        jobs = []
+        for record in records:
+            with record.changed:
+                jobs.append(record.job.model_copy())
+        return sorted(jobs, key=lambda job: job.created_at, reverse=True)
+
+    def events(self, job_id: str, start: int = 0) -> Iterator[dict]:
+        """
+        Yield a job's progress events, waiting for new ones until it finishes.
+
+        Args:
+            job_id: Job to follow
+            start: Index of the first event to yield
+
+        Yields:
+            Progress events as JSON-compatible dictionaries
+        """
+        record = self._jobs.get(job_id)
+        if record is None:
+            return
+
+        index = start
+        while True:
+            with record.changed:
+                while index >= len(record.events) and not record.job.is_finished():
+                    record.changed.wait(timeout=1.0)
+                pending = record.events[index:]
+                finished = record.job.is_finished()
+            for event in pending:
+                yield event
+            index += len(pending)
+            if finished and index >= len(record.events):
+                return
+
+    def cancel(self, job_id: str) -> Optional[RenderJob]:
+        """
+        Cancel a job.
+
+        A queued job is cancelled right away; a running one stops within
+        about a second, keeping the assets it already saved.
+
+        Args:
+            job_id: Job to cancel
+
+        Returns:
+            Snapshot of the job, or None if it is unknown
+        """
+        record = self._jobs.get(job_id)
+        if record is None:
+            return None
+
+        with record.changed:
+            if record.job.status == "queued":
+                record.job.status = "cancelled"
+                record.job.error = "Cancelled by request"
+                record.job.finished_at = time.time()
+                record.changed.notify_all()
+        record.token.cancel("Cancelled by request")
+        app_logger.info(f"Job {job_id} cancellation requested")
+        return self.get(job_id)
+
+    def shutdown(self):
+        """Stop accepting work and wait for running jobs."""
+        self._executor.shutdown(wait=True)
+
+    def _run(self, record: _JobRecord):
+        """Render one job on a warm pipeline."""
+        job = record.job
+
+        def on_event(event):
+            watch.touch()
+            with record.changed:
+                record.events.append(event.model_dump(mode="json"))
+                job.run_id = event.run_id or job.run_id
+                job.completed = event.completed
+                job.total = event.total
+                record.changed.notify_all()
+
+        with record.changed:
+            if job.status == "cancelled":
+                return
+            job.status = "running"
+            record.changed.notify_all()
+
+        pipeline = None
+        try:
+            pipeline = self._checkout(job.guidelines)
+            with self._watchdog.watch(record.token, f"job {job.id}") as watch:
+                if job.guidelines:
+                    output = pipeline.run(
+                        Path(job.brief_path),
+                        enable_compliance=job.enable_compliance,
+                        on_event=on_event,
+                        token=record.token,
+                        resize_quality=job.resize_quality,
+                    )
+                else:
+                    output = pipeline.run(
+                        Path(job.brief_path),
+                        on_event=on_event,
+                        token=record.token,
+                        resize_quality=job.resize_quality,
+                    )
+            status, error, result = "succeeded", None, output.model_dump(mode="json")
+        except RunCancelled as e:
+            app_logger.warning(f"Job {job.id} cancelled: {e}")
+            status, error, result = "cancelled", str(e), None
+        except Exception as e:
+            app_logger.error(f"Job {job.id} failed: {e}")
+            status, error, result = "failed", str(e), None
+            if pipeline is None:
+                # The run never started, so no pipeline event reports the failure
+                with record.changed:
+                    record.events.append(
+                        ProgressEvent(
+                            kind="error", stage="setup", message=f"Could not start pipeline: {e}"
+                        ).model_dump(mode="json")
+                    )
+        finally:
+            if pipeline is not None:
+                self._checkin(job.guidelines, pipeline)
+
+        with record.changed:
+            job.status = status
+            job.error = error
+            job.output = result
+            job.finished_at = time.time()
+            record.changed.notify_all()
+        app_logger.info(f"Job {job.id} {status}")
+
+    def _checkout(self, guidelines: Optional[str]):
+        """Take an idle pipeline for the guidelines, building one if none is idle."""
+        with self._lock:
+            idle = self._pipelines.setdefault(guidelines, queue.LifoQueue())
+        try:
+            return idle.get_nowait()
+        except queue.Empty:
+            pass
+
+        if guidelines:
+            from src.services.pipeline_enhanced import EnhancedCampaignPipeline
+
+            return EnhancedCampaignPipeline(guidelines_path=guidelines)
+        from src.services.pipeline import CampaignPipeline
+
+        return CampaignPipeline()
+
+    def _checkin(self, guidelines: Optional[str], pipeline):
+        """Return a pipeline to the idle pool."""
+        self._pipelines[guidelines].put(pipeline)
+
+    def _prune(self):
+        """Forget the oldest finished jobs beyond the history limit."""
+        finished = [r for r in self._jobs.values() if r.job.is_finished()]
+        excess = len(finished) - self.history
+        if excess > 0:
+            for record in sorted(finished, key=lambda r: r.job.created_at)[:excess]:
+                del self._jobs[record.job.id]
+
+
+class _RequestHandler(BaseHTTPRequestHandler):
+    """Maps the JSON API onto a RenderService."""
+
+    server: "RenderServer"
+
+    def log_message(self, format, *args):
+        app_logger.debug(f"{self.address_string()} {format % args}")
+
+    def _send_json(self, status: HTTPStatus, data):
+        body = json.dumps(data, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_error(self, status: HTTPStatus, message: str):
+        self._send_json(status, {"error": message})
+
+    def do_GET(self):
+        service = self.server.service
+        parts = [unquote(p) for p in urlparse(self.path).path.strip("/").split("/") if p]
+
+        if parts == ["health"]:
+            self._send_json(HTTPStatus.OK, {"status": "ok", "workers": service.workers})
+        elif parts == ["metrics"]:
+            self._send_json(HTTPStatus.OK, {"admission": get_controller().metrics()})
+        elif parts == ["jobs"]:
+            self._send_json(HTTPStatus.OK, {"jobs": [j.model_dump() for j in service.list_jobs()]})
+        elif len(parts) == 2 and parts[0] == "jobs":
+            job = service.get(parts[1])
+            if job is None:
+                self._send_error(HTTPStatus.NOT_FOUND, f"Unknown job {parts[1]}")
+            else:
+                self._send_json(HTTPStatus.OK, job.model_dump())
+        elif len(parts) == 3 and parts[0] == "jobs" and parts[2] == "events":
+            self._stream_events(parts[1])
+        elif len(parts) >= 2 and parts[0] == "files":
+            self._send_file(Path(*parts[1:]))
+        else:
+            self._send_error(HTTPStatus.NOT_FOUND, f"No route for {self.path}")
+
+    def do_POST(self):
+        if urlparse(self.path).path.rstrip("/") != "/jobs":
+            self._send_error(HTTPStatus.NOT_FOUND, f"No route for {self.path}")
+            return
+
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            request = json.loads(self.rfile.read(length) or b"{}")
+            job = self.server.service.submit(
+                brief_path=request.get("brief_path"),
+                brief=request.get("brief"),
+                guidelines=request.get("guidelines"),
+                enable_compliance=request.get("enable_compliance", True),
+                resize_quality=request.get("resize_quality"),
+            )
+        except (ValueError, AttributeError) as e:
+            self._send_error(HTTPStatus.BAD_REQUEST, str(e))
+            return
+
+        self._send_json(HTTPStatus.ACCEPTED, job.model_dump())
+
+    def do_DELETE(self):
+        parts = [unquote(p) for p in urlparse(self.path).path.strip("/").split("/") if p]
+        if len(parts) != 2 or parts[0] != "jobs":
+            self._send_error(HTTPStatus.NOT_FOUND, f"No route for {self.path}")
+            return
+
+        job = self.server.service.cancel(parts[1])
+        if job is None:
+            self._send_error(HTTPStatus.NOT_FOUND, f"Unknown job {parts[1]}")
+        else:
+            self._send_json(HTTPStatus.ACCEPTED, job.model_dump())
+
+    def _stream_events(self, job_id: str):
+        """Send events as NDJSON until the job finishes; the body ends with the connection."""
+        service = self.server.service
+        if service.get(job_id) is None:
+            self._send_error(HTTPStatus.NOT_FOUND, f"Unknown job {job_id}")
+            return
+
+        self.send_response(HTTPStatus.OK)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.send_header("Cache-Control", "no-cache")
+        self.end_headers()
+        try:
+            for event in service.events(job_id):
+                self.wfile.write((json.dumps(event, ensure_ascii=False) + "\n").encode("utf-8"))
+                self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            app_logger.debug(f"Event client of job {job_id} disconnected")
+
+    def _send_file(self, relative: Path):
+        """Send a file from the output directory."""
+        base = settings.output_base_dir.resolve()
+        path = (base / relative).resolve()
+        if base not in path.parents or not path.is_file():
+            self._send_error(HTTPStatus.NOT_FOUND, f"No file {relative}")
+            return
+
+        data = path.read_bytes()
+        self.send_response(HTTPStatus.OK)
+        self.send_header(
+            "Content-Type", mimetypes.guess_type(path.name)[0] or "application/octet-stream"
+        )
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+class RenderServer(ThreadingHTTPServer):
+    """HTTP server exposing a RenderService."""
+
+    daemon_threads = True
+
+    def __init__(
+        self, service: RenderService, host: Optional[str] = None, port: Optional[int] = None
+    ):
+        """
+        Initialize RenderServer and bind its socket.
+
+        Args:
+            service: Service handling the jobs
+            host: Interface to listen on (defaults to config)
+            port: Port to listen on, 0 for any free port (defaults to config)
+        """
+        self.service = service
+        super().__init__(
+            (
+                host or settings.render_service_host,
+                settings.render_service_port if port is None else port,
+            ),
+            _RequestHandler,
+        )
+
+    @property
+    def url(self) -> str:
+        """Base URL clients should use."""
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
@@ -0,0 +1,88 @@
+"""
+Retry Service
+Classifies stage failures so transient ones can be re-run.
+
+Timeouts, dropped connections, rate limits (HTTP 429) and server errors
+(HTTP 5xx) usually succeed when tried again a little later; a missing file
+or a rejected prompt does not. Services raise TransientError for the first
+kind, and the pipeline queues the affected cells for another attempt with
+exponential backoff instead of dropping them.
+"""
+
+from typing import NamedTuple, Optional
+
+# Exception class names raised by the OpenAI and requests clients for
+# retryable conditions; matched by name so neither package is imported here
+TRANSIENT_ERROR_NAMES = {
+    "RateLimitError",
+    "APITimeoutError",
+    "APIConnectionError",
+    "InternalServerError",
+    "Timeout",
+    "ReadTimeout",
+    "ConnectTimeout",
+    "ConnectionError",
+}
+
+MAX_BACKOFF_SECONDS = 60.0
+
+
+class TransientError(Exception):
+    """A failure that is likely to succeed if retried later."""
+
+
+class CellFailure(NamedTuple):
+    """A failed stage task and the cells it took down."""
+
+    stage: str
+    scope: dict
+    cells: list[dict]
+    error_type: str
+    message: str
+    transient: bool
+
+
+def is_transient(error: BaseException) -> bool:
+    """
+    Check if an error is worth retrying.
+
+    The error and the exceptions it was raised from are inspected.
+
+    Args:
+        error: Exception raised by a stage or service
+
+    Returns:
+        True for timeouts, connection errors, rate limits and 5xx responses
+    """
+    seen = set()
+    current: Optional[BaseException] = error
+    while current is not None and id(current) not in seen:
+        seen.add(id(current))
+
+        if isinstance(current, (TransientError, TimeoutError, ConnectionError)):
+            return True
+        if any(cls.__name__ in TRANSIENT_ERROR_NAMES for cls in type(current).__mro__):
+            return True
+
+        status = getattr(current, "status_code", None)
+        if status is None:
+            status = getattr(getattr(current, "response", None), "status_code", None)
+        if isinstance(status, int) and (status == 429 or 500 <= status < 600):
+            return True
+
+        current = current.__cause__ or current.__context__
+    return False
+
+
+def backoff_delay(attempt: int, base_seconds: float) -> float:
+    """
+    Get the wait before a retry round.
+
+    Args:
+        attempt: Retry round, starting at 1
+        base_seconds: Wait before the first round (doubles each round)
+
+    Returns:
+        Delay in seconds, capped at a minute
+    """
+    return min(MAX_BACKOFF_SECONDS, base_seconds * (2 ** max(0, attempt - 1)))
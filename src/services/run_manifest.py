@@ -0,0 +1,248 @@
+"""
+Run Manifest Service
+Write-ahead log of a campaign run, used to resume interrupted runs.
+
+The manifest is an append-only JSON Lines file in the campaign directory.
+Every completed asset is recorded (and fsynced) as soon as it is written,
+so a killed process loses at most the asset it was rendering.
+"""
+
+import json
+import os
+import shutil
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Optional
+from src.utils.logger import app_logger
+
+MANIFEST_FILENAME = "run_manifest.jsonl"
+
+
+class RunManifest:
+    """Append-only record of a campaign run."""
+
+    def __init__(self, campaign_dir: Path, records: Optional[list[dict]] = None):
+        """
+        Initialize RunManifest.
+
+        Args:
+            campaign_dir: Campaign directory holding the manifest
+            records: Records already in the manifest
+        """
+        self.campaign_dir = Path(campaign_dir)
+        self.path = self.campaign_dir / MANIFEST_FILENAME
+        self.records = records or []
+        self._lock = threading.Lock()
+
+    @classmethod
+    def create(
+        cls, campaign_dir: Path, brief_path: Path, pipeline: str = "standard", **details
+    ) -> "RunManifest":
+        """
+        Start the manifest of a new run.
+
+        The brief is copied into the campaign directory so the run can be
+        resumed even if the original brief file is changed or removed.
+
+        Args:
+            campaign_dir: Campaign directory
+            brief_path: Brief being run
+            pipeline: Pipeline variant that owns the run
+            **details: Extra JSON-serializable settings of the run
+
+        Returns:
+            New RunManifest
+        """
+        campaign_dir = Path(campaign_dir)
+        brief_path = Path(brief_path)
+        snapshot = campaign_dir / f"brief{brief_path.suffix.lower()}"
+        if brief_path.resolve() != snapshot.resolve():
+            shutil.copyfile(brief_path, snapshot)
+
+        manifest = cls(campaign_dir)
+        manifest.append(
+            {
+                "event": "started",
+                "run_id": campaign_dir.name,
+                "brief": snapshot.name,
+                "pipeline": pipeline,
+                **details,
+            }
+        )
+        return manifest
+
+    @classmethod
+    def load(cls, campaign_dir: Path) -> "RunManifest":
+        """
+        Load the manifest of an existing run.
+
+        A torn final line (from a crash mid-write) is ignored.
+
+        Args:
+            campaign_dir: Campaign directory
+
+        Returns:
+            RunManifest with all readable records
+
+        Raises:
+            FileNotFoundError: If the directory has no manifest
+        """
+        path = Path(campaign_dir) / MANIFEST_FILENAME
+        if not path.exists():
+            raise FileNotFoundError(f"No run manifest found in {campaign_dir}")
+
+        records = []
+        with open(path, "r", encoding="utf-8") as f:
+            for line_number, line in enumerate(f, start=1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    records.append(json.loads(line))
+                except json.JSONDecodeError:
+                    app_logger.warning(f"Skipping damaged manifest line {line_number} in {path}")
+
+        return cls(campaign_dir, records)
+
+    def append(self, record: dict):
+        """
+        Durably append a record.
+
+        Args:
+            record: JSON-serializable record with an 'event' field
+        """
+        record = {**record, "at": datetime.now().isoformat()}
+        line = json.dumps(record, ensure_ascii=False) + "\n"
+
+        with self._lock:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line)
+                f.flush()
+                os.fsync(f.fileno())
+            self.records.append(record)
+
+    def record_source(self, product_id: str, path: Path):
+        """Record the base image obtained for a product (e.g. a paid generation)."""
+        self.append({"event": "source", "product_id": product_id, "path": str(path)})
+
+    def record_asset(
+        self,
+        product_id: str,
+        product_name: str,
+        aspect_ratio: str,
+        language: str,
+        filepath: str,
+        **details,
+    ):
+        """Record a completed asset."""
+        self.append(
+            {
+                "event": "asset",
+                "product_id": product_id,
+                "product_name": product_name,
+                "aspect_ratio": aspect_ratio,
+                "language": language,
+                "filepath": filepath,
+                **details,
+            }
+        )
+
+    def record_failure(
+        self,
+        product_id: str,
+        aspect_ratio: str,
+        language: str,
+        stage: str,
+        error_type: str,
+        error: str,
+        transient: bool,
+    ):
+        """Record a cell that could not be produced and why."""
+        self.append(
+            {
+                "event": "failed",
+                "product_id": product_id,
+                "aspect_ratio": aspect_ratio,
+                "language": language,
+                "stage": stage,
+                "error_type": error_type,
+                "error": error,
+                "transient": transient,
+            }
+        )
+
+    def record_cancelled(self, reason: str):
+        """Record that the run was cancelled; it can be resumed later."""
+        self.append({"event": "cancelled", "reason": reason})
+
+    def record_finished(self, **details: Any):
+        """
+        Record that the run completed.
+
+        Args:
+            **details: Run statistics stored with the record (e.g. peak memory)
+        """
+        self.append({"event": "finished", **details})
+
+    @property
+    def header(self) -> dict:
+        """Get the record that started the run."""
+        for record in self.records:
+            if record.get("event") == "started":
+                return record
+        return {}
+
+    @property
+    def brief_path(self) -> Path:
+        """Get the brief snapshot stored with the run."""
+        return self.campaign_dir / self.header.get("brief", "brief.json")
+
+    def is_finished(self) -> bool:
+        """Check if the run completed."""
+        return any(r.get("event") == "finished" for r in self.records)
+
+    def sources(self) -> dict[str, Path]:
+        """Get recorded base images by product ID."""
+        return {
+            r["product_id"]: Path(r["path"]) for r in self.records if r.get("event") == "source"
+        }
+
+    def completed_cells(self) -> dict[tuple[str, str, str], dict]:
+        """
+        Get completed assets by (product_id, aspect_ratio, language).
+
+        Only assets whose files still exist are reported.
+
+        Returns:
+            Dictionary of cell to asset record
+        """
+        cells = {}
+        for record in self.records:
+            if record.get("event") != "asset":
+                continue
+            if (
+                not (self.campaign_dir.parent / record["filepath"]).exists()
+                and not Path(record["filepath"]).exists()
+            ):
+                continue
+            cells[(record["product_id"], record["aspect_ratio"], record["language"])] = record
+        return cells
+
+    def failed_cells(self) -> dict[tuple[str, str, str], dict]:
+        """
+        Get cells whose last failure was not followed by a completed asset.
+
+        Returns:
+            Dictionary of (product_id, aspect_ratio, language) to the latest
+            failure record
+        """
+        completed = self.completed_cells()
+        failed = {}
+        for record in self.records:
+            if record.get("event") != "failed":
+                continue
+            cell = (record["product_id"], record["aspect_ratio"], record["language"])
+            if cell not in completed:
+                failed[cell] = record
+        return failed
@@ -0,0 +1,582 @@
+"""
+Stage Graph Engine
+Small DAG executor that runs the pipeline stages of a campaign.
+
+A pipeline is described as a list of stages. Each stage declares the stages
+it reads from, the dimensions it is instantiated over (product, aspect ratio,
+language) and the resource it mostly uses. The engine expands the stages into
+one task per scope, runs tasks as soon as their inputs are ready and limits
+how many tasks of each resource class run at once, so e.g. image generation
+requests never queue behind PNG encoding.
+
+Outputs waiting to be consumed are charged to a memory budget. Throttled
+stages (the ones bringing new images into the run) only start while the
+budget has room, and ready tasks of later stages run first, so images are
+rendered and released before more are fetched.
+
+Tasks have a time budget per resource class. A task that overruns it, and
+every running task once the run's cancellation token is cancelled, is
+abandoned: its slot is freed immediately and its result discarded.
+"""
+
+import contextvars
+import copy
+import heapq
+import itertools
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from enum import Enum
+from typing import Any, Callable, Iterable, Optional
+from src.config import settings
+from src.services.backpressure import MemoryBudget, payload_size
+from src.utils.cancellation import CancellationToken, RunCancelled, StageTimeout
+from src.utils.logger import app_logger
+from src.utils import cancellation, tracing
+
+DIMENSIONS = ("product_id", "aspect_ratio", "language")
+
+# Extra worker threads for abandoned tasks that are still running
+MAX_ABANDONED_TASKS = 16
+
+
+class ResourceClass(str, Enum):
+    """Resource a stage mostly waits on."""
+
+    NETWORK = "network"
+    CPU = "cpu"
+    DISK = "disk"
+
+
+class _Skipped:
+    """Marker output of a stage that had nothing to do."""
+
+    def __repr__(self) -> str:
+        return "SKIP"
+
+
+SKIP = _Skipped()
+
+
+class Stage:
+    """A pluggable step of a pipeline."""
+
+    def __init__(
+        self,
+        name: str,
+        fn: Callable[..., Any],
+        inputs: Iterable[str] = (),
+        scope: Iterable[str] = (),
+        resource: ResourceClass = ResourceClass.CPU,
+        cache_key: Optional[Callable[..., Optional[str]]] = None,
+        accepts_skipped: bool = False,
+        throttled: bool = False,
+        timeout: Optional[float] = None,
+        mutates: Iterable[str] = (),
+    ):
+        """
+        Initialize Stage.
+
+        Args:
+            name: Unique stage name, also the keyword its output is passed as
+            fn: Callable ``fn(ctx, **inputs)`` producing the stage output
+            inputs: Names of the stages whose outputs this stage reads
+            scope: Dimensions the stage runs per (subset of DIMENSIONS)
+            resource: Resource class used for concurrency limits
+            cache_key: Callable ``cache_key(ctx, **inputs)`` returning a key
+                under which the output is shared between tasks (optional)
+            accepts_skipped: Run even if an input was skipped; otherwise the
+                stage is skipped too
+            throttled: Wait for room in the memory budget before starting
+            timeout: Seconds a task may run before it fails with StageTimeout
+                (defaults to the graph's budget for the resource class)
+            mutates: Inputs the stage may modify in place; it gets a copy of
+                any that another task still reads or shares through the cache
+        """
+        self.name = name
+        self.fn = fn
+        self.inputs = tuple(inputs)
+        self.scope = tuple(scope)
+        self.resource = ResourceClass(resource)
+        self.cache_key = cache_key
+        self.accepts_skipped = accepts_skipped
+        self.throttled = throttled
+        self.timeout = timeout
+        self.mutates = tuple(mutates)
+
+    def __repr__(self) -> str:
+        return f"Stage({self.name!r}, scope={self.scope}, resource={self.resource.value})"
+
+
+class TaskContext:
+    """What a stage function knows about the task it runs."""
+
+    def __init__(self, stage: str, scope: dict[str, str], state: Any):
+        """
+        Initialize TaskContext.
+
+        Args:
+            stage: Stage name
+            scope: Dimension values of the task (e.g. {"product_id": "P1"})
+            state: Run state passed to StageGraph.execute
+        """
+        self.stage = stage
+        self.scope = scope
+        self.state = state
+
+    def __repr__(self) -> str:
+        scope = ", ".join(f"{k}={v}" for k, v in self.scope.items())
+        return f"{self.stage}({scope})"
+
+
+class _Task:
+    """One instantiation of a stage."""
+
+    __slots__ = (
+        "stage",
+        "depth",
+        "context",
+        "deps",
+        "dependents",
+        "waiting",
+        "consumers",
+        "status",
+        "output",
+        "key",
+        "charge",
+        "started",
+    )
+
+    def __init__(self, stage: Stage, depth: int, context: TaskContext):
+        self.stage = stage
+        self.depth = depth
+        self.context = context
+        self.deps: list["_Task"] = []
+        self.dependents: list["_Task"] = []
+        self.waiting = 0
+        self.consumers = 0
+        self.status = "pending"
+        self.output: Any = None
+        self.key: Optional[str] = None
+        self.charge = 0
+        self.started = 0.0
+
+
+class GraphReport:
+    """Outcome of executing a stage graph."""
+
+    def __init__(self):
+        """Initialize an empty report."""
+        self.completed = 0
+        self.skipped = 0
+        self.failed = 0
+        self.cancelled = 0
+        self.timed_out = 0
+        self.cache_hits = 0
+        self.peak_bytes = 0
+        self.stage_seconds: dict[str, float] = {}
+        self.errors: list[tuple[TaskContext, Exception]] = []
+
+    def to_dict(self) -> dict:
+        """Convert report counts to a dictionary."""
+        return {
+            "completed": self.completed,
+            "skipped": self.skipped,
+            "failed": self.failed,
+            "cancelled": self.cancelled,
+            "timed_out": self.timed_out,
+            "cache_hits": self.cache_hits,
+            "peak_bytes": self.peak_bytes,
+            "stage_seconds": dict(self.stage_seconds),
+        }
+
+
+def default_limits() -> dict[ResourceClass, int]:
+    """Get per-resource concurrency limits from settings."""
+    return {
+        ResourceClass.NETWORK: settings.stage_network_workers,
+        ResourceClass.CPU: settings.stage_cpu_workers,
+        ResourceClass.DISK: settings.stage_disk_workers,
+    }
+
+
+def default_timeouts() -> dict[ResourceClass, float]:
+    """Get per-resource task time budgets from settings (0 disables)."""
+    return {
+        ResourceClass.NETWORK: settings.stage_network_timeout_seconds,
+        ResourceClass.CPU: settings.stage_local_timeout_seconds,
+        ResourceClass.DISK: settings.stage_local_timeout_seconds,
+    }
+
+
+class StageGraph:
+    """Schedules stage tasks with per-resource concurrency limits."""
+
+    def __init__(
+        self,
+        stages: Iterable[Stage],
+        limits: Optional[dict[ResourceClass, int]] = None,
+        memory_budget: Optional[int] = None,
+        timeouts: Optional[dict[ResourceClass, float]] = None,
+    ):
+        """
+        Initialize StageGraph.
+
+        Stages must be listed after the stages they read from.
+
+        Args:
+            stages: Pipeline stages
+            limits: Maximum concurrent tasks per resource class (defaults to settings)
+            memory_budget: Bytes of stage outputs held before throttled stages
+                wait (defaults to settings)
+            timeouts: Seconds a task of each resource class may run, 0 for
+                no limit (defaults to settings)
+
+        Raises:
+            ValueError: If the stages do not form a valid graph
+        """
+        self.stages: dict[str, Stage] = {}
+        for stage in stages:
+            self._validate(stage)
+            self.stages[stage.name] = stage
+
+        self.limits = {**default_limits(), **(limits or {})}
+        for resource, limit in self.limits.items():
+            if limit < 1:
+                raise ValueError(f"Concurrency limit for {resource.value} must be at least 1")
+
+        if memory_budget is None:
+            memory_budget = settings.stage_memory_budget_mb * 1024 * 1024
+        self.memory_budget = memory_budget
+        self.timeouts = {**default_timeouts(), **(timeouts or {})}
+
+    def _validate(self, stage: Stage):
+        """Check a stage against the stages declared before it."""
+        if stage.name in self.stages:
+            raise ValueError(f"Duplicate stage: {stage.name}")
+
+        unknown = set(stage.scope) - set(DIMENSIONS)
+        if unknown:
+            raise ValueError(f"Stage {stage.name} has unknown dimensions: {sorted(unknown)}")
+
+        for name in stage.inputs:
+            upstream = self.stages.get(name)
+            if upstream is None:
+                raise ValueError(f"Stage {stage.name} reads undeclared stage {name}")
+            if not set(upstream.scope) <= set(stage.scope):
+                raise ValueError(
+                    f"Stage {stage.name} {stage.scope} cannot read {name} {upstream.scope}"
+                )
+
+        unread = set(stage.mutates) - set(stage.inputs)
+        if unread:
+            raise ValueError(
+                f"Stage {stage.name} mutates stages it does not read: {sorted(unread)}"
+            )
+
+    def execute(
+        self,
+        cells: Iterable[dict[str, str]],
+        state: Any = None,
+        on_error: Optional[Callable[[TaskContext, Exception], None]] = None,
+        token: Optional[CancellationToken] = None,
+    ) -> GraphReport:
+        """
+        Run every stage needed to produce the given cells.
+
+        Throttled tasks wait while the memory budget is full, unless nothing
+        else is running. A failing task is reported once through
+        ``on_error``; tasks that depend on it are cancelled while unrelated
+        tasks keep running.
+        Exceptions that are not ``Exception`` subclasses (e.g.
+        KeyboardInterrupt) stop scheduling and are re-raised once running
+        tasks have finished.
+        A task running past its time budget fails with StageTimeout. Once
+        the token is cancelled, nothing new starts and running tasks are
+        abandoned without waiting for them.
+
+        Args:
+            cells: Dimension values of each output to produce
+            state: Run state handed to every stage through its TaskContext
+            on_error: Callback receiving the context and error of failed tasks
+            token: Cancellation token of the run (optional)
+
+        Returns:
+            GraphReport with task counts and errors
+
+        Raises:
+            RunCancelled: If the token was cancelled
+        """
+        if token is not None:
+            token.raise_if_cancelled()
+
+        tasks = self._expand(cells, state)
+        report = GraphReport()
+        if not tasks:
+            return report
+
+        # Ready tasks per resource, deepest stage first
+        ready: dict[ResourceClass, list] = {resource: [] for resource in ResourceClass}
+        order = itertools.count()
+        running = {resource: 0 for resource in ResourceClass}
+        finished: queue.Queue = queue.Queue()
+        budget = MemoryBudget(self.memory_budget)
+        memo: dict[str, Any] = {}
+        # Tasks holding each cached output
+        holders: dict[str, int] = {}
+        memo_lock = threading.Lock()
+        fatal: Optional[BaseException] = None
+        active: set[_Task] = set()
+        abandoned = 0
+
+        def take(dep: _Task) -> Any:
+            # Hand over an output for in-place changes if nothing else holds it;
+            # later tasks with the same cache key compute their own
+            with memo_lock:
+                if dep.consumers == 1 and (dep.key is None or holders[dep.key] == 1):
+                    if dep.key is not None:
+                        del holders[dep.key]
+                        if memo.get(dep.key) is dep.output:
+                            del memo[dep.key]
+                        dep.key = None
+                    return dep.output
+            return copy.copy(dep.output)
+
+        def compute(task: _Task) -> tuple[Any, bool]:
+            inputs = {dep.stage.name: dep.output for dep in task.deps}
+            key = task.stage.cache_key(task.context, **inputs) if task.stage.cache_key else None
+            if key is not None:
+                with memo_lock:
+                    if key in memo:
+                        holders[key] += 1
+                        task.key = key
+                        return memo[key], True
+            for dep in task.deps:
+                if dep.stage.name in task.stage.mutates:
+                    inputs[dep.stage.name] = take(dep)
+            output = task.stage.fn(task.context, **inputs)
+            if key is not None:
+                with memo_lock:
+                    memo[key] = output
+                    holders[key] = holders.get(key, 0) + 1
+                    task.key = key
+            return output, False
+
+        def run_task(task: _Task):
+            started = time.perf_counter()
+            try:
+                with (
+                    cancellation.activate(token),
+                    tracing.attributes(**task.context.scope),
+                    tracing.span(task.stage.name, task.stage.resource.value),
+                ):
+                    cancellation.check()
+                    output, cached = compute(task)
+                finished.put((task, output, None, cached, time.perf_counter() - started))
+            except BaseException as e:
+                finished.put((task, None, e, False, time.perf_counter() - started))
+
+        def release(task: _Task):
+            budget.release(task.charge)
+            task.charge = 0
+            if task.key is not None:
+                with memo_lock:
+                    if memo.get(task.key) is task.output:
+                        del memo[task.key]
+                    holders[task.key] -= 1
+                    if not holders[task.key]:
+                        del holders[task.key]
+            task.output = None
+
+        def release_inputs(task: _Task):
+            # Drop upstream outputs once nothing else will read them
+            for dep in task.deps:
+                dep.consumers -= 1
+                if dep.consumers == 0:
+                    release(dep)
+
+        def cancel(task: _Task):
+            for dependent in task.dependents:
+                if dependent.status == "pending":
+                    dependent.status = "cancelled"
+                    report.cancelled += 1
+                    release_inputs(dependent)
+                    cancel(dependent)
+
+        def resolve(task: _Task):
+            # Called when a task's last input is available
+            skipped = any(dep.output is SKIP for dep in task.deps)
+            if skipped and not task.stage.accepts_skipped:
+                settle(task, SKIP, "skipped")
+            else:
+                task.status = "ready"
+                heapq.heappush(ready[task.stage.resource], (-task.depth, next(order), task))
+
+        def time_budget(task: _Task) -> float:
+            if task.stage.timeout is not None:
+                return task.stage.timeout
+            return self.timeouts.get(task.stage.resource, 0)
+
+        def fail(task: _Task, error: Exception):
+            task.status = "failed"
+            report.failed += 1
+            report.errors.append((task.context, error))
+            release_inputs(task)
+            cancel(task)
+            if on_error:
+                on_error(task.context, error)
+            else:
+                app_logger.error(f"Stage {task.context} failed: {error}")
+
+        def next_deadline() -> Optional[float]:
+            deadlines = [
+                task.started + time_budget(task) for task in active if time_budget(task) > 0
+            ]
+            if not deadlines:
+                return None
+            return max(0.0, min(deadlines) - time.monotonic())
+
+        def settle(task: _Task, output: Any, status: str, shared: bool = False):
+            task.status = status
+            task.output = output
+            if task.consumers:
+                # Outputs shared through the cache are already counted
+                task.charge = 0 if shared else payload_size(output)
+                budget.charge(task.charge)
+            else:
+                release(task)
+            if status == "skipped":
+                report.skipped += 1
+            release_inputs(task)
+            for dependent in task.dependents:
+                dependent.waiting -= 1
+                if dependent.waiting == 0 and dependent.status == "pending":
+                    resolve(dependent)
+
+        for task in tasks:
+            if task.waiting == 0:
+                resolve(task)
+
+        # Wake the scheduler as soon as the run is cancelled
+        unregister = token.on_cancel(lambda: finished.put(None)) if token else None
+        pool = ThreadPoolExecutor(
+            max_workers=sum(self.limits.values()) + MAX_ABANDONED_TASKS, thread_name_prefix="stage"
+        )
+        try:
+            while True:
+                if token is not None and token.cancelled:
+                    for task in tasks:
+                        if task.status in ("pending", "ready", "running"):
+                            task.status = "cancelled"
+                            report.cancelled += 1
+                    abandoned += len(active)
+                    active.clear()
+                    break
+
+                if fatal is None:
+                    for resource in ResourceClass:
+                        held_back = []
+                        while ready[resource] and running[resource] < self.limits[resource]:
+                            entry = heapq.heappop(ready[resource])
+                            task = entry[2]
+                            if (
+                                task.stage.throttled
+                                and not budget.has_room()
+                                and any(running.values())
+                            ):
+                                held_back.append(entry)
+                                continue
+                            task.status = "running"
+                            task.started = time.monotonic()
+                            active.add(task)
+                            running[resource] += 1
+                            # Carry the run's tracer and attributes into the worker
+                            pool.submit(contextvars.copy_context().run, run_task, task)
+                        for entry in held_back:
+                            heapq.heappush(ready[resource], entry)
+
+                if not any(running.values()):
+                    break
+
+                try:
+                    item = finished.get(timeout=next_deadline())
+                except queue.Empty:
+                    item = None
+                if item is None:
+                    # Cancelled, or a task ran past its time budget
+                    now = time.monotonic()
+                    for task in list(active):
+                        budget_seconds = time_budget(task)
+                        if budget_seconds > 0 and now - task.started >= budget_seconds:
+                            active.discard(task)
+                            running[task.stage.resource] -= 1
+                            abandoned += 1
+                            report.timed_out += 1
+                            fail(
+                                task,
+                                StageTimeout(
+                                    f"{task.context} exceeded its {budget_seconds:g}s time budget"
+                                ),
+                            )
+                    continue
+
+                task, output, error, cached, seconds = item
+                if task not in active:
+                    # Result of an abandoned task
+                    continue
+                active.discard(task)
+                running[task.stage.resource] -= 1
+                name = task.stage.name
+                report.stage_seconds[name] = report.stage_seconds.get(name, 0.0) + seconds
+
+                if error is None:
+                    report.completed += 1
+                    report.cache_hits += int(cached)
+                    settle(task, output, "done", shared=cached)
+                elif isinstance(error, Exception):
+                    fail(task, error)
+                else:
+                    task.status = "failed"
+                    if fatal is None:
+                        fatal = error
+        finally:
+            if unregister:
+                unregister()
+            # Abandoned tasks finish in the background; don't wait for them
+            pool.shutdown(wait=not abandoned, cancel_futures=True)
+
+        if abandoned:
+            app_logger.warning(f"Abandoned {abandoned} running stage tasks")
+        report.peak_bytes = budget.peak_bytes
+        if fatal is not None:
+            raise fatal
+        if token is not None and token.cancelled:
+            raise RunCancelled(token.reason)
+
+        return report
+
+    def _expand(self, cells: Iterable[dict[str, str]], state: Any) -> list[_Task]:
+        """Instantiate the tasks needed for the given cells."""
+        tasks: dict[tuple, _Task] = {}
+
+        for cell in cells:
+            for depth, stage in enumerate(self.stages.values()):
+                values = tuple(cell[dim] for dim in stage.scope)
+                key = (stage.name, values)
+                if key in tasks:
+                    continue
+
+                task = _Task(
+                    stage, depth, TaskContext(stage.name, dict(zip(stage.scope, values)), state)
+                )
+                for name in stage.inputs:
+                    upstream = self.stages[name]
+                    dep = tasks[(name, tuple(cell[dim] for dim in upstream.scope))]
+                    task.deps.append(dep)
+                    dep.dependents.append(task)
+                    dep.consumers += 1
+                task.waiting = len(task.deps)
+                tasks[key] = task
+
+        return list(tasks.values())
@@ -0,0 +1,259 @@
+"""
+Text Layout Service
+Wraps overlay text into lines using cached glyph advances.
+
+Text is split into clusters between line break opportunities (words, or
+single characters in CJK text; see src.utils.line_breaking). Each cluster
+is measured once with font.getlength (advances are cached per font across
+layouts), then clusters are packed greedily in a single linear pass.
+Finished layouts are memoized by (text, font file, size, max width), so the
+same message rendered for many products or ratios is laid out once.
+
+Mixed-script text is laid out from font runs (each stretch of text with the
+font that draws it). A cluster may span runs; its advance is the sum of its
+parts. Every line shares one baseline and one height, taken from the
+largest ascent and descent of the fonts involved.
+"""
+
+import threading
+from collections import OrderedDict
+from typing import NamedTuple, Sequence
+from src.utils.line_breaking import clusters
+from src.utils.logger import app_logger
+
+# Memoized layouts and cluster advances kept per process
+LAYOUT_CACHE_SIZE = 512
+ADVANCE_CACHE_SIZE = 8192
+
+# Vertical gap between lines in pixels
+LINE_SPACING = 10
+
+
+class Piece(NamedTuple):
+    """Part of a line drawn with one font, positioned relative to the line's top left."""
+
+    text: str
+    font: object
+    x: float
+    y: int
+
+
+class TextLayout(NamedTuple):
+    """Wrapped text with the measurements needed to draw it."""
+
+    lines: tuple[str, ...]
+    widths: tuple[float, ...]
+    line_height: int
+    spacing: int
+    pieces: tuple[tuple[Piece, ...], ...] = ()
+
+    @property
+    def width(self) -> float:
+        """Width of the widest line."""
+        return max(self.widths, default=0)
+
+    @property
+    def height(self) -> int:
+        """Total height of all lines including the gaps between them."""
+        return len(self.lines) * self.line_height + max(len(self.lines) - 1, 0) * self.spacing
+
+
+def font_key(font) -> tuple:
+    """
+    Identify a font by file and size.
+
+    Args:
+        font: PIL font object
+
+    Returns:
+        Hashable key that is equal for fonts loaded from the same file at the same size
+    """
+    return (getattr(font, "path", None) or id(font), getattr(font, "size", None))
+
+
+class TextLayoutEngine:
+    """Thread-safe, memoizing greedy line wrapper."""
+
+    def __init__(
+        self, max_layouts: int = LAYOUT_CACHE_SIZE, max_advances: int = ADVANCE_CACHE_SIZE
+    ):
+        """
+        Initialize TextLayoutEngine.
+
+        Args:
+            max_layouts: Layouts kept before the least recently used is dropped
+            max_advances: Cluster advances kept before the least recently used is dropped
+        """
+        self.max_layouts = max_layouts
+        self.max_advances = max_advances
+        self._layouts: OrderedDict[tuple, TextLayout] = OrderedDict()
+        self._advances: OrderedDict[tuple, float] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def advance(self, font, text: str) -> float:
+        """
+        Get the horizontal advance of a string, measuring it only once per font.
+
+        Args:
+            font: PIL font object
+            text: String to measure
+
+        Returns:
+            Advance width in pixels
+        """
+        key = (font_key(font), text)
+        with self._lock:
+            if key in self._advances:
+                self._advances.move_to_end(key)
+                return self._advances[key]
+
+        width = font.getlength(text)
+
+        with self._lock:
+            self._advances[key] = width
+            while len(self._advances) > self.max_advances:
+                self._advances.popitem(last=False)
+        return width
+
+    def layout(self, text: str, font, max_width: float, spacing: int = LINE_SPACING) -> TextLayout:
+        """
+        Wrap text drawn in one font to fit within a maximum width.
+
+        A word (or other unbreakable cluster) wider than max_width gets a line of its own.
+
+        Args:
+            text: Text to wrap
+            font: PIL font object
+            max_width: Maximum line width in pixels
+            spacing: Vertical gap between lines in pixels
+
+        Returns:
+            TextLayout with the lines and their widths
+        """
+        return self.layout_runs(((text, font),), max_width, spacing)
+
+    def layout_runs(
+        self, runs: Sequence[tuple[str, object]], max_width: float, spacing: int = LINE_SPACING
+    ) -> TextLayout:
+        """
+        Wrap text made of font runs to fit within a maximum width.
+
+        Args:
+            runs: (text, font) pairs whose texts concatenate to the full text
+            max_width: Maximum line width in pixels
+            spacing: Vertical gap between lines in pixels
+
+        Returns:
+            TextLayout with the lines, their widths and the pieces to draw
+        """
+        runs = tuple(runs)
+        key = (tuple((text, font_key(font)) for text, font in runs), max_width, spacing)
+        with self._lock:
+            cached = self._layouts.get(key)
+            if cached is not None:
+                self._layouts.move_to_end(key)
+                self.hits += 1
+                return cached
+            self.misses += 1
+
+        layout = self._wrap(runs, max_width, spacing)
+
+        with self._lock:
+            self._layouts[key] = layout
+            while len(self._layouts) > self.max_layouts:
+                self._layouts.popitem(last=False)
+        return layout
+
+    def _wrap(
+        self, runs: tuple[tuple[str, object], ...], max_width: float, spacing: int
+    ) -> TextLayout:
+        """Greedily pack unbreakable clusters into lines in one pass over the text."""
+        fonts = [font for _, font in runs]
+        metrics = {id(font): font.getmetrics() for font in fonts}
+        ascent = max(a for a, _ in metrics.values())
+        descent = max(d for _, d in metrics.values())
+
+        # Collapse whitespace to single spaces, keeping each character's run
+        chars, owner = [], []
+        for index, (run_text, _) in enumerate(runs):
+            for char in run_text:
+                if char.isspace():
+                    if not chars or chars[-1] == " ":
+                        continue
+                    char = " "
+                chars.append(char)
+                owner.append(index)
+        if chars and chars[-1] == " ":
+            chars.pop()
+            owner.pop()
+        text = "".join(chars)
+
+        lines, widths, pieces = [], [], []
+        line: list[str] = []
+        parts: list[list] = []  # [text, font, x] of the current line
+        width = 0.0
+
+        def end_line():
+            lines.append("".join(line))
+            widths.append(width)
+            pieces.append(
+                tuple(
+                    Piece(part_text, font, x, ascent - metrics[id(font)][0])
+                    for part_text, font, x in parts
+                )
+            )
+
+        for cluster in clusters(text):
+            # Split the cluster at run boundaries and measure each part
+            cluster_parts, start = [], cluster.start
+            for i in range(cluster.start + 1, cluster.end + 1):
+                if i == cluster.end or owner[i] != owner[start]:
+                    font = fonts[owner[start]]
+                    cluster_parts.append((text[start:i], font, self.advance(font, text[start:i])))
+                    start = i
+            cluster_width = sum(advance for _, _, advance in cluster_parts)
+            gap = " " if cluster.space_before else ""
+            gap_width = self.advance(fonts[owner[cluster.start - 1]], gap) if gap else 0.0
+
+            if line and width + gap_width + cluster_width > max_width:
+                end_line()
+                line, parts, width = [], [], 0.0
+            if not line:
+                gap, gap_width = "", 0.0
+
+            x = width + gap_width
+            for j, (part_text, font, advance) in enumerate(cluster_parts):
+                if parts and parts[-1][1] is font:
+                    # Same font as what precedes it on the line: draw as one string
+                    parts[-1][0] += (gap if j == 0 else "") + part_text
+                else:
+                    parts.append([part_text, font, x])
+                x += advance
+            line += [gap, text[cluster.start : cluster.end]]
+            width = x
+
+        if line:
+            end_line()
+        if not lines:
+            font = fonts[0]
+            lines, widths = [""], [0.0]
+            pieces = [(Piece("", font, 0.0, ascent - metrics[id(font)][0]),)]
+
+        return TextLayout(tuple(lines), tuple(widths), ascent + descent, spacing, tuple(pieces))
+
+    def clear(self):
+        """Drop all memoized layouts and advances."""
+        with self._lock:
+            self._layouts.clear()
+            self._advances.clear()
+        app_logger.debug("Text layout cache cleared")
+
+
+_engine = TextLayoutEngine()
+
+
+def get_engine() -> TextLayoutEngine:
+    """Get the layout engine shared by all image processors of this process."""
+    return _engine
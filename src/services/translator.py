@@ -6,7 +6,9 @@ Translates campaign messages using OpenAI GPT models.
 from typing import Optional
 from openai import OpenAI
 from src.config import settings
+from src.services.retry import TransientError, is_transient
 from src.utils.logger import app_logger
+from src.utils.tracing import traced
 
 
 class TranslationService:
@@ -25,9 +27,10 @@ class TranslationService:
             app_logger.warning("No OpenAI API key provided for translation")
             self.client = None
         else:
-            self.client = OpenAI(api_key=self.api_key)
+            self.client = OpenAI(api_key=self.api_key, timeout=settings.openai_timeout_seconds)
             app_logger.info("TranslationService initialized")
     
+    @traced(category="network")
     def translate(
         self,
         text: str,
@@ -45,7 +48,11 @@ class TranslationService:
             context: Additional context for translation (optional)
             
         Returns:
-            Translated text if successful, None otherwise
+            Translated text if successful, the original text otherwise
+            
+        Raises:
+            TransientError: On timeouts, rate limits and server errors,
+                so callers can retry instead of using the untranslated text
         """
         if not self.client:
             app_logger.warning("Translation not available: No API key")
@@ -110,6 +117,8 @@ class TranslationService:
             
         except Exception as e:
             app_logger.error(f"Translation failed: {e}")
+            if is_transient(e):
+                raise TransientError(f"Translation to {target_language} failed: {e}") from e
             return text  # Return original on failure
     
     def translate_campaign_message(
@@ -0,0 +1,213 @@
+"""
+Cooperative cancellation for Creative Automation Pipeline.
+Cancellation tokens, stage timeouts and a watchdog for stalled work.
+
+A run is handed a CancellationToken. The stage graph stops scheduling as soon
+as the token is cancelled and abandons tasks still running, so their
+concurrency slots are free at once. Long service calls check the token bound
+with ``activate(...)`` (e.g. between download chunks) and stop early.
+Python threads cannot be killed, so abandoned calls still end on their own
+timeouts; their results are discarded.
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Optional
+from src.utils.logger import app_logger
+
+
+class RunCancelled(Exception):
+    """Raised when work stops because its token was cancelled."""
+
+
+class StageTimeout(TimeoutError):
+    """Raised for a stage task that ran past its time budget."""
+
+
+class CancellationToken:
+    """Thread-safe flag that work checks to stop early."""
+
+    def __init__(self):
+        """Initialize an uncancelled token."""
+        self.reason: Optional[str] = None
+        self._event = threading.Event()
+        self._callbacks: list[Callable[[], None]] = []
+        self._lock = threading.Lock()
+
+    @property
+    def cancelled(self) -> bool:
+        """Whether cancellation was requested."""
+        return self._event.is_set()
+
+    def cancel(self, reason: str = "Cancelled"):
+        """
+        Request cancellation; later calls keep the first reason.
+
+        Args:
+            reason: Why the work is stopped
+        """
+        with self._lock:
+            if self._event.is_set():
+                return
+            self.reason = reason
+            self._event.set()
+            callbacks, self._callbacks = self._callbacks, []
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception as e:
+                app_logger.warning(f"Cancellation callback failed: {e}")
+
+    def on_cancel(self, callback: Callable[[], None]) -> Callable[[], None]:
+        """
+        Call a function once the token is cancelled (immediately if it already is).
+
+        Args:
+            callback: Function without arguments
+
+        Returns:
+            Function that unregisters the callback
+        """
+        with self._lock:
+            if not self._event.is_set():
+                self._callbacks.append(callback)
+
+                def unregister():
+                    with self._lock:
+                        if callback in self._callbacks:
+                            self._callbacks.remove(callback)
+
+                return unregister
+        callback()
+        return lambda: None
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """
+        Sleep until the token is cancelled or the timeout passes.
+
+        Returns:
+            True if the token was cancelled
+        """
+        return self._event.wait(timeout)
+
+    def raise_if_cancelled(self):
+        """
+        Raise if cancellation was requested.
+
+        Raises:
+            RunCancelled: If the token is cancelled
+        """
+        if self._event.is_set():
+            raise RunCancelled(self.reason)
+
+
+_active_token: ContextVar[Optional[CancellationToken]] = ContextVar("active_token", default=None)
+
+
+def current_token() -> Optional[CancellationToken]:
+    """Get the token of the work running in this context."""
+    return _active_token.get()
+
+
+@contextmanager
+def activate(token: Optional[CancellationToken]):
+    """Bind a token to the current context (and the stage tasks it starts)."""
+    reset = _active_token.set(token)
+    try:
+        yield token
+    finally:
+        _active_token.reset(reset)
+
+
+def check():
+    """
+    Raise if the work of the current context was cancelled.
+
+    Raises:
+        RunCancelled: If the active token is cancelled
+    """
+    token = _active_token.get()
+    if token is not None:
+        token.raise_if_cancelled()
+
+
+class _Watch:
+    """Progress timer of one piece of watched work."""
+
+    def __init__(self, watchdog: "Watchdog", token: CancellationToken, name: str):
+        self.watchdog = watchdog
+        self.token = token
+        self.name = name
+        self.last_progress = time.monotonic()
+
+    def touch(self):
+        """Record progress, resetting the stall timer."""
+        self.last_progress = time.monotonic()
+
+    def __enter__(self) -> "_Watch":
+        return self
+
+    def __exit__(self, *exc):
+        self.watchdog.unwatch(self)
+        return False
+
+
+class Watchdog:
+    """Cancels work that makes no progress for too long."""
+
+    def __init__(self, stall_seconds: float):
+        """
+        Initialize Watchdog.
+
+        Args:
+            stall_seconds: Seconds without progress before work is cancelled
+        """
+        self.stall_seconds = stall_seconds
+        self._watches: list[_Watch] = []
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    def watch(self, token: CancellationToken, name: str) -> _Watch:
+        """
+        Start watching work; use the result as a context manager and touch it on progress.
+
+        Args:
+            token: Token cancelled if the work stalls
+            name: Work description for logs
+
+        Returns:
+            Watch handle
+        """
+        watch = _Watch(self, token, name)
+        if self.stall_seconds <= 0:
+            return watch
+        with self._lock:
+            self._watches.append(watch)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._loop, name="watchdog", daemon=True)
+                self._thread.start()
+        return watch
+
+    def unwatch(self, watch: _Watch):
+        """Stop watching work."""
+        with self._lock:
+            if watch in self._watches:
+                self._watches.remove(watch)
+
+    def _loop(self):
+        interval = min(1.0, self.stall_seconds / 4)
+        while True:
+            time.sleep(interval)
+            now = time.monotonic()
+            with self._lock:
+                stalled = [w for w in self._watches if now - w.last_progress > self.stall_seconds]
+                for watch in stalled:
+                    self._watches.remove(watch)
+            for watch in stalled:
+                app_logger.warning(
+                    f"Watchdog: {watch.name} made no progress for "
+                    f"{self.stall_seconds:.0f}s, cancelling"
+                )
+                watch.token.cancel(f"No progress for {self.stall_seconds:.0f}s")
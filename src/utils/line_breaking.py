@@ -0,0 +1,139 @@
+"""
+Line Breaking Utility
+Finds where a line may break, following the parts of UAX #14 that matter
+for overlay text, with Japanese kinsoku rules.
+
+Text is split into clusters that must stay on one line. Breaks are allowed:
+
+- after spaces (unless what follows is closing punctuation),
+- between CJK characters, which are written without spaces,
+- between CJK and other text, and after a hyphen inside a word,
+
+but never before closing brackets, small kana, the prolonged sound mark or
+sentence punctuation, and never after opening brackets (kinsoku shori).
+Hangul is kept whole per word, as Korean is written with spaces. Each
+decision looks at one pair of cached character classes.
+"""
+
+from typing import NamedTuple
+from src.utils.script_segmenter import script_of
+
+# Break classes
+SP = "SP"  # whitespace
+AL = "AL"  # letters and anything else that stays with its neighbours
+NU = "NU"  # digits: like AL, but a minus sign before them stays attached
+ID = "ID"  # CJK ideographs and kana, breakable on both sides
+OP = "OP"  # opening brackets and quotes: no break after
+CL = "CL"  # closing brackets, sentence punctuation: no break before
+CLW = "CLW"  # CJK closing punctuation: no break before, break allowed after
+HY = "HY"  # hyphens and dashes: break after when a letter follows
+
+OPENING = "([{<«‹‘“¿¡（「『【〔〈《〖〘〚｛［｟"
+CLOSING = ")]}>»›’”,.!?:;%/…‥"
+CJK_CLOSING = (
+    "、。，．・：；？！）」』】〕〉》〗〙〛｝］｠"
+    "ー゛゜ヽヾゝゞ々〻〜～‐"
+    "ぁぃぅぇぉっゃゅょゎゕゖァィゥェォッャュョヮヵヶ"
+    "ㇰㇱㇲㇳㇴㇵㇶㇷㇸㇹㇺㇻㇼㇽㇾㇿ"
+)
+HYPHENS = "-–—"
+
+_classes: dict[str, str] = {}
+
+
+def break_class(char: str) -> str:
+    """
+    Get the line breaking class of a character.
+
+    Args:
+        char: Single character
+
+    Returns:
+        One of SP, AL, NU, ID, OP, CL, CLW or HY
+    """
+    cls = _classes.get(char)
+    if cls is None:
+        if char.isspace():
+            cls = SP
+        elif char in CJK_CLOSING:
+            cls = CLW
+        elif char in CLOSING:
+            cls = CL
+        elif char in OPENING:
+            cls = OP
+        elif char in HYPHENS:
+            cls = HY
+        elif char.isdigit():
+            cls = NU
+        elif script_of(char) == "cjk":
+            cls = ID
+        else:
+            cls = AL
+        _classes[char] = cls
+    return cls
+
+
+def can_break(before: str, after: str) -> bool:
+    """
+    Check if a line may break between two non-space characters' classes.
+
+    Args:
+        before: Class of the character before the position
+        after: Class of the character after the position
+
+    Returns:
+        True if a break is allowed
+    """
+    if after in (CL, CLW) or before == OP:
+        return False
+    if before in (ID, CLW) or after == ID:
+        return True
+    return before == HY and after == AL
+
+
+def after_space_breaks(after: str) -> bool:
+    """Check if a line may break after a space, before a character of the given class."""
+    return after not in (CL, CLW)
+
+
+class Cluster(NamedTuple):
+    """Text between two break opportunities."""
+
+    start: int
+    end: int
+    space_before: bool
+
+
+def clusters(text: str) -> list[Cluster]:
+    """
+    Split text with single-space whitespace into unbreakable clusters.
+
+    Args:
+        text: Text without leading, trailing or repeated whitespace
+
+    Returns:
+        Clusters in order; space_before tells whether a space separates a
+        cluster from the previous one (that space is dropped at a line break)
+    """
+    result: list[Cluster] = []
+    start = 0
+    before = None  # class of the last non-space character
+    space_at = None  # index of a space since that character
+
+    for i, char in enumerate(text):
+        cls = break_class(char)
+        if cls == SP:
+            space_at = i
+            continue
+        if before is not None:
+            if space_at is not None and after_space_breaks(cls):
+                result.append(Cluster(start, space_at, bool(result) and result[-1].end < start))
+                start = i
+            elif space_at is None and can_break(before, cls):
+                result.append(Cluster(start, i, bool(result) and result[-1].end < start))
+                start = i
+        before, space_at = cls, None
+
+    if text:
+        result.append(Cluster(start, len(text), bool(result) and result[-1].end < start))
+    return result
@@ -9,17 +9,23 @@ from loguru import logger
 from src.config import settings
 
 
-def setup_logger():
-    """Configure loguru logger with file and console handlers."""
+def setup_logger(stream=sys.stdout, level: str = None):
+    """
+    Configure loguru logger with file and console handlers.
+    
+    Args:
+        stream: Stream for console output (stdout by default)
+        level: Console log level (defaults to config)
+    """
     
     # Remove default handler
     logger.remove()
     
     # Add console handler with custom format
     logger.add(
-        sys.stdout,
+        stream,
         format="<green>{time:YYYY-MM-DD HH:mm:ss}</green> | <level>{level: <8}</level> | <cyan>{name}</cyan>:<cyan>{function}</cyan> - <level>{message}</level>",
-        level=settings.log_level,
+        level=level or settings.log_level,
         colorize=True
     )
     
@@ -0,0 +1,80 @@
+"""
+Memory measurement utilities.
+Samples the resident set size (RSS) of the process to report peak memory per run.
+"""
+
+import os
+import sys
+import threading
+from typing import Optional
+
+
+def current_rss_bytes() -> Optional[int]:
+    """
+    Get the current resident set size of this process.
+
+    Reads /proc on Linux. Elsewhere falls back to the peak RSS reported by
+    the resource module, which never decreases.
+
+    Returns:
+        RSS in bytes, or None if it cannot be measured
+    """
+    try:
+        with open("/proc/self/statm", "rb") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        pass
+
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+class RssSampler:
+    """Samples RSS from a background thread while a block runs."""
+
+    def __init__(self, interval: float = 0.05):
+        """
+        Initialize RssSampler.
+
+        Args:
+            interval: Seconds between samples
+        """
+        self.interval = interval
+        self.start_bytes: Optional[int] = None
+        self.peak_bytes: Optional[int] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _sample(self):
+        rss = current_rss_bytes()
+        if rss is not None and (self.peak_bytes is None or rss > self.peak_bytes):
+            self.peak_bytes = rss
+
+    def _loop(self):
+        while not self._stop.wait(self.interval):
+            self._sample()
+
+    def __enter__(self) -> "RssSampler":
+        self.start_bytes = current_rss_bytes()
+        self._sample()
+        self._thread = threading.Thread(target=self._loop, name="rss-sampler", daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        self._sample()
+        return False
+
+    @property
+    def peak_mb(self) -> Optional[float]:
+        """Peak RSS in megabytes."""
+        if self.peak_bytes is None:
+            return None
+        return round(self.peak_bytes / (1024 * 1024), 1)
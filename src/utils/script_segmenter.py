@@ -0,0 +1,177 @@
+"""
+Script Segmenter Utility
+Splits text into runs of one writing system in a single pass.
+
+Overlay text can mix scripts, e.g. a Latin brand name inside a Japanese
+message. Each run is drawn with a font for its script. Characters shared by
+all scripts (spaces, digits, punctuation) join the run they appear in.
+"""
+
+import bisect
+from typing import NamedTuple
+
+COMMON = "common"
+
+# (first codepoint, last codepoint, script), sorted by first codepoint.
+# Codepoints not listed are COMMON.
+SCRIPT_RANGES = [
+    (0x0041, 0x005A, "latin"),
+    (0x0061, 0x007A, "latin"),
+    (0x00AA, 0x00AA, "latin"),
+    (0x00BA, 0x00BA, "latin"),
+    (0x00C0, 0x00D6, "latin"),
+    (0x00D8, 0x00F6, "latin"),
+    (0x00F8, 0x024F, "latin"),
+    (0x0370, 0x03FF, "greek"),
+    (0x0400, 0x052F, "cyrillic"),
+    (0x0590, 0x05FF, "hebrew"),
+    (0x0600, 0x06FF, "arabic"),
+    (0x0750, 0x077F, "arabic"),
+    (0x0900, 0x097F, "devanagari"),
+    (0x0E00, 0x0E7F, "thai"),
+    (0x1100, 0x11FF, "hangul"),
+    (0x1E00, 0x1EFF, "latin"),
+    (0x1F00, 0x1FFF, "greek"),
+    (0x2C60, 0x2C7F, "latin"),
+    (0x2E80, 0x2FDF, "cjk"),
+    (0x3000, 0x30FF, "cjk"),
+    (0x3130, 0x318F, "hangul"),
+    (0x31F0, 0x31FF, "cjk"),
+    (0x3400, 0x4DBF, "cjk"),
+    (0x4E00, 0x9FFF, "cjk"),
+    (0xA720, 0xA7FF, "latin"),
+    (0xAC00, 0xD7AF, "hangul"),
+    (0xF900, 0xFAFF, "cjk"),
+    (0xFF00, 0xFFEF, "cjk"),
+    (0x20000, 0x2FFFF, "cjk"),
+]
+_STARTS = [start for start, _, _ in SCRIPT_RANGES]
+
+# Language whose font draws a script, where it differs from the message's language
+SCRIPT_LANGUAGES = {"cjk": "ja", "hangul": "ko"}
+
+# Languages whose fonts are chosen for CJK glyphs; other scripts in their
+# messages (e.g. a Latin brand name) are drawn with the default font instead
+CJK_LANGUAGES = {"ja", "zh", "ko"}
+
+# Characters that identify a Latin-script language, in detection priority order
+LANGUAGE_MARKERS = [
+    ("fr", "àâæçéèêëïîôùûüÿœÀÂÆÇÉÈÊËÏÎÔÙÛÜŸŒ"),
+    ("es", "áéíñóúüÁÉÍÑÓÚÜ¿¡"),
+    ("de", "äöüßÄÖÜ"),
+    ("it", "àèéìíîòóùúÀÈÉÌÍÎÒÓÙÚ"),
+    ("pt", "ãõÃÕ"),
+]
+_MARKER_PRIORITY = {}
+for _priority, (_language, _chars) in enumerate(LANGUAGE_MARKERS):
+    for _char in _chars:
+        _MARKER_PRIORITY.setdefault(_char, _priority)
+
+
+class ScriptRun(NamedTuple):
+    """A stretch of text in one script."""
+
+    script: str
+    start: int
+    end: int
+    text: str
+
+
+def script_of(char: str) -> str:
+    """
+    Get the script of a character.
+
+    Args:
+        char: Single character
+
+    Returns:
+        Script name, or COMMON for characters every script uses
+    """
+    codepoint = ord(char)
+    i = bisect.bisect_right(_STARTS, codepoint) - 1
+    if i >= 0 and codepoint <= SCRIPT_RANGES[i][1]:
+        return SCRIPT_RANGES[i][2]
+    return COMMON
+
+
+def segment(text: str) -> list[ScriptRun]:
+    """
+    Split text into script runs.
+
+    Common characters join the run they follow; leading ones join the first
+    run. Text with no script-specific characters is a single COMMON run.
+
+    Args:
+        text: Text to split
+
+    Returns:
+        Runs covering the text in order
+    """
+    runs: list[list] = []  # [script, start]
+    for i, char in enumerate(text):
+        script = script_of(char)
+        if script == COMMON:
+            if not runs:
+                runs.append([COMMON, 0])
+            continue
+        if not runs:
+            runs.append([script, 0])
+        elif runs[-1][0] == COMMON:
+            runs[-1][0] = script
+        elif runs[-1][0] != script:
+            runs.append([script, i])
+
+    bounds = [start for _, start in runs[1:]] + [len(text)]
+    return [
+        ScriptRun(script, start, end, text[start:end]) for (script, start), end in zip(runs, bounds)
+    ]
+
+
+def font_language(script: str, language: str) -> str:
+    """
+    Get the language whose font should draw a run.
+
+    Args:
+        script: Script of the run
+        language: Language of the whole message
+
+    Returns:
+        ISO 639-1 language code used to pick the run's font
+    """
+    if script in SCRIPT_LANGUAGES:
+        return SCRIPT_LANGUAGES[script]
+    if script != COMMON and language[:2] in CJK_LANGUAGES:
+        return "en"
+    return language
+
+
+def detect_language(text: str) -> str:
+    """
+    Detect language from text in one pass over its characters.
+
+    CJK characters mean Japanese and Hangul Korean; otherwise the first
+    language (in LANGUAGE_MARKERS order) with a characteristic accented
+    letter in the text wins.
+
+    Args:
+        text: Text to analyze
+
+    Returns:
+        ISO 639-1 language code
+    """
+    has_hangul = False
+    marker = len(LANGUAGE_MARKERS)
+    for char in text:
+        script = script_of(char)
+        if script == "cjk":
+            return "ja"
+        if script == "hangul":
+            has_hangul = True
+        elif char in _MARKER_PRIORITY:
+            marker = min(marker, _MARKER_PRIORITY[char])
+
+    if has_hangul:
+        return "ko"
+    if marker < len(LANGUAGE_MARKERS):
+        return LANGUAGE_MARKERS[marker][0]
+    return "en"
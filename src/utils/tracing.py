@@ -0,0 +1,227 @@
+"""
+Lightweight tracing for Creative Automation Pipeline.
+Records timed spans and exports them as Chrome trace-event JSON.
+
+A run activates a Tracer; services mark their work with ``span(...)`` or the
+``@traced(...)`` decorator. Spans inherit the product, aspect ratio and
+language set with ``attributes(...)``. Open the exported trace.json in
+Perfetto (https://ui.perfetto.dev) or chrome://tracing.
+
+When no tracer is active, spans cost a single context variable lookup.
+"""
+
+import functools
+import json
+import os
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any, Callable, Optional
+from src.utils.logger import app_logger
+
+TRACE_FILENAME = "trace.json"
+
+_active_tracer: ContextVar[Optional["Tracer"]] = ContextVar("active_tracer", default=None)
+_span_attributes: ContextVar[dict] = ContextVar("span_attributes", default={})
+
+
+class _NullSpan:
+    """Span used while tracing is disabled."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class Tracer:
+    """Collects spans of one run."""
+
+    def __init__(self):
+        """Initialize an empty trace."""
+        self.events: list[dict] = []
+        self._origin = time.perf_counter_ns()
+        self._pid = os.getpid()
+        self._threads: dict[int, int] = {}
+        self._lock = threading.Lock()
+
+    def _thread_id(self) -> int:
+        """Map the current thread to a small, stable track number."""
+        ident = threading.get_ident()
+        tid = self._threads.get(ident)
+        if tid is None:
+            with self._lock:
+                tid = self._threads[ident] = len(self._threads) + 1
+                self.events.append(
+                    {
+                        "name": "thread_name",
+                        "ph": "M",
+                        "pid": self._pid,
+                        "tid": tid,
+                        "args": {"name": threading.current_thread().name},
+                    }
+                )
+        return tid
+
+    @contextmanager
+    def span(self, name: str, category: str = "pipeline", **attrs: Any):
+        """
+        Time a block of work.
+
+        Args:
+            name: Span name
+            category: Span category (e.g. network, cpu, disk)
+            **attrs: Attributes added to the active product/ratio/language
+        """
+        args = {**_span_attributes.get(), **attrs}
+        tid = self._thread_id()
+        start = time.perf_counter_ns()
+        try:
+            yield
+        except BaseException as e:
+            args["error"] = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            end = time.perf_counter_ns()
+            event = {
+                "name": name,
+                "cat": category,
+                "ph": "X",
+                "ts": (start - self._origin) / 1000,
+                "dur": (end - start) / 1000,
+                "pid": self._pid,
+                "tid": tid,
+                "args": {k: v for k, v in args.items() if v is not None},
+            }
+            with self._lock:
+                self.events.append(event)
+
+    def summary(self) -> dict[str, float]:
+        """
+        Get the total time spent per span name.
+
+        Returns:
+            Dictionary of span name to total milliseconds
+        """
+        totals: dict[str, float] = {}
+        with self._lock:
+            for event in self.events:
+                if event["ph"] == "X":
+                    totals[event["name"]] = totals.get(event["name"], 0.0) + event["dur"] / 1000
+        return totals
+
+    def export(self, path: Path) -> Optional[Path]:
+        """
+        Write the trace as Chrome trace-event JSON.
+
+        Args:
+            path: Destination file
+
+        Returns:
+            Path to the written trace, or None if writing failed
+        """
+        path = Path(path)
+        with self._lock:
+            data = {"traceEvents": list(self.events), "displayTimeUnit": "ms"}
+
+        try:
+            fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    json.dump(data, f, ensure_ascii=False)
+                os.replace(tmp_name, path)
+            finally:
+                Path(tmp_name).unlink(missing_ok=True)
+            app_logger.info(f" Saved trace: {path.name} ({len(data['traceEvents'])} events)")
+            return path
+        except Exception as e:
+            app_logger.error(f"Failed to save trace: {e}")
+            return None
+
+
+def current_tracer() -> Optional[Tracer]:
+    """Get the tracer of the current run, if tracing is enabled."""
+    return _active_tracer.get()
+
+
+@contextmanager
+def activate(tracer: Optional[Tracer]):
+    """
+    Make a tracer current for a block (no-op for None).
+
+    Args:
+        tracer: Tracer receiving spans
+    """
+    token = _active_tracer.set(tracer)
+    try:
+        yield tracer
+    finally:
+        _active_tracer.reset(token)
+
+
+@contextmanager
+def attributes(**attrs: Any):
+    """
+    Attach attributes (product_id, aspect_ratio, language, ...) to nested spans.
+
+    Args:
+        **attrs: Attribute values
+    """
+    token = _span_attributes.set({**_span_attributes.get(), **attrs})
+    try:
+        yield
+    finally:
+        _span_attributes.reset(token)
+
+
+def span(name: str, category: str = "pipeline", **attrs: Any):
+    """
+    Time a block of work if tracing is enabled.
+
+    Args:
+        name: Span name
+        category: Span category (e.g. network, cpu, disk)
+        **attrs: Extra span attributes
+
+    Returns:
+        Context manager
+    """
+    tracer = _active_tracer.get()
+    if tracer is None:
+        return _NULL_SPAN
+    return tracer.span(name, category, **attrs)
+
+
+def traced(name: Optional[str] = None, category: str = "pipeline") -> Callable:
+    """
+    Decorate a function so each call is recorded as a span.
+
+    Args:
+        name: Span name (defaults to the function's qualified name)
+        category: Span category (e.g. network, cpu, disk)
+
+    Returns:
+        Decorator
+    """
+
+    def decorator(fn: Callable) -> Callable:
+        span_name = name or fn.__qualname__
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            tracer = _active_tracer.get()
+            if tracer is None:
+                return fn(*args, **kwargs)
+            with tracer.span(span_name, category):
+                return fn(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
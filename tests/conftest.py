@@ -0,0 +1,111 @@
+"""
+Shared Test Fixtures
+Points the pipeline at a temporary directory and writes test briefs.
+"""
+
+import json
+import sys
+from pathlib import Path
+from typing import Iterable, Optional, Union
+import pytest
+from PIL import Image
+
+# Add parent directory (project root) to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.config import settings
+
+
+class CampaignEnv:
+    """Writes product images and campaign briefs under a temporary directory."""
+
+    def __init__(self, tmp_path: Path):
+        """
+        Initialize CampaignEnv.
+
+        Args:
+            tmp_path: Directory holding the assets, briefs, outputs and cache
+        """
+        self.tmp_path = tmp_path
+        self.assets_dir = tmp_path / "assets"
+        self.assets_dir.mkdir(exist_ok=True)
+
+    def image(
+        self,
+        filename: str,
+        size: tuple[int, int] = (300, 200),
+        color: tuple[int, int, int] = (200, 30, 30),
+    ) -> Path:
+        """Draw a solid image into the assets directory."""
+        path = self.assets_dir / filename
+        Image.new("RGB", size, color).save(path)
+        return path
+
+    def product(self, index: int, image: bool = True) -> dict:
+        """
+        Describe product P<index> using the asset p<index>.png.
+
+        Args:
+            index: Product number
+            image: Draw the asset (False leaves it missing)
+
+        Returns:
+            Product entry of a brief
+        """
+        filename = f"p{index}.png"
+        if image and not (self.assets_dir / filename).exists():
+            self.image(filename, color=((40 * index) % 256, 120, 200))
+        return {
+            "product_id": f"P{index}",
+            "product_name": f"Product {index}",
+            "description": "test product",
+            "existing_image": filename,
+        }
+
+    def __call__(
+        self,
+        products: Union[int, Iterable[dict]] = 2,
+        aspect_ratios: Iterable[str] = ("1:1", "16:9"),
+        message: str = "Summer Sale",
+        campaign_id: str = "CAMP_TEST",
+        filename: Optional[str] = None,
+    ) -> Path:
+        """
+        Write a brief.
+
+        Args:
+            products: Number of products with drawn assets, or product entries
+            aspect_ratios: Aspect ratios to render
+            message: Campaign message
+            campaign_id: Campaign ID
+            filename: Brief file name (defaults to <campaign_id>.json)
+
+        Returns:
+            Path to the brief file
+        """
+        if isinstance(products, int):
+            products = [self.product(i) for i in range(products)]
+        brief = {
+            "campaign_id": campaign_id,
+            "campaign_name": "Test Campaign",
+            "target_market": "US",
+            "language": "en",
+            "target_audience": "Testers",
+            "campaign_message": message,
+            "aspect_ratios": list(aspect_ratios),
+            "products": list(products),
+        }
+        path = self.tmp_path / (filename or f"{campaign_id}.json")
+        path.write_text(json.dumps(brief))
+        return path
+
+
+@pytest.fixture
+def campaign_env(tmp_path, monkeypatch) -> CampaignEnv:
+    """Point the pipeline's key, assets, outputs and cache at tmp_path; returns the brief writer."""
+    monkeypatch.setattr(settings, "openai_api_key", "")
+    monkeypatch.setattr(settings, "input_assets_dir", tmp_path / "assets")
+    monkeypatch.setattr(settings, "output_base_dir", tmp_path / "output")
+    monkeypatch.setattr(settings, "cache_dir", tmp_path / "cache")
+    return CampaignEnv(tmp_path)
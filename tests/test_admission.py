@@ -0,0 +1,149 @@
+"""
+Admission Control Test Script
+Tests library matching, generation slots and load shedding in the pipeline.
+"""
+
+import sys
+import threading
+import time
+from pathlib import Path
+from PIL import Image
+
+# Add parent directory (project root) to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.config import settings
+from src.models.campaign import Product
+from src.services.admission import AdmissionController
+from src.services.asset_manager import AssetManager
+from src.services.image_generator import ImageGenerator
+
+
+def _library(tmp_path) -> AssetManager:
+    assets = tmp_path / "assets"
+    assets.mkdir(exist_ok=True)
+    Image.new("RGB", (300, 200), (20, 160, 60)).save(assets / "green.png")
+    Image.new("RGB", (300, 200), (20, 60, 160)).save(assets / "blue_gadget_generated.png")
+    return AssetManager(assets)
+
+
+def _product(product_id: str, name: str) -> Product:
+    return Product(product_id=product_id, product_name=name, description=name, generate_image=True)
+
+
+def test_find_similar(tmp_path):
+    """Test earlier generations of a product are found by name."""
+    print(" Testing library matching...")
+
+    library = _library(tmp_path)
+    assert library.find_similar("Blue Gadget").name == "blue_gadget_generated.png"
+    assert library.find_similar("Green").name == "green.png"
+    assert library.find_similar("Coffee Mug") is None
+    print("    Near-duplicates matched")
+
+
+def test_controller_sheds_when_saturated(tmp_path):
+    """Test requests are served from the library or deferred once the queue is full."""
+    print("\n Testing admission decisions...")
+
+    library = _library(tmp_path)
+    controller = AdmissionController(concurrency=1, queue_limit=2)
+    assert controller.admit(_product("P1", "Blue Gadget"), library).action == "generate"
+
+    release = threading.Event()
+
+    def generate():
+        with controller.slot():
+            release.wait(5)
+
+    threads = [threading.Thread(target=generate) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    while controller.queue_depth < 2:
+        time.sleep(0.01)
+
+    assert controller.is_saturated()
+    match = controller.admit(_product("P1", "Blue Gadget"), library)
+    assert match.action == "library" and match.path.name == "blue_gadget_generated.png"
+    assert controller.admit(_product("P2", "Red Thing"), library, may_defer=True).action == "defer"
+    assert controller.admit(_product("P2", "Red Thing"), library).action == "generate"
+
+    metrics = controller.metrics()
+    assert metrics["queue_depth"] == 2 and metrics["in_flight"] == 1
+    assert metrics["library"] == 1 and metrics["deferred"] == 1 and metrics["shed"] == 2
+
+    release.set()
+    for thread in threads:
+        thread.join()
+    assert controller.metrics()["in_flight"] == 0 and not controller.is_saturated()
+    print("    Load shed while saturated")
+
+
+class FakeGenerator:
+    """Image generator that records requests instead of calling the API."""
+
+    build_prompt = staticmethod(ImageGenerator.build_prompt)
+
+    def __init__(self):
+        self.requests = []
+
+    def is_available(self) -> bool:
+        return True
+
+    def generate_product_image(self, product_name, description, **kwargs):
+        self.requests.append(product_name)
+        return Image.new("RGB", (300, 200), (160, 20, 20))
+
+
+def test_pipeline_under_load(campaign_env, tmp_path, monkeypatch):
+    """Test a saturated pipeline uses existing and library images and defers the rest."""
+    print("\n Testing pipeline under load...")
+
+    monkeypatch.setattr(settings, "retry_base_seconds", 0.0)
+    _library(tmp_path)
+
+    brief_path = campaign_env(
+        [
+            {
+                "product_id": "P1",
+                "product_name": "Green",
+                "description": "green",
+                "existing_image": "green.png",
+            },
+            {
+                "product_id": "P2",
+                "product_name": "Blue Gadget",
+                "description": "blue",
+                "generate_image": True,
+            },
+            {
+                "product_id": "P3",
+                "product_name": "Red Thing",
+                "description": "red",
+                "generate_image": True,
+            },
+        ]
+    )
+
+    from src.services.pipeline import CampaignPipeline
+    from src.services.run_manifest import RunManifest
+
+    pipeline = CampaignPipeline()
+    pipeline.image_generator = FakeGenerator()
+    pipeline.admission = AdmissionController(concurrency=1, queue_limit=1)
+    monkeypatch.setattr(pipeline.admission, "is_saturated", lambda: True)
+
+    output = pipeline.run(brief_path)
+
+    assert output.success_count() == 6 and not output.errors
+    # Blue Gadget came from the library; Red Thing was deferred, then generated
+    assert pipeline.image_generator.requests == ["Red Thing"]
+    metrics = pipeline.admission.metrics()
+    assert metrics["library"] == 1 and metrics["deferred"] == 1 and metrics["admitted"] == 1
+
+    manifest = RunManifest.load(Path(output.output_directory))
+    deferred = [r for r in manifest.records if r["event"] == "failed"]
+    assert {r["product_id"] for r in deferred} == {"P3"}
+    assert all(r["transient"] for r in deferred)
+    print("    Existing and library images used, generation deferred")
@@ -0,0 +1,131 @@
+"""
+Batch Runner Test Script
+Tests brief collection, parallel execution and the CLI exit codes.
+"""
+
+import json
+import sys
+from datetime import datetime
+from pathlib import Path
+
+# Add parent directory (project root) to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.models.campaign import CampaignOutput
+from src.services.batch_runner import BatchRunner
+from src.services.output_manager import OutputManager
+from src import cli
+from src.utils.logger import setup_logger
+
+
+class FakePipeline:
+    """Pipeline stand-in that fails for briefs whose name contains 'bad'."""
+
+    def run(self, brief_path: Path) -> CampaignOutput:
+        if "bad" in brief_path.name:
+            raise ValueError(f"Failed to parse {brief_path.name}")
+
+        output = CampaignOutput(
+            campaign_id=brief_path.stem,
+            campaign_name=brief_path.stem,
+            language="en",
+            generated_at="2025-01-01T00:00:00",
+            output_directory=f"data/output/{brief_path.stem}",
+        )
+        output.add_asset("Product", "1:1", f"{brief_path.stem}/Product/1x1.png")
+        if "partial" in brief_path.name:
+            output.add_error("Failed to create 9:16 for Product: boom")
+        return output
+
+
+def _write_briefs(directory: Path, names: list[str]) -> list[Path]:
+    paths = []
+    for name in names:
+        path = directory / name
+        path.write_text("{}")
+        paths.append(path)
+    return paths
+
+
+def test_collect_briefs(tmp_path):
+    """Test directory, glob and file expansion."""
+    print(" Testing brief collection...")
+
+    _write_briefs(tmp_path, ["a.json", "b.yaml", "notes.txt"])
+
+    from_dir = BatchRunner.collect_briefs([str(tmp_path)])
+    assert [p.name for p in from_dir] == ["a.json", "b.yaml"]
+
+    from_glob = BatchRunner.collect_briefs([str(tmp_path / "*.json"), str(tmp_path / "a.json")])
+    assert [p.name for p in from_glob] == ["a.json"]
+
+    assert BatchRunner.collect_briefs([str(tmp_path / "missing*.json")]) == []
+    print("    Brief collection works")
+
+
+def test_batch_run_summary(tmp_path):
+    """Test results are reported per brief in input order."""
+    print("\n Testing batch run...")
+
+    paths = _write_briefs(tmp_path, ["one.json", "bad.json", "partial.json", "two.json"])
+    summary = BatchRunner(FakePipeline, max_workers=3).run(paths)
+
+    assert [r.status for r in summary.results] == ["succeeded", "failed", "partial", "succeeded"]
+    assert summary.succeeded == 2 and summary.partial == 1 and summary.failed == 1
+    assert summary.has_failures()
+    assert summary.to_dict()["total"] == 4
+    print(f"    Batch summary: {summary.succeeded} ok, {summary.failed} failed")
+
+
+def test_cli_exit_codes(tmp_path, monkeypatch, capsys):
+    """Test the CLI prints JSON and returns nonzero on failure."""
+    print("\n Testing CLI exit codes...")
+
+    monkeypatch.setattr(cli, "_pipeline_factory", lambda guidelines: FakePipeline)
+
+    _write_briefs(tmp_path, ["one.json", "bad.json"])
+    capsys.readouterr()
+
+    assert cli.main(["run", str(tmp_path / "one.json")]) == cli.EXIT_OK
+    assert json.loads(capsys.readouterr().out)["succeeded"] == 1
+
+    assert cli.main(["run", str(tmp_path), "-w", "2"]) == cli.EXIT_FAILURE
+    assert json.loads(capsys.readouterr().out)["failed"] == 1
+
+    assert cli.main(["run", str(tmp_path / "nothing*.json")]) == cli.EXIT_USAGE
+
+    # Restore console logging to the real stdout
+    setup_logger()
+    print("    CLI exit codes work")
+
+
+def test_same_campaign_runs_get_own_directories(campaign_env, tmp_path):
+    """Test concurrent briefs with one campaign_id never share a directory."""
+    print("\n Testing same-id runs...")
+
+    # Same second, same id: each call claims a new directory
+    manager = OutputManager(tmp_path / "dirs")
+    now = datetime(2025, 1, 1, 12, 0, 0)
+    names = [manager.create_campaign_directory("CAMP", now).name for _ in range(3)]
+    assert names == ["CAMP_20250101_120000", "CAMP_20250101_120000_2", "CAMP_20250101_120000_3"]
+
+    briefs = [
+        campaign_env(
+            1,
+            message=message,
+            campaign_id="CAMP_SAME",
+            filename=f"{message.split()[0].lower()}.json",
+        )
+        for message in ["Summer Sale", "Winter Sale"]
+    ]
+
+    from src.services.pipeline import CampaignPipeline
+
+    summary = BatchRunner(CampaignPipeline, max_workers=2).run(briefs)
+    assert [r.status for r in summary.results] == ["succeeded", "succeeded"]
+    directories = {Path(r.output_directory) for r in summary.results}
+    assert len(directories) == 2
+    for directory in directories:
+        assert json.loads((directory / "metadata.json").read_text())["assets_count"] == 2
+    print(f"    Directories: {sorted(d.name for d in directories)}")
@@ -0,0 +1,173 @@
+"""
+Build Cache Test Script
+Tests content-addressed storage and incremental pipeline re-runs.
+"""
+
+import sys
+from pathlib import Path
+import pytest
+from PIL import Image
+
+# Add parent directory (project root) to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.config import settings
+from src.services.build_cache import BuildCache
+from src.services.pipeline import CampaignPipeline
+
+
+def test_object_store(tmp_path):
+    """Test keys are stable and objects round-trip."""
+    print(" Testing object store...")
+
+    cache = BuildCache(tmp_path / "cache")
+    assert cache.make_key(a=1, b="x") == cache.make_key(b="x", a=1)
+    assert cache.make_key(a=1) != cache.make_key(a=2)
+
+    source = tmp_path / "asset.png"
+    Image.new("RGB", (8, 8)).save(source)
+    key = cache.make_key(name="asset")
+
+    assert cache.get_object(key) is None
+    stored = cache.put_object(key, source)
+    assert cache.get_object(key) == stored
+    assert stored.read_bytes() == source.read_bytes()
+
+    cache.put_value(key, {"text": "Hola"})
+    assert cache.get_value(key) == {"text": "Hola"}
+    print("    Object store works")
+
+
+def test_concurrent_writers_of_one_file(tmp_path):
+    """Test runs saving the same image or asset at once never publish or lose a partial file."""
+    print("\n Testing concurrent atomic writes...")
+
+    from concurrent.futures import ThreadPoolExecutor
+    from src.services.asset_manager import AssetManager
+    from src.services.output_manager import OutputManager
+
+    assets = AssetManager(tmp_path / "assets")
+    outputs = OutputManager()
+    campaign_dir = tmp_path / "campaign"
+    images = [Image.effect_noise((200, 200), 20 + i).convert("RGB") for i in range(8)]
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        saved = list(
+            pool.map(lambda image: assets.save_image(image, "P1_generated.png"), images * 4)
+        )
+        written = list(
+            pool.map(lambda image: outputs.save_asset(image, campaign_dir, "P1", "1:1"), images * 4)
+        )
+
+    assert all(saved) and all(written)
+    for path in (tmp_path / "assets" / "P1_generated.png", written[0]):
+        with Image.open(path) as image:
+            image.load()
+        assert any(image.tobytes() == source.tobytes() for source in images)
+        assert [p.name for p in path.parent.iterdir()] == [path.name]
+    print("    Every writer published a whole file")
+
+
+def test_incremental_rerun(campaign_env, monkeypatch):
+    """Test a re-run renders nothing and a message change renders everything."""
+    print("\n Testing incremental re-run...")
+
+    monkeypatch.setattr(settings, "incremental_builds", True)
+    ratios = ("1:1", "9:16")
+    pipeline = CampaignPipeline()
+
+    renders = []
+    original_overlay = pipeline.image_processor.add_text_overlay
+    monkeypatch.setattr(
+        pipeline.image_processor,
+        "add_text_overlay",
+        lambda *args, **kwargs: renders.append(1) or original_overlay(*args, **kwargs),
+    )
+
+    first = pipeline.run(campaign_env(aspect_ratios=ratios, message="Summer Sale"))
+    assert first.success_count() == 4 and len(renders) == 4
+
+    renders.clear()
+    second = pipeline.run(campaign_env(aspect_ratios=ratios, message="Summer Sale"))
+    assert second.success_count() == 4 and not second.has_errors()
+    assert renders == []
+
+    asset = settings.output_base_dir / second.generated_assets[0]["filepath"]
+    assert asset.stat().st_nlink > 1
+
+    renders.clear()
+    third = pipeline.run(campaign_env(aspect_ratios=ratios, message="Winter Sale"))
+    assert third.success_count() == 4 and len(renders) == 4
+    print("    Unchanged assets are reused, changed ones re-rendered")
+
+
+def test_decode_scale_is_part_of_asset_key(campaign_env, monkeypatch):
+    """Test an asset from a reduced-scale JPEG is not reused when the source decodes larger."""
+    print("\n Testing decode scale in asset keys...")
+
+    from src.services.planner import CampaignPlanner
+
+    monkeypatch.setattr(settings, "incremental_builds", True)
+    monkeypatch.setattr(settings, "max_image_size", 512)
+    Image.effect_noise((3200, 1800), 40).convert("RGB").save(campaign_env.assets_dir / "photo.jpg")
+    pipeline = CampaignPipeline()
+
+    renders = []
+    original_overlay = pipeline.image_processor.add_text_overlay
+    monkeypatch.setattr(
+        pipeline.image_processor,
+        "add_text_overlay",
+        lambda *args, **kwargs: renders.append(1) or original_overlay(*args, **kwargs),
+    )
+
+    def brief(ratios):
+        photo = {**campaign_env.product(1, image=False), "existing_image": "photo.jpg"}
+        return campaign_env([photo], aspect_ratios=ratios)
+
+    # 16:9 alone decodes at 1/4 scale; adding 1:1 needs the 1/2 scale
+    assert pipeline.run(brief(["16:9"])).success_count() == 1
+    assert pipeline.run(brief(["16:9"])).success_count() == 1 and len(renders) == 1
+
+    both = brief(["16:9", "1:1"])
+    planned = CampaignPlanner(pipeline).plan(pipeline.brief_parser.parse_file(both))
+    assert planned.cached_assets == 0
+    assert pipeline.run(both).success_count() == 2 and len(renders) == 3
+
+    planned = CampaignPlanner(pipeline).plan(pipeline.brief_parser.parse_file(both))
+    assert planned.cached_assets == 2
+    print("    Assets keyed by the size their source was decoded at")
+
+
+def test_resize_quality_is_chosen_per_run(campaign_env, monkeypatch):
+    """Test each run renders with its own tier, keeps it on resume and leaves settings alone."""
+    print("\n Testing per-run resize quality...")
+
+    from src.services.run_manifest import RunManifest
+
+    monkeypatch.setattr(settings, "incremental_builds", True)
+    default = settings.resize_quality
+    pipeline = CampaignPipeline()
+
+    tiers = []
+    original_resize = pipeline.image_processor.resize_to_aspect_ratio
+    monkeypatch.setattr(
+        pipeline.image_processor,
+        "resize_to_aspect_ratio",
+        lambda *args, **kwargs: tiers.append(kwargs["quality"]) or original_resize(*args, **kwargs),
+    )
+
+    fast = pipeline.run(campaign_env(1), resize_quality="fast")
+    best = pipeline.run(campaign_env(1), resize_quality="best")
+    assert fast.success_count() == best.success_count() == 2
+    assert tiers == ["fast", "fast", "best", "best"]
+    assert settings.resize_quality == default
+
+    campaign_dir = Path(best.output_directory)
+    assert RunManifest.load(campaign_dir).header["resize_quality"] == "best"
+    state, _ = pipeline._load_run(campaign_dir.name)
+    assert state.resize_quality == "best"
+
+    with pytest.raises(ValueError, match="Unknown resize quality"):
+        pipeline.run(campaign_env(1), resize_quality="sharpest")
+    print("    Tiers chosen per run and recorded in the manifest")
@@ -0,0 +1,154 @@
+"""
+Cancellation Test Script
+Tests cancellation tokens, stage time budgets and the watchdog.
+"""
+
+import sys
+import threading
+import time
+from pathlib import Path
+import pytest
+
+# Add parent directory (project root) to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.config import settings
+from src.services.stage_graph import ResourceClass, Stage, StageGraph
+from src.utils.cancellation import CancellationToken, RunCancelled, StageTimeout, Watchdog
+
+CELLS = [{"product_id": p, "aspect_ratio": "1:1", "language": "en"} for p in ("P1", "P2", "P3")]
+
+
+def test_stage_timeout_abandons_task():
+    """Test a hung task fails with StageTimeout while other cells finish."""
+    print(" Testing stage time budgets...")
+
+    release = threading.Event()
+
+    def fetch(ctx):
+        if ctx.scope["product_id"] == "P2":
+            release.wait(5)
+        return ctx.scope["product_id"]
+
+    graph = StageGraph(
+        [
+            Stage(
+                "fetch", fetch, scope=("product_id",), resource=ResourceClass.NETWORK, timeout=0.2
+            ),
+            Stage(
+                "render",
+                lambda ctx, fetch: fetch,
+                inputs=("fetch",),
+                scope=("product_id", "aspect_ratio", "language"),
+            ),
+        ],
+        limits={ResourceClass.NETWORK: 1},
+    )
+
+    errors = []
+    started = time.monotonic()
+    report = graph.execute(CELLS, on_error=lambda ctx, e: errors.append((ctx.scope, e)))
+    elapsed = time.monotonic() - started
+    release.set()
+
+    assert elapsed < 2
+    assert report.timed_out == 1 and report.cancelled == 1
+    assert report.completed == 4
+    assert errors[0][0] == {"product_id": "P2"} and isinstance(errors[0][1], StageTimeout)
+    print(f"    Hung task abandoned after {elapsed:.2f}s")
+
+
+def test_cancel_frees_slots_quickly():
+    """Test cancelling stops the graph within a second, even with blocked tasks."""
+    print("\n Testing graph cancellation...")
+
+    release = threading.Event()
+    started_tasks = []
+
+    def fetch(ctx):
+        started_tasks.append(ctx.scope["product_id"])
+        release.wait(10)
+        return ctx.scope
+
+    graph = StageGraph(
+        [Stage("fetch", fetch, scope=("product_id",), resource=ResourceClass.NETWORK)],
+        limits={ResourceClass.NETWORK: 2},
+    )
+    token = CancellationToken()
+    threading.Timer(0.2, token.cancel, args=("stop",)).start()
+
+    started = time.monotonic()
+    with pytest.raises(RunCancelled, match="stop"):
+        graph.execute(CELLS, token=token)
+    elapsed = time.monotonic() - started
+    release.set()
+
+    assert elapsed < 1.2
+    assert len(started_tasks) == 2
+    print(f"    Graph stopped {elapsed - 0.2:.2f}s after cancel")
+
+
+def test_watchdog_cancels_stalled_work():
+    """Test the watchdog cancels work that stops touching its watch."""
+    print("\n Testing watchdog...")
+
+    watchdog = Watchdog(stall_seconds=0.2)
+    busy, stalled = CancellationToken(), CancellationToken()
+
+    with watchdog.watch(busy, "busy") as busy_watch, watchdog.watch(stalled, "stalled"):
+        for _ in range(8):
+            busy_watch.touch()
+            time.sleep(0.05)
+        assert stalled.wait(1.0)
+        assert not busy.cancelled
+
+    assert "No progress" in stalled.reason
+    print("    Stalled work cancelled")
+
+
+def test_cancelled_run_can_resume(campaign_env, tmp_path, monkeypatch):
+    """Test a cancelled run keeps its assets, is marked in the manifest and resumes."""
+    print("\n Testing run cancellation...")
+
+    monkeypatch.setattr(settings, "stage_network_workers", 1)
+    brief_path = campaign_env([campaign_env.product(1), campaign_env.product(2)])
+
+    from src.services.pipeline import CampaignPipeline
+    from src.services.run_manifest import RunManifest
+
+    # P2's source hangs until the run is cancelled
+    hang = {"enabled": True}
+    original = CampaignPipeline._source_stage
+
+    def source(self, ctx):
+        if hang["enabled"] and ctx.scope["product_id"] == "P2":
+            ctx.state.token.wait(10)
+        return original(self, ctx)
+
+    monkeypatch.setattr(CampaignPipeline, "_source_stage", source)
+
+    token = CancellationToken()
+    events = []
+
+    def on_event(event):
+        events.append(event)
+        if event.kind == "asset_rendered" and event.completed == 2:
+            token.cancel("Stopped by test")
+
+    started = time.monotonic()
+    with pytest.raises(RunCancelled):
+        CampaignPipeline().run(brief_path, on_event=on_event, token=token)
+    assert time.monotonic() - started < 5
+    assert events[-1].kind == "run_cancelled"
+
+    campaign_dir = next((tmp_path / "output").iterdir())
+    manifest = RunManifest.load(campaign_dir)
+    assert any(r["event"] == "cancelled" for r in manifest.records)
+    assert not manifest.is_finished()
+    assert len(manifest.completed_cells()) == 2
+
+    hang["enabled"] = False
+    output = CampaignPipeline().resume(campaign_dir.name)
+    assert output.success_count() == 4 and not output.errors
+    print("    Cancelled run resumed")
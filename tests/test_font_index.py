@@ -0,0 +1,89 @@
+"""
+Font Index Test Script
+Tests cmap coverage reading, the persisted index and glyph-aware font choice.
+"""
+
+import shutil
+import sys
+from pathlib import Path
+
+# Add parent directory (project root) to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.config import settings
+from src.services.font_index import FontIndex, read_font_info
+
+FONTS = project_root / "data" / "fonts"
+DEJAVU = FONTS / "latin" / "DejaVuSans-Bold.ttf"
+NOTO = FONTS / "fallback" / "NotoSans.ttf"
+
+
+def _fonts_dir(tmp_path) -> Path:
+    """Font tree whose Latin font (Noto Sans) lacks symbols the fallback (DejaVu) has."""
+    fonts_dir = tmp_path / "fonts"
+    (fonts_dir / "latin").mkdir(parents=True)
+    (fonts_dir / "fallback").mkdir()
+    shutil.copy(NOTO, fonts_dir / "latin" / "NotoSans-Bold.ttf")
+    shutil.copy(DEJAVU, fonts_dir / "fallback" / "DejaVuSans-Bold.ttf")
+    return fonts_dir
+
+
+def test_read_font_info():
+    """Test names, weight and coverage are read from the font tables."""
+    print(" Testing font info...")
+
+    info = read_font_info(DEJAVU)
+    assert info.family == "DejaVu Sans" and info.style == "Bold" and info.weight == 700
+    assert all(info.covers(ord(c)) for c in "Aaßé€Ж")
+    assert not info.covers(ord("あ"))
+    assert read_font_info(NOTO).weight == 400
+    print(f"    {len(info.ranges)} ranges covered")
+
+
+def test_index_is_persisted(tmp_path):
+    """Test the saved index is reused until a font directory changes."""
+    print("\n Testing persisted index...")
+
+    fonts_dir = _fonts_dir(tmp_path)
+    index_path = tmp_path / "font_index.json"
+    index = FontIndex(fonts_dir, index_path)
+    assert len(index.fonts) == 2 and index_path.exists()
+
+    # A saved index is loaded, not rebuilt
+    index_path.write_text(index_path.read_text().replace("DejaVu Sans", "Saved Family"))
+    assert (
+        FontIndex(fonts_dir, index_path).info(fonts_dir / "fallback" / "DejaVuSans-Bold.ttf").family
+        == "Saved Family"
+    )
+
+    # Adding a font rebuilds it
+    shutil.copy(NOTO, fonts_dir / "fallback" / "NotoSans.ttf")
+    assert not index.is_current()
+    rebuilt = FontIndex(fonts_dir, index_path)
+    assert len(rebuilt.fonts) == 3
+    assert rebuilt.info(fonts_dir / "fallback" / "DejaVuSans-Bold.ttf").family == "DejaVu Sans"
+    print("    Index reused, then rebuilt")
+
+
+def test_font_chosen_by_coverage(tmp_path, monkeypatch):
+    """Test text with characters the language's font lacks gets a covering font."""
+    print("\n Testing glyph-aware selection...")
+
+    monkeypatch.setattr(settings, "cache_dir", tmp_path / "cache")
+    from src.services.image_processor import ImageProcessor
+
+    processor = ImageProcessor()
+    processor.fonts_dir = _fonts_dir(tmp_path)
+    latin = processor.fonts_dir / "latin" / "NotoSans-Bold.ttf"
+    fallback = processor.fonts_dir / "fallback" / "DejaVuSans-Bold.ttf"
+
+    assert processor.get_font_path("en") == latin
+    assert processor.select_font_path("Summer Sale", "en") == latin
+    assert processor.select_font_path("Summer Sale ☀", "en") == fallback
+    assert processor.font_index.missing(latin, "Sale ☀ →") == "→☀"
+    assert processor.render_signature("Sale ☀", "1:1", language="en")["font_paths"] == [
+        str(fallback)
+    ]
+    assert processor.load_font("en", 30, text="Sale ☀").path == str(fallback)
+    print("    Covering font chosen")
@@ -0,0 +1,83 @@
+"""
+Font Registry Test Script
+Tests shared font loading, size-aware eviction and preloading.
+"""
+
+import sys
+import threading
+from pathlib import Path
+
+# Add parent directory (project root) to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.services.font_registry import FontRegistry, estimate_font_bytes
+from src.services.image_processor import ImageProcessor
+
+
+def test_fonts_shared_between_processors():
+    """Test processors get the same font object from the registry."""
+    print(" Testing shared fonts...")
+
+    first, second = ImageProcessor(), ImageProcessor()
+    registry = FontRegistry(max_bytes=64 * 1024 * 1024)
+    first.fonts = second.fonts = registry
+
+    font = first.load_font("en", 33)
+    assert second.load_font("en", 33) is font
+    assert second.load_font("fr", 33) is font  # same font file
+    assert first.load_font("en", 34) is not font
+
+    metrics = registry.metrics()
+    assert metrics["loads"] == 2 and metrics["hits"] == 2
+    print("    One font object per file and size")
+
+
+def test_concurrent_loads_are_deduplicated():
+    """Test threads asking for the same font trigger one load."""
+    print("\n Testing concurrent loads...")
+
+    font_path = ImageProcessor().get_font_path("en")
+    registry = FontRegistry(max_bytes=64 * 1024 * 1024)
+    fonts = []
+    threads = [
+        threading.Thread(target=lambda: fonts.append(registry.get(font_path, 40))) for _ in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len({id(font) for font in fonts}) == 1
+    assert registry.metrics()["loads"] == 1
+    print("    Loaded once")
+
+
+def test_eviction_is_size_aware():
+    """Test a large size pushes out several small ones."""
+    print("\n Testing size-aware eviction...")
+
+    font_path = ImageProcessor().get_font_path("en")
+    registry = FontRegistry(max_bytes=estimate_font_bytes(20) * 4)
+    for size in (20, 21, 22):
+        registry.get(font_path, size)
+    assert registry.metrics()["fonts"] == 3
+
+    registry.get(font_path, 40)
+    metrics = registry.metrics()
+    assert metrics["fonts"] < 3 and metrics["evictions"] >= 2
+    assert metrics["bytes"] <= metrics["max_bytes"]
+    print(f"    {metrics['evictions']} small fonts evicted")
+
+
+def test_preload_fonts():
+    """Test preloading makes the first render a registry hit."""
+    print("\n Testing preload...")
+
+    processor = ImageProcessor()
+    processor.fonts = FontRegistry(max_bytes=64 * 1024 * 1024)
+
+    assert processor.preload_fonts(["en", "de"], [24, 48]) == 2  # en and de share a font file
+    processor.load_font("de", 48)
+    assert processor.fonts.metrics()["loads"] == 2
+    print("    Fonts preloaded")
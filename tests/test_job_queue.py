@@ -0,0 +1,244 @@
+"""
+Job Queue Test Script
+Tests leasing, retries and multi-worker rendering from the SQLite job queue.
+"""
+
+import json
+import sys
+import threading
+import time
+from pathlib import Path
+from PIL import Image
+
+# Add parent directory (project root) to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.config import settings
+
+
+def test_lease_expiry_and_backoff(campaign_env, tmp_path):
+    """Test expired leases are re-leased and failures back off, then fail."""
+    print(" Testing leases and retries...")
+
+    from src.services.job_queue import JobQueue
+
+    brief_path = campaign_env(1)
+    queue = JobQueue(
+        tmp_path / "jobs.db", lease_seconds=0.05, max_attempts=2, retry_base_seconds=0.05
+    )
+    run = queue.enqueue_brief(brief_path)
+    assert queue.stats(run.run_id)["queued"] == 2
+
+    first = queue.lease("w1")
+    second = queue.lease("w1")
+    assert first.id != second.id
+    assert queue.lease("w2") is None
+
+    # w1 dies; its leases expire and w2 picks the job up
+    time.sleep(0.1)
+    stolen = queue.lease("w2")
+    assert stolen.id == first.id and stolen.attempts == 2
+    assert not queue.heartbeat(first.id, "w1")
+    assert not queue.complete(first.id, "w1", "lost.png")
+    assert queue.complete(stolen.id, "w2", "done.png")
+
+    # The other expired job is out of attempts after one failure
+    retried = queue.lease("w2")
+    assert retried.id == second.id
+    assert queue.fail(retried.id, "w2", "boom") == "failed"
+    assert queue.stats(run.run_id) == {"queued": 0, "leased": 0, "done": 1, "failed": 1}
+    assert queue.run_errors(run.run_id) == ["Job P0 16:9 failed: boom"]
+
+    assert queue.claim_finalization(run.run_id)
+    assert not queue.claim_finalization(run.run_id)
+    print("    Leases expire and retries are bounded")
+
+
+def test_failed_job_is_retried_after_backoff(campaign_env, tmp_path):
+    """Test a failed attempt becomes available again only after its delay."""
+    print("\n Testing retry backoff...")
+
+    from src.services.job_queue import JobQueue
+
+    brief_path = campaign_env(1)
+    queue = JobQueue(tmp_path / "jobs.db", max_attempts=3, retry_base_seconds=0.2)
+    queue.enqueue_brief(brief_path)
+
+    job = queue.lease("w1")
+    assert queue.fail(job.id, "w1", "timeout") == "queued"
+    other = queue.lease("w1")
+    assert other.id != job.id
+    assert queue.lease("w1") is None
+
+    time.sleep(0.25)
+    again = queue.lease("w1")
+    assert again.id == job.id and again.last_error == "timeout"
+    print("    Failed job waits out its backoff")
+
+
+def test_urgent_runs_overtake_batches(campaign_env, tmp_path):
+    """Test priority and feasible deadlines decide which run is leased next."""
+    print("\n Testing deadline scheduling...")
+
+    from src.services.cost_model import CostModel
+    from src.services.job_queue import JobQueue
+
+    cost_model = CostModel(tmp_path / "costs.json")
+    cost_model.observe({"source": 6.0, "save": 4.0}, cells=2)
+    assert cost_model.cell_seconds() == 5.0
+
+    queue = JobQueue(tmp_path / "jobs.db", cost_model=cost_model)
+    now = time.time()
+    batch = queue.enqueue_brief(campaign_env(3, campaign_id="CAMP_BATCH"))
+    assert queue.lease("w1").run_id == batch.run_id
+
+    # Two assets at 5s each cannot finish in 4s; 60s is plenty
+    missed = queue.enqueue_brief(campaign_env(1, campaign_id="CAMP_MISSED"), deadline=now + 4)
+    rush = queue.enqueue_brief(campaign_env(1, campaign_id="CAMP_RUSH"), deadline=now + 60)
+    order = [run["run_id"] for run in queue.schedule()]
+    assert order == [rush.run_id, missed.run_id, batch.run_id]
+
+    leased = [queue.lease("w1").run_id for _ in range(4)]
+    assert leased == [rush.run_id, rush.run_id, missed.run_id, missed.run_id]
+
+    vip = queue.enqueue_brief(campaign_env(1, campaign_id="CAMP_VIP"), priority=5)
+    assert queue.lease("w1").run_id == vip.run_id
+
+    # Estimates persist and are picked up by other processes
+    cost_model.save()
+    assert CostModel(tmp_path / "costs.json").cell_seconds() == 5.0
+    print("    Urgent runs are leased first")
+
+
+def test_workers_drain_queue(campaign_env, tmp_path):
+    """Test concurrent workers render every job and finalize the run once."""
+    print("\n Testing multi-worker rendering...")
+
+    from src.services.job_queue import JobQueue
+    from src.services.queue_worker import QueueWorker
+
+    brief_path = campaign_env(3)
+    db_path = tmp_path / "jobs.db"
+    run = JobQueue(db_path).enqueue_brief(brief_path)
+
+    workers = [QueueWorker(JobQueue(db_path), worker_id=f"w{i}") for i in range(3)]
+    counts = []
+    threads = [
+        threading.Thread(target=lambda w=w: counts.append(w.run(drain=True))) for w in workers
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    queue = JobQueue(db_path)
+    assert sum(counts) == 6
+    assert queue.stats(run.run_id) == {"queued": 0, "leased": 0, "done": 6, "failed": 0}
+    assert queue.get_run(run.run_id).status == "finished"
+
+    campaign_dir = settings.output_base_dir / run.run_id
+    metadata = json.loads((campaign_dir / "metadata.json").read_text())
+    assert len(metadata["generated_assets"]) == 6
+    for asset in metadata["generated_assets"]:
+        assert (settings.output_base_dir / asset["filepath"]).exists()
+    print(f"    {sum(counts)} jobs rendered by {len(workers)} workers")
+
+
+def test_permanent_failures_are_not_retried(campaign_env, tmp_path):
+    """Test a job with a missing asset fails on its first attempt."""
+    print("\n Testing permanent failures...")
+
+    from src.services.job_queue import JobQueue
+    from src.services.queue_worker import QueueWorker
+
+    brief_path = campaign_env([campaign_env.product(0, image=False)])
+    queue = JobQueue(tmp_path / "jobs.db", max_attempts=3, retry_base_seconds=0.01)
+    run = queue.enqueue_brief(brief_path)
+
+    assert QueueWorker(queue, worker_id="w1").run(drain=True) == 2
+    assert queue.stats(run.run_id) == {"queued": 0, "leased": 0, "done": 0, "failed": 2}
+    assert all(queue.get_job(job_id).attempts == 1 for job_id in (1, 2))
+    assert queue.get_run(run.run_id).status == "finished"
+    print("    Missing asset failed without retries")
+
+
+def test_generation_lock(campaign_env, tmp_path, monkeypatch):
+    """Test sibling jobs generate a product image once across workers."""
+    print("\n Testing generation lock...")
+
+    from src.services.job_queue import JobQueue
+    from src.services.pipeline import CampaignPipeline
+    from src.services.queue_worker import QueueWorker
+
+    queue = JobQueue(tmp_path / "locks.db", lease_seconds=0.2)
+    assert queue.acquire_lock("gen", "w1")
+    assert not queue.acquire_lock("gen", "w2")
+    assert queue.acquire_lock("gen", "w1")
+    queue.release_lock("gen", "w2")
+    assert not queue.acquire_lock("gen", "w2")
+    time.sleep(0.25)
+    assert queue.acquire_lock("gen", "w2")
+    queue.release_lock("gen", "w2")
+    assert queue.acquire_lock("gen", "w1")
+
+    product = campaign_env.product(0, image=False)
+    del product["existing_image"]
+    brief_path = campaign_env([{**product, "generate_image": True}])
+
+    db_path = tmp_path / "jobs.db"
+    run = JobQueue(db_path).enqueue_brief(brief_path)
+
+    calls = []
+
+    def generate(*args, **kwargs):
+        calls.append(threading.current_thread().name)
+        time.sleep(0.3)
+        return Image.new("RGB", (1024, 1024), (90, 160, 90))
+
+    workers = []
+    for i in range(2):
+        worker = QueueWorker(JobQueue(db_path), worker_id=f"w{i}", poll_seconds=0.05)
+        pipeline = CampaignPipeline()
+        monkeypatch.setattr(pipeline.image_generator, "is_available", lambda: True)
+        monkeypatch.setattr(pipeline.image_generator, "generate_product_image", generate)
+        worker._pipelines[(run.pipeline, run.guidelines)] = pipeline
+        workers.append(worker)
+
+    threads = [threading.Thread(target=lambda w=w: w.run(max_jobs=1)) for w in workers]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert JobQueue(db_path).stats(run.run_id)["done"] == 2
+    print("    Image generated once for both aspect ratios")
+
+
+def test_run_finished_after_worker_dies_on_last_job(campaign_env, tmp_path):
+    """Test a run whose last job expires out of attempts still gets its metadata."""
+    print("\n Testing finalization after a lost worker...")
+
+    from src.services.job_queue import JobQueue
+    from src.services.queue_worker import QueueWorker
+
+    brief_path = campaign_env(1)
+    queue = JobQueue(tmp_path / "jobs.db", lease_seconds=0.2, max_attempts=1)
+    run = queue.enqueue_brief(brief_path)
+
+    # A worker leases a job on its only attempt and dies
+    assert queue.lease("dead") is not None
+    worker = QueueWorker(queue, worker_id="w1")
+    assert worker.run(drain=True) == 1
+    assert queue.get_run(run.run_id).status == "active"
+
+    time.sleep(0.25)
+    assert not worker.process_one()
+    assert queue.stats(run.run_id) == {"queued": 0, "leased": 0, "done": 1, "failed": 1}
+    assert queue.get_run(run.run_id).status == "finished"
+
+    metadata = json.loads((settings.output_base_dir / run.run_id / "metadata.json").read_text())
+    assert len(metadata["generated_assets"]) == 1
+    assert any("Lease expired" in error for error in metadata["errors"])
+    print("    Run finalized by the next idle worker")
@@ -0,0 +1,78 @@
+"""
+Line Breaking Test Script
+Tests break opportunities, kinsoku rules and CJK wrapping.
+"""
+
+import sys
+from pathlib import Path
+from PIL import ImageFont
+
+# Add parent directory (project root) to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.services.text_layout import TextLayoutEngine
+from src.utils.line_breaking import CJK_CLOSING, OPENING, clusters
+
+FONT = project_root / "data" / "fonts" / "latin" / "DejaVuSans-Bold.ttf"
+JAPANESE = "夏のセール、開催中！「新商品」をチェックしてください。ブランドX新発売"
+
+
+def _clusters(text: str) -> list[str]:
+    return [("_" if c.space_before else "") + text[c.start : c.end] for c in clusters(text)]
+
+
+def test_break_opportunities():
+    """Test where lines may break in Latin, CJK and mixed text."""
+    print(" Testing break opportunities...")
+
+    assert _clusters("Summer Sale now on") == ["Summer", "_Sale", "_now", "_on"]
+    assert _clusters("well-known -5% off") == ["well-", "known", "_-5%", "_off"]
+    assert _clusters("Sale ! now") == ["Sale !", "_now"]
+    assert _clusters("新発売 BrandX登場") == ["新", "発", "売", "_BrandX", "登", "場"]
+
+    # Kinsoku: no break before closing punctuation, small kana or ー; none after opening brackets
+    assert _clusters("セール、開催中！「新商品」") == [
+        "セー",
+        "ル、",
+        "開",
+        "催",
+        "中！",
+        "「新",
+        "商",
+        "品」",
+    ]
+    assert _clusters("チェック") == ["チェッ", "ク"]
+    assert _clusters("") == []
+    print("    Breaks follow the rules")
+
+
+def test_japanese_wraps_without_spaces():
+    """Test Japanese text with no spaces wraps within the width and obeys kinsoku."""
+    print("\n Testing CJK wrapping...")
+
+    font = ImageFont.truetype(str(FONT), 40)
+    layout = TextLayoutEngine().layout(JAPANESE, font, 300)
+
+    assert len(layout.lines) > 1
+    assert "".join(layout.lines) == JAPANESE
+    assert all(width <= 300 for width in layout.widths)
+    for line in layout.lines[1:]:
+        assert line[0] not in CJK_CLOSING
+    for line in layout.lines[:-1]:
+        assert line[-1] not in OPENING
+    print(f"    {len(layout.lines)} lines within 300px")
+
+
+def test_mixed_text_breaks_at_spaces_and_script_boundaries():
+    """Test whitespace collapses, and spaces are dropped at line ends."""
+    print("\n Testing mixed text...")
+
+    font = ImageFont.truetype(str(FONT), 40)
+    engine = TextLayoutEngine()
+    layout = engine.layout("Summer  Sale\n新商品 well-known", font, 180)
+
+    assert layout.lines == ("Summer", "Sale 新商", "品 well-", "known")
+    assert not any(line.startswith(" ") or line.endswith(" ") for line in layout.lines)
+    assert layout.lines[-1] == "known"
+    print(f"    Lines: {layout.lines}")
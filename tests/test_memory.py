@@ -0,0 +1,109 @@
+"""
+Memory Test Script
+Tests eager image decoding and the bounded working set of memory-lean runs.
+"""
+
+import gc
+import json
+import sys
+import weakref
+from pathlib import Path
+from PIL import Image
+
+# Add parent directory (project root) to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.config import settings
+from src.utils.memory import RssSampler, current_rss_bytes
+
+# Photo-sized sources: 5.8 MB each once decoded
+SOURCE_SIZE = (1600, 1200)
+PRODUCTS = 40
+
+
+def test_load_image_closes_file(tmp_path, monkeypatch):
+    """Test loaded images are decoded and hold no file handle."""
+    print(" Testing eager decoding...")
+
+    monkeypatch.setattr(settings, "input_assets_dir", tmp_path)
+    Image.new("RGB", (40, 30), (10, 200, 10)).save(tmp_path / "green.png")
+
+    from src.services.asset_manager import AssetManager
+
+    image = AssetManager().load_image("green.png")
+    assert image.fp is None
+    assert image.getpixel((0, 0)) == (10, 200, 10)
+    assert Path(image.filename).name == "green.png"
+    print("    File closed after decoding")
+
+
+def test_rss_sampler():
+    """Test the sampler reports a peak at least as large as the start."""
+    print("\n Testing RSS sampler...")
+
+    assert current_rss_bytes() > 0
+    with RssSampler(interval=0.01) as rss:
+        block = bytearray(32 * 1024 * 1024)
+        del block
+    assert rss.peak_bytes >= rss.start_bytes
+    print(f"    Peak RSS {rss.peak_mb} MB")
+
+
+def _run_catalog(campaign_env, products: int):
+    """Render a one-ratio brief of photo-sized sources."""
+    for i in range(products):
+        if not (campaign_env.assets_dir / f"p{i}.png").exists():
+            campaign_env.image(f"p{i}.png", SOURCE_SIZE, (i % 256, (i * 7) % 256, 90))
+    brief_path = campaign_env(
+        products, aspect_ratios=("1:1",), message="Flat", campaign_id=f"CAMP_{products}"
+    )
+
+    from src.services.pipeline import CampaignPipeline
+
+    return CampaignPipeline().run(brief_path)
+
+
+def test_lean_run_releases_decoded_images(campaign_env, monkeypatch):
+    """Test a lean run holds few decoded sources at once and releases them all."""
+    print("\n Testing memory-lean runs...")
+
+    from src.services.asset_manager import AssetManager
+
+    monkeypatch.setattr(settings, "incremental_builds", False)
+    monkeypatch.setattr(settings, "max_image_size", 256)
+    monkeypatch.setattr(settings, "lean_memory_budget_mb", 16)
+
+    # Track every decoded source and how many are alive at once
+    decoded = []
+    peak = [0]
+    open_image = AssetManager.open_image
+
+    def tracking_open_image(filepath, decode_size=None):
+        image = open_image(filepath, decode_size)
+        assert image.fp is None
+        decoded.append(weakref.ref(image))
+        peak[0] = max(peak[0], sum(ref() is not None for ref in decoded))
+        return image
+
+    monkeypatch.setattr(AssetManager, "open_image", staticmethod(tracking_open_image))
+
+    def run(lean: bool):
+        monkeypatch.setattr(settings, "memory_lean_mode", lean)
+        decoded.clear()
+        peak[0] = 0
+        output = _run_catalog(campaign_env, PRODUCTS)
+        gc.collect()
+        assert output.success_count() == PRODUCTS
+        assert len(decoded) == PRODUCTS
+        assert not any(ref() is not None for ref in decoded)
+        return output, peak[0]
+
+    _, baseline_peak = run(lean=False)
+    output, lean_peak = run(lean=True)
+
+    # 16 MB holds two 5.8 MB sources; allow for the few being decoded or rendered
+    assert lean_peak <= 8 < baseline_peak
+    assert output.peak_rss_mb
+    metadata = json.loads((Path(output.output_directory) / "metadata.json").read_text())
+    assert metadata["peak_rss_mb"] == output.peak_rss_mb
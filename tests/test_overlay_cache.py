@@ -0,0 +1,98 @@
+"""
+Overlay Cache Test Script
+Tests byte-bounded tile eviction and text band reuse across products.
+"""
+
+import sys
+from pathlib import Path
+from PIL import Image
+
+# Add parent directory (project root) to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.services.image_processor import ImageProcessor
+from src.services.overlay_cache import OverlayTileCache
+
+
+def test_evicts_by_bytes():
+    """Test least recently used tiles are evicted once the byte budget is exceeded."""
+    print(" Testing tile eviction...")
+
+    tile = Image.new("RGBA", (100, 10))  # 4000 bytes
+    cache = OverlayTileCache(max_bytes=10000)
+    cache.put("a", tile)
+    cache.put("b", tile)
+    assert cache.get("a") is tile  # "b" is now least recently used
+    cache.put("c", tile)
+
+    assert cache.get("b") is None
+    assert cache.get("a") is tile and cache.get("c") is tile
+    cache.put("huge", Image.new("RGBA", (100, 100)))
+    assert cache.get("huge") is None
+
+    metrics = cache.metrics()
+    assert metrics["tiles"] == 2 and metrics["bytes"] == 8000
+    assert metrics["evictions"] == 1
+    print("    Evicted least recently used tile")
+
+
+def test_products_share_text_band():
+    """Test products with the same ratio and message reuse one tile."""
+    print("\n Testing text band reuse...")
+
+    processor = ImageProcessor()
+    processor.tile_cache = OverlayTileCache(max_bytes=16 * 1024 * 1024)
+    products = [
+        Image.new("RGB", (1024, 576), color)
+        for color in ((200, 30, 30), (30, 200, 30), (30, 30, 200))
+    ]
+
+    results = [
+        processor.add_text_overlay(image, "Summer Sale", font_size=48, language="en")
+        for image in products
+    ]
+    processor.add_text_overlay(
+        products[0], "Summer Sale", font_size=48, language="en", position="top"
+    )
+    processor.add_text_overlay(
+        Image.new("RGB", (576, 1024)), "Summer Sale", font_size=48, language="en"
+    )
+
+    metrics = processor.tile_cache.metrics()
+    assert metrics["misses"] == 2 and metrics["hits"] == 3
+    for image, result in zip(products, results):
+        assert result.getpixel((5, 5)) == image.getpixel((5, 5))
+        assert result.getpixel((5, 540)) != image.getpixel((5, 540))
+    print("    One tile rendered per canvas width")
+
+
+def test_overlay_blends_band_only():
+    """Test only the band's rows change and the source image is left alone."""
+    print("\n Testing band-only compositing...")
+
+    from PIL import ImageChops
+
+    processor = ImageProcessor()
+    image = Image.effect_noise((800, 600), 40).convert("RGB")
+    before = image.copy()
+
+    result = processor.add_text_overlay(
+        image, "Summer Sale", font_size=48, language="en", position="top"
+    )
+
+    assert result.mode == "RGB" and result is not image
+    assert ImageChops.difference(image, before).getbbox() is None
+    left, top, right, bottom = ImageChops.difference(result, image).getbbox()
+    assert top >= 20 and bottom < 150
+    assert (
+        processor.add_text_overlay(image.convert("RGBA"), "Summer Sale", font_size=48).mode == "RGB"
+    )
+
+    # Handed-over images are drawn onto without a full-frame copy
+    owned = processor.add_text_overlay(
+        image, "Summer Sale", font_size=48, language="en", position="top", in_place=True
+    )
+    assert owned is image
+    assert ImageChops.difference(owned, result).getbbox() is None
+    print(f"    Rows {top}-{bottom} blended")
@@ -0,0 +1,105 @@
+"""
+Planner Test Script
+Tests dry-run plans and preflight checks of campaign briefs.
+"""
+
+import sys
+from pathlib import Path
+import pytest
+
+# Add parent directory (project root) to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.config import settings
+
+
+def test_plan_counts_calls_and_cache_hits(campaign_env, tmp_path):
+    """Test a plan reports generations, missing assets and cached cells."""
+    print(" Testing run plans...")
+
+    generated = {
+        "product_id": "P4",
+        "product_name": "New",
+        "description": "fresh",
+        "generate_image": True,
+    }
+    brief_path = campaign_env(
+        [
+            campaign_env.product(1),
+            campaign_env.product(2),
+            campaign_env.product(3, image=False),
+            generated,
+        ]
+    )
+
+    from src.services.pipeline import CampaignPipeline
+
+    pipeline = CampaignPipeline()
+    plan = pipeline.plan(brief_path)
+    assert plan.total_assets == 8 and plan.cached_assets == 0
+    assert [p.source for p in plan.products] == ["existing", "existing", "missing", "generate"]
+    assert plan.image_generations == 1 and plan.translations == 0
+    assert plan.estimated_cost_usd == settings.dalle_image_cost_usd
+    assert plan.estimated_seconds > 0 and plan.font_path
+    assert not plan.is_runnable()
+    assert any("p3.png" in problem for problem in plan.problems)
+    assert any("no API key" in problem for problem in plan.problems)
+    assert not (tmp_path / "output").exists() or not any((tmp_path / "output").iterdir())
+
+    # After a run the rendered cells show up as cache hits
+    pipeline.run(brief_path)
+    plan = CampaignPipeline().plan(brief_path)
+    assert plan.cached_assets == 4
+    assert [p.cached_assets for p in plan.products] == [2, 2, 0, 0]
+    print(
+        f"    Plan: {plan.cached_assets}/{plan.total_assets} cached, {len(plan.problems)} problems"
+    )
+
+
+def test_preflight_aborts_before_work(campaign_env, tmp_path, monkeypatch):
+    """Test preflight checks stop a run with a missing asset up front."""
+    print("\n Testing preflight...")
+
+    brief_path = campaign_env([campaign_env.product(1), campaign_env.product(2, image=False)])
+    monkeypatch.setattr(settings, "preflight_checks", True)
+
+    from src.services.pipeline import CampaignPipeline
+
+    with pytest.raises(ValueError, match="p2.png"):
+        CampaignPipeline().run(brief_path)
+    assert not (tmp_path / "output").exists() or not any((tmp_path / "output").iterdir())
+    print("    Missing asset rejected before rendering")
+
+
+def test_plan_checks_text_layout(campaign_env, tmp_path, monkeypatch):
+    """Test text that would overflow a ratio's band is reported without rendering."""
+    print("\n Testing layout feasibility...")
+
+    long_message = (
+        "Discover our brand new sustainable summer collection, now available in every store"
+    )
+    brief_path = campaign_env(1, aspect_ratios=("1:1", "9:16", "16:9"), message=long_message)
+    monkeypatch.setattr(settings, "text_font_size", 48)
+
+    from src.services.pipeline import CampaignPipeline
+
+    pipeline = CampaignPipeline()
+    problems = [p for p in pipeline.plan(brief_path).problems if p.startswith("Text does not fit")]
+    assert any("9:16" in problem for problem in problems)
+    assert not (tmp_path / "output").exists() or not any((tmp_path / "output").iterdir())
+
+    # Auto-fit shrinks the text into the band, but never under MIN_TEXT_SIZE
+    monkeypatch.setattr(settings, "text_auto_fit", True)
+    assert (
+        pipeline.image_processor.check_layout(
+            long_message, "9:16", base_size=settings.max_image_size
+        )
+        is None
+    )
+    monkeypatch.setattr(settings, "min_text_size", 40)
+    problem = pipeline.image_processor.check_layout(
+        long_message, "9:16", base_size=settings.max_image_size
+    )
+    assert problem and "9:16" in problem
+    print(f"    {problem}")
@@ -0,0 +1,74 @@
+"""
+Progress Events Test Script
+Tests the progress tracker and streaming pipeline events.
+"""
+
+import sys
+from pathlib import Path
+
+# Add parent directory (project root) to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.services.pipeline import CampaignPipeline
+from src.services.progress import EventStream, ProgressTracker
+
+
+def test_tracker_eta():
+    """Test completion counts and ETA estimates."""
+    print(" Testing progress tracker...")
+
+    events = []
+    tracker = ProgressTracker(events.append)
+    tracker.start("RUN_1", total=4)
+    tracker.asset_done(aspect_ratio="1:1")
+    tracker.asset_done(aspect_ratio="9:16")
+
+    assert [e.kind for e in events] == ["run_started", "asset_rendered", "asset_rendered"]
+    assert events[-1].completed == 2 and events[-1].progress == 0.5
+    assert events[-1].eta_seconds is not None
+    print("    Tracker counts and ETA work")
+
+
+def test_iter_run_streams_events(campaign_env):
+    """Test assets and errors are streamed before the run returns."""
+    print("\n Testing event stream...")
+
+    brief_path = campaign_env(
+        [campaign_env.product(1), campaign_env.product(2, image=False)],
+        aspect_ratios=("1:1", "9:16", "16:9"),
+    )
+    stream = CampaignPipeline().iter_run(brief_path)
+    events = list(stream)
+
+    kinds = [e.kind for e in events]
+    assert kinds[0] == "stage_started" and kinds[-1] == "run_finished"
+    assert kinds.count("asset_rendered") == 3
+    assert kinds.count("error") == 1
+
+    rendered = [e for e in events if e.kind == "asset_rendered"]
+    assert [e.completed for e in rendered] == [1, 2, 3]
+    assert all(Path(e.filepath).exists() for e in rendered)
+    assert all(e.total == 6 for e in rendered)
+
+    assert stream.result.success_count() == 3
+    print(f"    Streamed {len(events)} events")
+
+
+def test_stream_reraises_errors():
+    """Test an exception from the run surfaces to the consumer."""
+    print("\n Testing event stream errors...")
+
+    def failing_run(on_event=None):
+        on_event("first")
+        raise ValueError("boom")
+
+    received = []
+    try:
+        for event in EventStream(failing_run):
+            received.append(event)
+        assert False, "stream should re-raise"
+    except ValueError as e:
+        assert str(e) == "boom"
+    assert received == ["first"]
+    print("    Errors are re-raised")
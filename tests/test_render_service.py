@@ -0,0 +1,178 @@
+"""
+Render Service Test Script
+Tests the render service's job API and client against a live local server.
+"""
+
+import json
+import sys
+import threading
+import urllib.request
+from pathlib import Path
+import pytest
+
+# Add parent directory (project root) to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.config import settings
+
+
+@pytest.fixture
+def server(campaign_env, tmp_path, monkeypatch):
+    """Start a render service on a free port with settings pointed at tmp_path."""
+    monkeypatch.setattr(settings, "input_briefs_dir", tmp_path / "briefs")
+
+    from src.services.render_service import RenderServer, RenderService
+
+    service = RenderService(workers=1)
+    server = RenderServer(service, host="127.0.0.1", port=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+    service.shutdown()
+
+
+def _brief(campaign_env, campaign_id: str) -> dict:
+    return json.loads(campaign_env(1, campaign_id=campaign_id).read_text())
+
+
+def test_submit_stream_and_fetch(server, campaign_env):
+    """Test a submitted brief streams events and its assets are served."""
+    print(" Testing render service jobs...")
+
+    from src.services.render_client import RenderClient
+
+    client = RenderClient(server.url)
+    assert client.is_available()
+
+    brief_path = campaign_env(1, campaign_id="CAMP_SERVICE")
+    job = client.submit(brief_path=brief_path)
+    assert job.status in ("queued", "running")
+
+    kinds = [event.kind for event in client.events(job.id)]
+    assert "run_started" in kinds
+    assert kinds.count("asset_rendered") == 2 and kinds[-1] == "run_finished"
+
+    job = client.job(job.id)
+    assert job.status == "succeeded" and job.completed == 2
+    output = RenderClient.output(job)
+    assert output.success_count() == 2
+
+    filepath = output.generated_assets[0]["filepath"]
+    with urllib.request.urlopen(f"{server.url}/files/{filepath}") as response:
+        assert response.headers["Content-Type"] == "image/png"
+        assert response.read().startswith(b"\x89PNG")
+    print(f"    Job {job.id} rendered {output.success_count()} assets")
+
+
+def test_pipelines_stay_warm(server, campaign_env):
+    """Test later jobs reuse the pipeline built for the first one."""
+    print("\n Testing warm pipelines...")
+
+    from src.services.render_client import RenderClient
+
+    client = RenderClient(server.url)
+    first = client.wait(client.submit(brief=_brief(campaign_env, "CAMP_WARM_A")).id)
+    idle = server.service._pipelines[None]
+    pipeline = idle.queue[0]
+
+    second = client.wait(client.submit(brief=_brief(campaign_env, "CAMP_WARM_B")).id)
+    assert first.status == second.status == "succeeded"
+    assert idle.qsize() == 1 and idle.queue[0] is pipeline
+    assert len(client._request("GET", "/jobs")["jobs"]) == 2
+    print("    Second job reused the warm pipeline")
+
+
+def test_resize_quality_per_job(server, campaign_env):
+    """Test a job's resize quality tier is used for its run only."""
+    print("\n Testing per-job resize quality...")
+
+    from src.services.render_client import RenderClient
+    from src.services.run_manifest import RunManifest
+
+    client = RenderClient(server.url)
+    fast = client.wait(
+        client.submit(brief=_brief(campaign_env, "CAMP_FAST"), resize_quality="fast").id
+    )
+    default = client.wait(client.submit(brief=_brief(campaign_env, "CAMP_DEFAULT")).id)
+    assert fast.status == default.status == "succeeded"
+    assert fast.resize_quality == "fast" and default.resize_quality == settings.resize_quality
+
+    for job in (fast, default):
+        header = RunManifest.load(Path(RenderClient.output(job).output_directory)).header
+        assert header["resize_quality"] == job.resize_quality
+    print("    Each job rendered with its own tier")
+
+
+def test_bad_requests(server):
+    """Test unknown jobs and invalid submissions are rejected."""
+    print("\n Testing API errors...")
+
+    from src.services.render_client import RenderClient
+
+    client = RenderClient(server.url)
+    with pytest.raises(RuntimeError, match="404"):
+        client.job("nope")
+    with pytest.raises(RuntimeError, match="400"):
+        client.submit(brief_path=Path("does/not/exist.json"))
+    with pytest.raises(RuntimeError, match="400"):
+        client.submit(brief={"campaign_id": "CAMP_BAD"}, resize_quality="sharpest")
+    with pytest.raises(RuntimeError, match="404"):
+        client._request("GET", "/files/../../etc/passwd")
+    print("    Errors reported with status codes")
+
+
+def test_cancel_job(server, campaign_env, monkeypatch):
+    """Test DELETE stops a running job and cancels a queued one."""
+    print("\n Testing job cancellation...")
+
+    from src.services.pipeline import CampaignPipeline
+    from src.services.render_client import RenderClient
+
+    original = CampaignPipeline._source_stage
+
+    def hanging_source(self, ctx):
+        ctx.state.token.wait(10)
+        return original(self, ctx)
+
+    monkeypatch.setattr(CampaignPipeline, "_source_stage", hanging_source)
+
+    client = RenderClient(server.url)
+    running = client.submit(brief=_brief(campaign_env, "CAMP_STOP_A"))
+    queued = client.submit(brief=_brief(campaign_env, "CAMP_STOP_B"))
+    for event in client.events(running.id):
+        if event.kind == "run_started":
+            break
+
+    assert client.cancel(queued.id).status == "cancelled"
+    client.cancel(running.id)
+    job = client.wait(running.id)
+    assert job.status == "cancelled" and "Cancelled" in job.error
+    assert client.job(queued.id).status == "cancelled"
+    with pytest.raises(RuntimeError, match="404"):
+        client.cancel("nope")
+    print("    Running and queued jobs cancelled")
+
+
+def test_pipeline_setup_failure_fails_job(server, campaign_env, monkeypatch):
+    """Test a job whose pipeline cannot be built fails and its event stream ends."""
+    print("\n Testing pipeline setup failures...")
+
+    from src.services import pipeline as pipeline_module
+    from src.services.render_client import RenderClient
+
+    def broken_pipeline(*args, **kwargs):
+        raise RuntimeError("font scan failed")
+
+    monkeypatch.setattr(pipeline_module, "CampaignPipeline", broken_pipeline)
+
+    client = RenderClient(server.url)
+    job = client.wait(client.submit(brief=_brief(campaign_env, "CAMP_BROKEN")).id)
+    assert job.status == "failed" and "font scan failed" in job.error
+
+    events = list(client.events(job.id))
+    assert events[-1].kind == "error" and "font scan failed" in events[-1].message
+    assert server.service._pipelines[None].qsize() == 0
+    print("    Setup failure reported as a failed job")
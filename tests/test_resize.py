@@ -0,0 +1,90 @@
+"""
+Resize Test Script
+Tests reduced-scale JPEG decoding, two-stage downscaling and quality tiers.
+"""
+
+import functools
+import sys
+from pathlib import Path
+import pytest
+from PIL import Image, ImageChops, ImageStat
+
+# Add parent directory (project root) to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.config import settings
+from src.services.asset_manager import AssetManager
+from src.services.image_processor import ImageProcessor
+
+RATIOS = ["1:1", "9:16", "16:9"]
+
+
+def _photo(path: Path, size=(3200, 2400)) -> Path:
+    """Write a large JPEG with smooth gradients and some texture."""
+    image = Image.radial_gradient("L").resize(size).convert("RGB")
+    image = Image.blend(image, Image.effect_noise(size, 30).convert("RGB"), 0.2)
+    image.save(path, quality=90)
+    return path
+
+
+def test_jpeg_decoded_at_reduced_scale(tmp_path):
+    """Test large JPEGs are decoded just big enough to cover every ratio."""
+    print(" Testing draft decoding...")
+
+    path = _photo(tmp_path / "photo.jpg")
+    processor = ImageProcessor()
+    decode_size = functools.partial(processor.decode_size, aspect_ratios=RATIOS, base_size=1024)
+
+    assert decode_size((3200, 2400)) == (1366, 1024)
+    assert decode_size((800, 600)) == (800, 600)
+
+    full = AssetManager.open_image(path)
+    reduced = AssetManager.open_image(path, decode_size)
+    assert full.size == (3200, 2400)
+    assert reduced.size == (1600, 1200)
+    assert reduced.filename == full.filename
+
+    # PNGs are always decoded in full
+    full.save(tmp_path / "photo.png")
+    assert AssetManager.open_image(tmp_path / "photo.png", decode_size).size == (3200, 2400)
+
+    for ratio in RATIOS:
+        best = processor.resize_to_aspect_ratio(full, ratio, quality="best")
+        for quality in ("balanced", "fast"):
+            result = processor.resize_to_aspect_ratio(reduced, ratio, quality=quality)
+            assert result.size == best.size
+            assert max(ImageStat.Stat(ImageChops.difference(result, best)).mean) < 4
+    print(f"    Decoded at {reduced.size} instead of {full.size}")
+
+
+def test_resize_skipped_at_target_size():
+    """Test a source already at the target size is only converted to RGB."""
+    print("\n Testing resize skip...")
+
+    processor = ImageProcessor()
+    source = Image.new("RGBA", (1024, 576), (10, 20, 30, 255))
+    result = processor.resize_to_aspect_ratio(source, "16:9")
+
+    assert result.mode == "RGB" and result.size == (1024, 576)
+    assert result.getpixel((500, 300)) == (10, 20, 30)
+
+    rgb = Image.new("RGB", (1024, 1024), (1, 2, 3))
+    copy = processor.resize_to_aspect_ratio(rgb, "1:1")
+    assert copy is not rgb and copy.tobytes() == rgb.tobytes()
+    print("    Same-size source not resampled")
+
+
+def test_quality_tiers(monkeypatch):
+    """Test tiers are validated and part of the render signature."""
+    print("\n Testing quality tiers...")
+
+    processor = ImageProcessor()
+    with pytest.raises(ValueError, match="ultra"):
+        processor.resize_to_aspect_ratio(Image.new("RGB", (100, 100)), "1:1", quality="ultra")
+
+    monkeypatch.setattr(settings, "resize_quality", "fast")
+    fast = processor.render_signature("Sale", "1:1", language="en")
+    best = processor.render_signature("Sale", "1:1", language="en", resize_quality="best")
+    assert fast["resize_quality"] == "fast" and best["resize_quality"] == "best"
+    print("    Tiers recorded in the signature")
@@ -0,0 +1,112 @@
+"""
+Retry Test Script
+Tests transient error classification, end-of-run retries and retry_failed.
+"""
+
+import sys
+from pathlib import Path
+
+# Add parent directory (project root) to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.config import settings
+from src.services.retry import TransientError, backoff_delay, is_transient
+from src.services.run_manifest import RunManifest
+
+
+def test_is_transient():
+    """Test timeouts, rate limits and 5xx responses are retryable."""
+    print(" Testing error classification...")
+
+    class RateLimitError(Exception):
+        pass
+
+    class HTTPError(Exception):
+        def __init__(self, status_code):
+            super().__init__(f"HTTP {status_code}")
+            self.status_code = status_code
+
+    assert is_transient(TimeoutError("read timed out"))
+    assert is_transient(TransientError("later"))
+    assert is_transient(RateLimitError("slow down"))
+    assert is_transient(HTTPError(429)) and is_transient(HTTPError(503))
+    assert not is_transient(HTTPError(400))
+    assert not is_transient(ValueError("bad prompt"))
+
+    try:
+        try:
+            raise ConnectionError("reset")
+        except ConnectionError as e:
+            raise RuntimeError("download failed") from e
+    except RuntimeError as e:
+        assert is_transient(e)
+
+    assert backoff_delay(1, 2.0) == 2.0 and backoff_delay(3, 2.0) == 8.0
+    print("    Classification works")
+
+
+def test_transient_failure_is_retried(campaign_env, monkeypatch):
+    """Test a cell lost to a transient error is rendered by the end of the run."""
+    print("\n Testing end-of-run retries...")
+
+    monkeypatch.setattr(settings, "retry_base_seconds", 0.0)
+    brief_path = campaign_env([campaign_env.product(1), campaign_env.product(2)])
+
+    from src.services.pipeline import CampaignPipeline
+
+    pipeline = CampaignPipeline()
+    original = pipeline._get_or_generate_image
+    calls = []
+
+    def flaky(product, manifest=None, **kwargs):
+        calls.append(product.product_id)
+        if product.product_id == "P2" and calls.count("P2") == 1:
+            raise TransientError("Image download failed: read timed out")
+        return original(product, manifest, **kwargs)
+
+    monkeypatch.setattr(pipeline, "_get_or_generate_image", flaky)
+    output = pipeline.run(brief_path)
+
+    assert output.success_count() == 4
+    assert not output.errors
+    assert calls.count("P2") == 2 and calls.count("P1") == 1
+
+    manifest = RunManifest.load(Path(output.output_directory))
+    failures = [r for r in manifest.records if r["event"] == "failed"]
+    assert {(r["product_id"], r["aspect_ratio"]) for r in failures} == {
+        ("P2", "1:1"),
+        ("P2", "16:9"),
+    }
+    assert all(r["transient"] and r["error_type"] == "TransientError" for r in failures)
+    assert not manifest.failed_cells()
+    print("    Transient failure retried")
+
+
+def test_retry_failed_reruns_only_failed_cells(campaign_env, monkeypatch):
+    """Test permanent failures are recorded and retry_failed renders just those cells."""
+    print("\n Testing retry_failed...")
+
+    monkeypatch.setattr(settings, "retry_base_seconds", 0.0)
+    brief_path = campaign_env([campaign_env.product(1), campaign_env.product(2, image=False)])
+
+    from src.services.pipeline import CampaignPipeline
+
+    output = CampaignPipeline().run(brief_path)
+    assert output.success_count() == 2 and len(output.errors) == 1
+
+    campaign_dir = Path(output.output_directory)
+    failed = RunManifest.load(campaign_dir).failed_cells()
+    assert set(failed) == {("P2", "1:1", "en"), ("P2", "16:9", "en")}
+    assert not any(record["transient"] for record in failed.values())
+
+    # Fix the cause, then re-run only the failed assets
+    campaign_env.image("p2.png")
+    events = []
+    retried = CampaignPipeline().retry_failed(campaign_dir.name, on_event=events.append)
+
+    assert retried.success_count() == 4
+    assert not retried.errors
+    assert [e.kind for e in events].count("asset_rendered") == 2
+    assert not RunManifest.load(campaign_dir).failed_cells()
+    print("    Only failed assets re-rendered")
@@ -0,0 +1,88 @@
+"""
+Run Manifest Test Script
+Tests the write-ahead run manifest and resuming interrupted runs.
+"""
+
+import sys
+from pathlib import Path
+
+# Add parent directory (project root) to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.config import settings
+from src.services.pipeline import CampaignPipeline
+from src.services.run_manifest import RunManifest, MANIFEST_FILENAME
+
+
+class SimulatedCrash(BaseException):
+    """Raised to mimic the process being killed mid-run."""
+
+
+def test_manifest_ignores_torn_line(tmp_path):
+    """Test a partially written final record is skipped on load."""
+    print(" Testing manifest loading...")
+
+    brief = tmp_path / "brief_in.json"
+    brief.write_text("{}")
+    manifest = RunManifest.create(tmp_path, brief)
+    (tmp_path / "1x1.png").write_bytes(b"png")
+    manifest.record_asset("P1", "Red", "1:1", "en", str(tmp_path / "1x1.png"))
+
+    with open(tmp_path / MANIFEST_FILENAME, "a") as f:
+        f.write('{"event": "asset", "product_id": "P1", "aspe')
+
+    loaded = RunManifest.load(tmp_path)
+    assert loaded.header["run_id"] == tmp_path.name
+    assert loaded.brief_path.exists()
+    assert list(loaded.completed_cells()) == [("P1", "1:1", "en")]
+    assert not loaded.is_finished()
+    print("    Torn records are ignored")
+
+
+def test_resume_finishes_missing_cells(campaign_env, monkeypatch):
+    """Test resume renders only the cells missing after a crash."""
+    print("\n Testing resume...")
+
+    monkeypatch.setattr(settings, "incremental_builds", False)
+    brief_path = campaign_env()
+    pipeline = CampaignPipeline()
+
+    saves = []
+    original_save = pipeline.output_manager.save_asset
+
+    def crashing_save(*args, **kwargs):
+        if len(saves) == 3:
+            raise SimulatedCrash()
+        saves.append(args[3])
+        return original_save(*args, **kwargs)
+
+    monkeypatch.setattr(pipeline.output_manager, "save_asset", crashing_save)
+
+    try:
+        pipeline.run(brief_path)
+        assert False, "run should have been interrupted"
+    except SimulatedCrash:
+        pass
+
+    run_dirs = list(settings.output_base_dir.iterdir())
+    assert len(run_dirs) == 1
+    run_id = run_dirs[0].name
+    assert not (run_dirs[0] / "metadata.json").exists()
+
+    saves.clear()
+    monkeypatch.setattr(pipeline.output_manager, "save_asset", original_save)
+    renders = []
+    original_overlay = pipeline.image_processor.add_text_overlay
+    monkeypatch.setattr(
+        pipeline.image_processor,
+        "add_text_overlay",
+        lambda *args, **kwargs: renders.append(1) or original_overlay(*args, **kwargs),
+    )
+
+    output = pipeline.resume(run_id)
+    assert output.success_count() == 4 and not output.has_errors()
+    assert len(renders) == 1
+    assert RunManifest.load(run_dirs[0]).is_finished()
+    assert (run_dirs[0] / "metadata.json").exists()
+    print("    Resume finished only the missing asset")
@@ -0,0 +1,111 @@
+"""
+Script Segmenter Test Script
+Tests script runs, language detection and mixed-font overlay layout.
+"""
+
+import shutil
+import sys
+from pathlib import Path
+from PIL import Image, ImageFont
+
+# Add parent directory (project root) to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.config import settings
+from src.services.text_layout import TextLayoutEngine
+from src.utils.script_segmenter import detect_language, segment
+
+FONTS = project_root / "data" / "fonts"
+DEJAVU = FONTS / "latin" / "DejaVuSans-Bold.ttf"
+NOTO = FONTS / "fallback" / "NotoSans.ttf"
+
+
+def test_segment():
+    """Test text splits into script runs with common characters attached."""
+    print(" Testing segmentation...")
+
+    runs = segment("新発売 Summer Sale 2024！セール")
+    assert [(r.script, r.text) for r in runs] == [
+        ("cjk", "新発売 "),
+        ("latin", "Summer Sale 2024"),
+        ("cjk", "！セール"),
+    ]
+    assert "".join(r.text for r in segment("¡Hola, 서울! 50%")) == "¡Hola, 서울! 50%"
+    assert [r.script for r in segment("¡Hola, 서울! 50%")] == ["latin", "hangul"]
+    assert [(r.script, r.text) for r in segment("2024 ")] == [("common", "2024 ")]
+    assert segment("") == []
+    print("    Runs split by script")
+
+
+def test_detect_language():
+    """Test single-pass detection keeps the previous priorities."""
+    print("\n Testing language detection...")
+
+    cases = {
+        "Summer Sale": "en",
+        "Soldes d'été": "fr",
+        "¡Oferta de verano!": "es",
+        "Größer und schöner": "de",
+        "Não perca": "pt",
+        "Lunedì": "it",
+        "夏のセール": "ja",
+        "여름 세일": "ko",
+        "Sale 여름 夏": "ja",
+        "Café mañana": "fr",
+    }
+    for text, language in cases.items():
+        assert detect_language(text) == language, text
+    print(f"    {len(cases)} messages detected")
+
+
+def test_layout_runs_share_baseline():
+    """Test runs in different fonts are laid out on one line with one baseline."""
+    print("\n Testing mixed-font layout...")
+
+    small, large = ImageFont.truetype(str(NOTO), 30), ImageFont.truetype(str(DEJAVU), 40)
+    engine = TextLayoutEngine()
+    layout = engine.layout_runs([("Summer ", small), ("SALE", large), (" now on", small)], 2000)
+
+    assert layout.lines == ("Summer SALE now on",)
+    pieces = layout.pieces[0]
+    assert [p.text for p in pieces] == ["Summer", "SALE", "now on"]
+    assert pieces[1].x == engine.advance(small, "Summer") + engine.advance(small, " ")
+    assert pieces[0].y == large.getmetrics()[0] - small.getmetrics()[0] and pieces[1].y == 0
+    assert layout.line_height == sum(large.getmetrics())
+
+    # A word spanning two runs breaks as one word
+    narrow = engine.layout_runs([("Big Brand", small), ("X", large), (" is here", small)], 170)
+    assert "BrandX" in " ".join(narrow.lines).split()
+    print("    Runs aligned on a shared baseline")
+
+
+def test_overlay_uses_font_per_script(tmp_path, monkeypatch):
+    """Test a Latin brand inside Japanese text is drawn with the Latin font."""
+    print("\n Testing per-run fonts...")
+
+    monkeypatch.setattr(settings, "cache_dir", tmp_path / "cache")
+    from src.services.image_processor import ImageProcessor
+
+    fonts_dir = tmp_path / "fonts"
+    (fonts_dir / "latin").mkdir(parents=True)
+    (fonts_dir / "japanese").mkdir()
+    shutil.copy(NOTO, fonts_dir / "latin" / "NotoSans-Bold.ttf")
+    shutil.copy(DEJAVU, fonts_dir / "japanese" / "NotoSansJP-Bold.ttf")
+
+    processor = ImageProcessor()
+    processor.fonts_dir = fonts_dir
+    runs = processor.font_paths_for("新発売 Summer Sale", "ja")
+    assert [(text, path.parent.name) for text, path in runs] == [
+        ("新発売 ", "japanese"),
+        ("Summer Sale", "latin"),
+    ]
+    assert (
+        len(processor.render_signature("新発売 Summer Sale", "1:1", language="ja")["font_paths"])
+        == 2
+    )
+
+    image = Image.new("RGB", (800, 800), (70, 130, 180))
+    result = processor.add_text_overlay(image, "新発売 Summer Sale", font_size=48, language="ja")
+    assert result.size == image.size and result.getpixel((400, 780)) != image.getpixel((400, 780))
+    print("    Each run drawn with its own font")
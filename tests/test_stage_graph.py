@@ -0,0 +1,256 @@
+"""
+Stage Graph Test Script
+Tests the stage graph engine and the pipelines built on it.
+"""
+
+import sys
+import threading
+import time
+from pathlib import Path
+from PIL import Image
+
+# Add parent directory (project root) to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.services.stage_graph import SKIP, ResourceClass, Stage, StageGraph
+
+CELLS = [
+    {"product_id": p, "aspect_ratio": r, "language": "en"}
+    for p in ("P1", "P2", "P3")
+    for r in ("1:1", "16:9")
+]
+
+
+def test_concurrency_limits():
+    """Test no resource class exceeds its limit."""
+    print(" Testing per-resource limits...")
+
+    lock = threading.Lock()
+    active = {"net": 0, "cpu": 0}
+    peak = {"net": 0, "cpu": 0}
+
+    def work(kind):
+        def fn(ctx, **inputs):
+            with lock:
+                active[kind] += 1
+                peak[kind] = max(peak[kind], active[kind])
+            time.sleep(0.02)
+            with lock:
+                active[kind] -= 1
+            return ctx.scope
+
+        return fn
+
+    graph = StageGraph(
+        [
+            Stage("fetch", work("net"), scope=("product_id",), resource=ResourceClass.NETWORK),
+            Stage(
+                "render",
+                work("cpu"),
+                inputs=("fetch",),
+                scope=("product_id", "aspect_ratio", "language"),
+                resource=ResourceClass.CPU,
+            ),
+        ],
+        limits={ResourceClass.NETWORK: 3, ResourceClass.CPU: 2},
+    )
+    report = graph.execute(CELLS)
+
+    assert report.completed == 3 + 6
+    assert peak["net"] <= 3 and peak["cpu"] <= 2
+    assert peak["cpu"] == 2
+    print(f"    Peaks within limits: {peak}")
+
+
+def test_failure_isolation_and_skip():
+    """Test failed tasks cancel only their dependents and skips propagate."""
+    print("\n Testing failures and skips...")
+
+    rendered = []
+    errors = []
+
+    def fetch(ctx):
+        if ctx.scope["product_id"] == "P2":
+            raise RuntimeError("unavailable")
+        return ctx.scope["product_id"]
+
+    def check(ctx, fetch):
+        return SKIP if fetch == "P3" else fetch
+
+    def render(ctx, check):
+        rendered.append((check, ctx.scope["aspect_ratio"]))
+        return check
+
+    graph = StageGraph(
+        [
+            Stage("fetch", fetch, scope=("product_id",)),
+            Stage(
+                "check", check, inputs=("fetch",), scope=("product_id", "aspect_ratio", "language")
+            ),
+            Stage(
+                "render",
+                render,
+                inputs=("check",),
+                scope=("product_id", "aspect_ratio", "language"),
+            ),
+        ]
+    )
+    report = graph.execute(CELLS, on_error=lambda ctx, e: errors.append((ctx.stage, str(e))))
+
+    assert errors == [("fetch", "unavailable")]
+    assert report.failed == 1 and report.cancelled == 4
+    assert report.skipped == 2
+    assert sorted(rendered) == [("P1", "16:9"), ("P1", "1:1")]
+    print("    Failures and skips handled")
+
+
+def test_output_cache_and_validation():
+    """Test stage outputs are shared by key and bad graphs are rejected."""
+    print("\n Testing stage output cache...")
+
+    calls = []
+
+    def expensive(ctx):
+        calls.append(ctx.scope)
+        return "value"
+
+    graph = StageGraph(
+        [
+            Stage(
+                "shared", expensive, scope=("aspect_ratio",), cache_key=lambda ctx: "same-for-all"
+            ),
+        ]
+    )
+    report = graph.execute(CELLS)
+    assert report.completed == 2
+    assert len(calls) + report.cache_hits == 2
+
+    try:
+        StageGraph(
+            [
+                Stage("a", expensive, scope=("product_id", "aspect_ratio")),
+                Stage("b", expensive, inputs=("a",), scope=("product_id",)),
+            ]
+        )
+        assert False, "narrower stage must not read a wider one"
+    except ValueError:
+        pass
+    print("    Cache and validation work")
+
+
+def test_mutating_stage_gets_unshared_inputs():
+    """Test a stage changing its input in place never alters one shared with other tasks."""
+    print("\n Testing in-place stages...")
+
+    made = {}
+    seen = {}
+
+    def base(ctx):
+        made[ctx.scope["product_id"]] = [ctx.scope["product_id"]]
+        return made[ctx.scope["product_id"]]
+
+    def mark(ctx, base):
+        seen[ctx.scope["product_id"]] = base
+        base.append("marked")
+        return base
+
+    graph = StageGraph(
+        [
+            Stage(
+                "base",
+                base,
+                scope=("product_id",),
+                cache_key=lambda ctx: None if ctx.scope["product_id"] == "P3" else "shared",
+            ),
+            Stage("mark", mark, inputs=("base",), scope=("product_id",), mutates=("base",)),
+        ]
+    )
+    for _ in range(20):
+        made.clear()
+        report = graph.execute(CELLS)
+        assert report.failed == 0
+        assert all(output.count("marked") == 1 for output in seen.values())
+        assert seen["P3"] is made["P3"]
+
+    try:
+        StageGraph([Stage("a", base), Stage("b", mark, mutates=("a",))])
+        assert False, "a stage can only mutate its inputs"
+    except ValueError:
+        pass
+    print("    Shared inputs copied, owned ones changed in place")
+
+
+def test_enhanced_pipeline_runs_comply_stage(campaign_env):
+    """Test the enhanced pipeline is the standard graph plus compliance."""
+    print("\n Testing enhanced pipeline graph...")
+
+    brief_path = campaign_env([campaign_env.product(1)], aspect_ratios=("1:1", "9:16"))
+
+    from src.services.pipeline_enhanced import EnhancedCampaignPipeline
+
+    pipeline = EnhancedCampaignPipeline(
+        guidelines_path=project_root / "examples" / "brand_guidelines.json"
+    )
+    assert list(pipeline.graph.stages) == [
+        "source",
+        "translate",
+        "lookup",
+        "resize",
+        "overlay",
+        "encode",
+        "comply",
+        "save",
+    ]
+
+    output = pipeline.run(brief_path)
+    assert output.success_count() == 2 and not output.has_errors()
+    assert [a["aspect_ratio"] for a in output.generated_assets] == ["1:1", "9:16"]
+
+    campaign_dir = Path(output.output_directory)
+    assert (campaign_dir / "compliance_report.json").exists()
+    print("    Enhanced pipeline ran compliance checks")
+
+
+def test_memory_budget_bounds_held_images():
+    """Test sources wait for rendering once the byte budget is full."""
+    print("\n Testing back-pressure...")
+
+    image_bytes = 100 * 100 * 3
+    cells = [{"product_id": f"P{i}", "aspect_ratio": "1:1", "language": "en"} for i in range(20)]
+
+    def fetch(ctx):
+        return Image.new("RGB", (100, 100))
+
+    def render(ctx, fetch):
+        time.sleep(0.01)
+        return fetch.size
+
+    def build(budget):
+        return StageGraph(
+            [
+                Stage(
+                    "fetch",
+                    fetch,
+                    scope=("product_id",),
+                    resource=ResourceClass.NETWORK,
+                    throttled=True,
+                ),
+                Stage(
+                    "render",
+                    render,
+                    inputs=("fetch",),
+                    scope=("product_id", "aspect_ratio", "language"),
+                ),
+            ],
+            limits={ResourceClass.NETWORK: 2, ResourceClass.CPU: 1},
+            memory_budget=budget,
+        )
+
+    unbounded = build(1 << 40).execute(cells)
+    bounded = build(2 * image_bytes).execute(cells)
+
+    assert bounded.completed == unbounded.completed == 40
+    assert bounded.peak_bytes <= 4 * image_bytes
+    assert bounded.peak_bytes < unbounded.peak_bytes
+    print(f"    Peak {bounded.peak_bytes} bytes vs {unbounded.peak_bytes} unbounded")
@@ -0,0 +1,141 @@
+"""
+Text Layout Test Script
+Tests linear-pass wrapping, cached advances, layout memoization and auto-fit.
+"""
+
+import sys
+import time
+from pathlib import Path
+from PIL import Image
+
+# Add parent directory (project root) to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.config import settings
+from src.services.image_processor import ImageProcessor
+from src.services.text_layout import TextLayoutEngine
+
+GERMAN = (
+    "Entdecken Sie unsere neue nachhaltige Produktlinie für umweltbewusste "
+    "Verbraucherinnen und Verbraucher mit außergewöhnlicher Qualität "
+) * 6
+
+
+def test_wraps_within_width():
+    """Test every line fits and no words are lost."""
+    print(" Testing wrapping...")
+
+    font = ImageProcessor().load_font("de", 48)
+    engine = TextLayoutEngine()
+    layout = engine.layout(GERMAN, font, 900)
+
+    assert len(layout.lines) > 1
+    assert " ".join(layout.lines).split() == GERMAN.split()
+    for line, width in zip(layout.lines, layout.widths):
+        assert width <= 900
+        assert abs(width - font.getlength(line)) <= 2
+    ascent, descent = font.getmetrics()
+    assert layout.height == len(layout.lines) * (ascent + descent) + (len(layout.lines) - 1) * 10
+
+    # A word wider than the box gets its own line
+    narrow = engine.layout("a Donaudampfschifffahrtsgesellschaft b", font, 200)
+    assert narrow.lines == ("a", "Donaudampfschifffahrtsgesellschaft", "b")
+    assert engine.layout("", font, 200).lines == ("",)
+    print(f"    {len(layout.lines)} lines, all within 900px")
+
+
+def test_layouts_are_memoized():
+    """Test repeat layouts are served from the cache."""
+    print("\n Testing layout cache...")
+
+    font = ImageProcessor().load_font("de", 48)
+    engine = TextLayoutEngine(max_layouts=2)
+
+    first = engine.layout(GERMAN, font, 900)
+    started = time.perf_counter()
+    again = engine.layout(GERMAN, font, 900)
+    elapsed = time.perf_counter() - started
+
+    assert again is first
+    assert engine.hits == 1 and engine.misses == 1
+    assert elapsed < 0.001
+
+    engine.layout(GERMAN, font, 800)
+    engine.layout(GERMAN, font, 700)
+    assert engine.layout(GERMAN, font, 900) is not first
+    print(f"    Cached layout in {elapsed * 1e6:.0f}us")
+
+
+def test_overlay_uses_layout():
+    """Test overlays still render centered text."""
+    print("\n Testing overlay...")
+
+    processor = ImageProcessor()
+    image = Image.new("RGB", (1024, 1024), (70, 130, 180))
+    result = processor.add_text_overlay(image, GERMAN[:120], font_size=48, language="de")
+
+    assert result.size == image.size and result.mode == "RGB"
+    assert result.getpixel((512, 1000)) != image.getpixel((512, 1000))
+    assert result.getpixel((512, 20)) == image.getpixel((512, 20))
+    print("    Overlay rendered")
+
+
+def test_auto_fit_picks_largest_size_that_fits(monkeypatch):
+    """Test auto-fit finds the largest fitting size per ratio without drawing."""
+    print("\n Testing auto-fit...")
+
+    processor = ImageProcessor()
+    text = GERMAN[:120]
+    sizes = {}
+    for width, height in [(1024, 1024), (576, 1024), (1024, 576)]:
+        size = processor.fit_font_size(
+            text, width, height, "de", max_lines=3, min_size=16, max_size=96
+        )
+        max_width = width - 80
+        for probe, fits in [(size, True), (size + 1, False)]:
+            runs = processor.load_font_runs(text, "de", probe)
+            layout = processor.layout_engine.layout_runs(runs, max_width)
+            ok = (
+                len(layout.lines) <= 3
+                and layout.height + 40 <= height * settings.text_box_height_ratio
+            )
+            assert ok == fits, (width, height, probe)
+        sizes[(width, height)] = size
+    assert sizes[(576, 1024)] < sizes[(1024, 1024)]
+    assert processor.fit_font_size("Sale", 1024, 1024, "en", max_size=96) == 96
+    assert processor.fit_font_size(GERMAN, 576, 1024, "de", min_size=16) == 16
+
+    # Overlays and render signatures use the fitted size when enabled
+    monkeypatch.setattr(settings, "text_auto_fit", True)
+    fitted = processor.fit_font_size(text, 576, 1024, "de")
+    assert processor.render_signature(text, "9:16", language="de")["font_size"] == fitted
+    assert processor.render_signature(text, "9:16", font_size=30, language="de")["font_size"] == 30
+    result = processor.add_text_overlay(
+        Image.new("RGB", (576, 1024), (70, 130, 180)), text, language="de"
+    )
+    assert result.getpixel((288, 1000)) != (70, 130, 180)
+    print(f"    Fitted sizes: {sizes}")
+
+
+def test_fit_and_font_caches_are_bounded(monkeypatch):
+    """Test per-text font choices and fitted sizes stay within their entry limits."""
+    print("\n Testing bounded fit caches...")
+
+    from src.services import image_processor
+
+    monkeypatch.setattr(image_processor, "FIT_CACHE_SIZE", 4)
+    monkeypatch.setattr(image_processor, "TEXT_FONT_CACHE_SIZE", 4)
+    processor = ImageProcessor()
+
+    first = processor.fit_font_size("Sale 0", 1024, 1024, "en")
+    for i in range(1, 10):
+        processor.fit_font_size(f"Sale {i}", 1024, 1024, "en")
+        processor.fit_font_size("Sale 0", 1024, 1024, "en")
+    assert len(processor._fit_cache) == 4
+    assert len(processor._text_font_cache) == 4
+
+    # Recently used entries survive eviction
+    assert any(key[0] == "Sale 0" for key in processor._fit_cache)
+    assert processor.fit_font_size("Sale 0", 1024, 1024, "en") == first
+    print("    Caches hold at most 4 entries")
@@ -0,0 +1,81 @@
+"""
+Tracing Test Script
+Tests tracing spans and the Chrome trace-event export of pipeline runs.
+"""
+
+import json
+import sys
+from pathlib import Path
+
+# Add parent directory (project root) to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.config import settings
+from src.utils import tracing
+from src.utils.tracing import TRACE_FILENAME, Tracer
+
+
+def test_disabled_spans_are_noops():
+    """Test spans record nothing without an active tracer."""
+    print(" Testing disabled tracing...")
+
+    assert tracing.current_tracer() is None
+    with tracing.span("idle") as span:
+        pass
+    assert span is tracing.span("other")
+
+    @tracing.traced(category="cpu")
+    def double(x):
+        return x * 2
+
+    assert double(21) == 42
+    print("    Disabled spans cost nothing")
+
+
+def test_spans_carry_attributes():
+    """Test nested spans inherit attributes and errors are recorded."""
+    print("\n Testing span attributes...")
+
+    tracer = Tracer()
+    with tracing.activate(tracer):
+        with tracing.attributes(product_id="P1", aspect_ratio="1:1"):
+            with tracing.span("outer", "cpu", language="es"):
+                try:
+                    with tracing.span("inner"):
+                        raise ValueError("bad pixel")
+                except ValueError:
+                    pass
+
+    spans = {e["name"]: e for e in tracer.events if e["ph"] == "X"}
+    assert spans["outer"]["args"] == {"product_id": "P1", "aspect_ratio": "1:1", "language": "es"}
+    assert spans["inner"]["args"]["error"] == "ValueError: bad pixel"
+    assert spans["inner"]["ts"] >= spans["outer"]["ts"]
+    assert tracing.current_tracer() is None
+    print("    Attributes and errors recorded")
+
+
+def test_pipeline_exports_trace(campaign_env, monkeypatch):
+    """Test a traced run writes trace.json with stage and service spans."""
+    print("\n Testing pipeline trace export...")
+
+    monkeypatch.setattr(settings, "tracing_enabled", True)
+    brief_path = campaign_env([campaign_env.product(1)])
+
+    from src.services.pipeline import CampaignPipeline
+
+    output = CampaignPipeline().run(brief_path)
+    trace_path = Path(output.output_directory) / TRACE_FILENAME
+    assert trace_path.exists()
+
+    events = json.loads(trace_path.read_text())["traceEvents"]
+    names = {e["name"] for e in events if e["ph"] == "X"}
+    assert {"parse", "source", "resize", "overlay", "encode", "save"} <= names
+    assert "ImageProcessor.resize_to_aspect_ratio" in names
+    assert "OutputManager.save_asset" in names
+
+    resizes = [e for e in events if e["name"] == "ImageProcessor.resize_to_aspect_ratio"]
+    assert sorted(e["args"]["aspect_ratio"] for e in resizes) == ["16:9", "1:1"]
+    assert all(e["args"]["product_id"] == "P1" for e in resizes)
+    assert tracing.current_tracer() is None
+    print(f"    Exported {len(events)} trace events")